@@ -11,11 +11,22 @@ import matplotlib.pyplot as plt
 import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
-import json
 from datetime import datetime, timedelta
+import sys
+from pathlib import Path
 import warnings
 warnings.filterwarnings('ignore')
 
+# Make the freight_analytics package importable when run from Script/
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from freight_analytics.charts import color_map
+from freight_analytics.core import get_core
+from freight_analytics.hierarchy import DEFAULT_TOP
+from freight_analytics.ports import default_registry
+from freight_analytics.pyramid import LEVEL_LABELS
+from freight_analytics.react_chart import react_chart
+from freight_analytics.widgets import export_button, plotly_chart, raw_data_viewer
+
 # Configure page settings
 st.set_page_config(
     page_title="US Freight Analytics Dashboard",
@@ -64,63 +75,28 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-# Data loading and caching functions
-@st.cache_data
+# Data loading through the shared freight core
+core = get_core()
+
 def load_rail_data():
-    """Load and preprocess rail data with caching"""
+    """Load rail data from the shared freight core"""
     try:
-        df = pd.read_csv('../Data/Rail_Carloadings_originated.csv')
-        df['Date'] = pd.to_datetime(df['Date'])
-        df['Season'] = df['Month'].apply(get_season)
+        df = core.rail_data()
         return df
     except Exception as e:
         st.error(f"Error loading rail data: {e}")
         return pd.DataFrame()
 
-@st.cache_data
 def load_port_data():
-    """Load and preprocess port data with caching"""
+    """Load port data from the shared freight core"""
     try:
-        with open('../Data/port_dataset.json', 'r') as file:
-            parsed_data = json.load(file)
-        
-        df = pd.DataFrame(parsed_data)
-        df_melted = df.melt(id_vars=["port"], var_name="port_name", value_name="TEU_values")
-        df_melted['port'] = pd.to_datetime(df_melted['port'], errors='coerce')
-        df_melted['TEU_values'] = pd.to_numeric(df_melted['TEU_values'], errors='coerce')
-        df_melted = df_melted.dropna(subset=['TEU_values'])
-        df_melted['month'] = df_melted['port'].dt.strftime('%b')
-        df_melted['year'] = df_melted['port'].dt.year
-        df_melted['season'] = df_melted['month'].apply(get_season_water)
-        
-        return df_melted
+        df = core.port_data()
+        return df
     except Exception as e:
         st.error(f"Error loading port data: {e}")
         return pd.DataFrame()
 
 # Utility functions
-def get_season(month):
-    """Determine season based on month for rail data"""
-    if month in [12, 1, 2]:
-        return 'Winter'
-    elif month in [3, 4, 5]:
-        return 'Spring'
-    elif month in [6, 7, 8]:
-        return 'Summer'
-    elif month in [9, 10, 11]:
-        return 'Fall'
-
-def get_season_water(month):
-    """Determine season based on month for water data"""
-    if month in ['Dec', 'Jan', 'Feb']:
-        return 'Winter'
-    elif month in ['Mar', 'Apr', 'May']:
-        return 'Spring'
-    elif month in ['Jun', 'Jul', 'Aug']:
-        return 'Summer'
-    elif month in ['Sep', 'Oct', 'Nov']:
-        return 'Fall'
-
 def create_metric_cards(col1, col2, col3, col4, title1, value1, title2, value2, title3, value3, title4, value4):
     """Create metric cards for KPIs"""
     with col1:
@@ -155,7 +131,7 @@ def create_metric_cards(col1, col2, col3, col4, title1, value1, title2, value2,
         </div>
         """, unsafe_allow_html=True)
 
-def create_advanced_time_series(data, x_col, y_col, color_col, title):
+def create_advanced_time_series(data, x_col, y_col, color_col, title, colors=None):
     """Create advanced interactive time series with trend analysis"""
     fig = go.Figure()
     
@@ -167,7 +143,7 @@ def create_advanced_time_series(data, x_col, y_col, color_col, title):
             y=category_data[y_col],
             mode='lines+markers',
             name=category,
-            line=dict(width=3),
+            line=dict(width=3, color=colors.get(category) if colors else None),
             marker=dict(size=6),
             hovertemplate=f'<b>{category}</b><br>' +
                          f'{x_col}: %{{x}}<br>' +
@@ -245,55 +221,44 @@ if dashboard == "Rail Analytics":
         with col1:
             selected_years = st.multiselect(
                 'Select Year(s)', 
-                options=sorted(rail_df['Year'].unique()), 
-                default=sorted(rail_df['Year'].unique()),
+                options=core.distinct('rail', 'Year'), 
+                default=core.distinct('rail', 'Year'),
                 help="Choose years for analysis"
             )
         
         with col2:
             selected_railroads = st.multiselect(
                 'Select Railroad(s)', 
-                options=sorted(rail_df['Railroad'].unique()), 
-                default=sorted(rail_df['Railroad'].unique()),
+                options=core.distinct('rail', 'Railroad'), 
+                default=core.distinct('rail', 'Railroad'),
                 help="Choose railroad companies"
             )
         
         with col3:
             selected_commodities = st.multiselect(
                 'Select Commodity(s)',
-                options=sorted(rail_df['Commodity'].unique()),
-                default=sorted(rail_df['Commodity'].unique())[:5],
+                options=core.distinct('rail', 'Commodity'),
+                default=core.distinct('rail', 'Commodity')[:5],
                 help="Choose commodity types"
             )
         
         # Filter data
-        filtered_df = rail_df[
-            (rail_df['Year'].isin(selected_years)) & 
-            (rail_df['Railroad'].isin(selected_railroads)) &
-            (rail_df['Commodity'].isin(selected_commodities))
-        ]
+        rail_filters = {'Year': selected_years, 'Railroad': selected_railroads, 'Commodity': selected_commodities}
+        filtered_df = core.select('rail', rail_filters)
         
         if not filtered_df.empty:
             # KPI Metrics
             st.markdown("### Key Performance Indicators")
             col1, col2, col3, col4 = st.columns(4)
             
-            total_carloads = filtered_df['Carloads'].sum()
-            avg_monthly = filtered_df.groupby(['Year', 'Month'])['Carloads'].sum().mean()
-            peak_month = filtered_df.groupby('Month')['Carloads'].sum().idxmax()
-            growth_rate = 0
-            if len(selected_years) > 1:
-                last_year = filtered_df[filtered_df['Year'] == max(selected_years)]['Carloads'].sum()
-                first_year = filtered_df[filtered_df['Year'] == min(selected_years)]['Carloads'].sum()
-                if first_year > 0:
-                    growth_rate = ((last_year - first_year) / first_year) * 100
+            kpis = core.rail_kpis(selected_years, selected_railroads, selected_commodities)
             
             create_metric_cards(
                 col1, col2, col3, col4,
-                "Total Carloads", f"{total_carloads:,.0f}",
-                "Monthly Average", f"{avg_monthly:,.0f}",
-                "Peak Month", f"Month {peak_month}",
-                "Growth Rate", f"{growth_rate:.1f}%"
+                "Total Carloads", f"{kpis['total_carloads']:,.0f}",
+                "Monthly Average", f"{kpis['avg_monthly']:,.0f}",
+                "Peak Month", f"Month {kpis['peak_month']}",
+                "Growth Rate", f"{kpis['growth_rate']:.1f}%"
             )
             
             # Enhanced visualizations based on analysis type
@@ -302,12 +267,15 @@ if dashboard == "Rail Analytics":
                 
                 # Advanced time series with trend analysis
                 st.markdown("#### Trend Analysis with Statistical Insights")
-                date_totals = filtered_df.groupby(['Date', 'Railroad'])['Carloads'].sum().reset_index()
+                # Coarsest resolution that still fills the chart
+                date_totals, level = core.time_series('rail', rail_filters, group='Railroad')
                 fig_trend = create_advanced_time_series(
                     date_totals, 'Date', 'Carloads', 'Railroad',
-                    'Railroad Carloads Over Time with Trend Analysis'
+                    f'{LEVEL_LABELS[level]} Railroad Carloads Over Time with Trend Analysis',
+                    colors=color_map(core.distinct('rail', 'Railroad'))
                 )
-                st.plotly_chart(fig_trend, use_container_width=True)
+                # Only the railroads that changed are sent on a filter change
+                react_chart(fig_trend, key='rail_trend')
                 
                 # Interactive heatmap
                 st.markdown("#### Interactive Correlation Heatmap")
@@ -333,7 +301,7 @@ if dashboard == "Rail Analytics":
                     yaxis_title="Month",
                     height=500
                 )
-                st.plotly_chart(fig_heatmap, use_container_width=True)
+                plotly_chart(fig_heatmap, use_container_width=True)
                 
             elif analysis_type == "Seasonal Analysis":
                 st.markdown("### Advanced Seasonal Analysis")
@@ -342,7 +310,10 @@ if dashboard == "Rail Analytics":
                 col1, col2 = st.columns(2)
                 
                 with col1:
-                    seasonal_commodity = filtered_df.groupby(['Season', 'Commodity'])['Carloads'].sum().reset_index()
+                    # Largest commodities per season; the rest fold into "Other"
+                    show_all = st.checkbox("Show every commodity", key='rail_sunburst_all')
+                    seasonal_commodity = core.rollup('rail', 'Season', 'Commodity', rail_filters,
+                                                     top=None if show_all else DEFAULT_TOP)
                     fig_seasonal = px.sunburst(
                         seasonal_commodity,
                         path=['Season', 'Commodity'],
@@ -352,7 +323,7 @@ if dashboard == "Rail Analytics":
                         color_continuous_scale='Viridis'
                     )
                     fig_seasonal.update_layout(height=500)
-                    st.plotly_chart(fig_seasonal, use_container_width=True)
+                    plotly_chart(fig_seasonal, use_container_width=True)
                 
                 with col2:
                     # Seasonal comparison across years
@@ -367,7 +338,7 @@ if dashboard == "Rail Analytics":
                         color_discrete_sequence=px.colors.qualitative.Set3
                     )
                     fig_yearly.update_layout(height=500)
-                    st.plotly_chart(fig_yearly, use_container_width=True)
+                    plotly_chart(fig_yearly, use_container_width=True)
                 
                 # Statistical insights
                 st.markdown("#### Seasonal Insights")
@@ -401,15 +372,13 @@ if dashboard == "Rail Analytics":
                     )
                     fig_growth.add_hline(y=0, line_dash="dash", line_color="red")
                     fig_growth.update_layout(yaxis_title="Growth Rate (%)", height=500)
-                    st.plotly_chart(fig_growth, use_container_width=True)
+                    plotly_chart(fig_growth, use_container_width=True)
                 
             elif analysis_type == "Predictive Insights":
                 st.markdown("### Predictive Analytics")
                 
                 # Simple forecasting using moving averages
-                monthly_totals = filtered_df.groupby(['Year', 'Month'])['Carloads'].sum().reset_index()
-                monthly_totals['Date'] = pd.to_datetime(monthly_totals[['Year', 'Month']].assign(day=1))
-                monthly_totals = monthly_totals.sort_values('Date')
+                monthly_totals = core.time_series('rail', rail_filters, level='month')[0].copy()
                 monthly_totals['MA_3'] = monthly_totals['Carloads'].rolling(window=3).mean()
                 monthly_totals['MA_6'] = monthly_totals['Carloads'].rolling(window=6).mean()
                 
@@ -445,7 +414,7 @@ if dashboard == "Rail Analytics":
                     yaxis_title="Carloads",
                     height=500
                 )
-                st.plotly_chart(fig_forecast, use_container_width=True)
+                plotly_chart(fig_forecast, use_container_width=True)
                 
                 # Anomaly detection
                 st.markdown("#### Anomaly Detection")
@@ -469,7 +438,11 @@ if dashboard == "Rail Analytics":
             # Raw data display option
             if show_raw_data:
                 st.markdown("### Raw Data")
-                st.dataframe(filtered_df.sample(min(1000, len(filtered_df))))
+                raw_data_viewer(core, 'rail', rail_filters, key='rail_raw')
+            
+            # Export option
+            with st.expander("📤 Export Filtered Data"):
+                export_button(core, 'rail', rail_filters, key='rail_export')
                 
         else:
             st.warning("No data available for the selected filters. Please adjust your selection.")
@@ -487,64 +460,48 @@ elif dashboard == "Port Analytics":
         with col1:
             selected_years = st.multiselect(
                 'Select Year(s)', 
-                options=sorted(port_df['year'].unique()), 
-                default=sorted(port_df['year'].unique()),
+                options=core.distinct('port', 'year'), 
+                default=core.distinct('port', 'year'),
                 help="Choose years for analysis"
             )
         
         with col2:
             selected_months = st.multiselect(
                 'Select Month(s)', 
-                options=port_df['month'].unique(), 
-                default=port_df['month'].unique(),
+                options=core.distinct('port', 'month', sort=False), 
+                default=core.distinct('port', 'month', sort=False),
                 help="Choose months for analysis"
             )
         
         with col3:
             selected_ports = st.multiselect(
                 'Select Port(s)', 
-                options=sorted(port_df['port_name'].unique()), 
-                default=sorted(port_df['port_name'].unique())[:3],
+                options=core.distinct('port', 'port_name'), 
+                default=core.distinct('port', 'port_name')[:3],
                 help="Choose ports to analyze"
             )
         
         # Filter data
-        filtered_df = port_df[
-            (port_df['year'].isin(selected_years)) & 
-            (port_df['month'].isin(selected_months)) &
-            (port_df['port_name'].isin(selected_ports))
-        ]
+        port_filters = {'year': selected_years, 'month': selected_months, 'port_name': selected_ports}
+        filtered_df = core.select('port', port_filters)
         
         if not filtered_df.empty:
             # KPI Metrics for ports
             st.markdown("### Port Performance KPIs")
             col1, col2, col3, col4 = st.columns(4)
             
-            total_teu = filtered_df['TEU_values'].sum()
-            avg_monthly = filtered_df.groupby(['year', 'month'])['TEU_values'].sum().mean()
-            top_port = filtered_df.groupby('port_name')['TEU_values'].sum().idxmax()
-            port_count = filtered_df['port_name'].nunique()
+            kpis = core.port_kpis(selected_years, selected_months, selected_ports)
             
             create_metric_cards(
                 col1, col2, col3, col4,
-                "Total TEU", f"{total_teu:,.0f}",
-                "Monthly Average", f"{avg_monthly:,.0f}",
-                "Top Port", top_port.replace('_', ' ').title(),
-                "Active Ports", f"{port_count}"
+                "Total TEU", f"{kpis['total_teu']:,.0f}",
+                "Monthly Average", f"{kpis['avg_monthly']:,.0f}",
+                "Top Port", default_registry().display_names([kpis['top_port']])[0],
+                "Active Ports", f"{kpis['port_count']}"
             )
             
-            # Enhanced port location data
-            port_locations = {
-                "charleston_sc": {"lat": 32.7765, "lon": -79.9311, "region": "Southeast", "coast": "Atlantic"},
-                "houston_tx": {"lat": 29.7633, "lon": -95.3633, "region": "Gulf", "coast": "Gulf"},
-                "long_beach_ca": {"lat": 33.7542, "lon": -118.1967, "region": "West", "coast": "Pacific"},
-                "los_angeles_ca": {"lat": 33.742, "lon": -118.2719, "region": "West", "coast": "Pacific"},
-                "nwsa_seattle_tacoma_wa": {"lat": 47.6097, "lon": -122.3331, "region": "Northwest", "coast": "Pacific"},
-                "oakland_ca": {"lat": 37.8044, "lon": -122.2712, "region": "West", "coast": "Pacific"},
-                "port_of_ny_nj": {"lat": 40.6895, "lon": -74.0455, "region": "Northeast", "coast": "Atlantic"},
-                "port_of_virginia_va": {"lat": 36.8508, "lon": -76.2859, "region": "Southeast", "coast": "Atlantic"},
-                "savannah_ga": {"lat": 32.0809, "lon": -81.0912, "region": "Southeast", "coast": "Atlantic"}
-            }
+            # Location, coast, region and capacity per port
+            port_registry = default_registry()
             
             if analysis_type == "Overview":
                 st.markdown("### Port Overview Analytics")
@@ -552,17 +509,17 @@ elif dashboard == "Port Analytics":
                 # Advanced interactive map
                 st.markdown("#### Interactive Port Performance Map")
                 port_summary = filtered_df.groupby('port_name')['TEU_values'].sum().reset_index()
-                port_summary['lat'] = port_summary['port_name'].map(lambda x: port_locations[x]['lat'])
-                port_summary['lon'] = port_summary['port_name'].map(lambda x: port_locations[x]['lon'])
-                port_summary['region'] = port_summary['port_name'].map(lambda x: port_locations[x]['region'])
-                port_summary['coast'] = port_summary['port_name'].map(lambda x: port_locations[x]['coast'])
+                port_summary = port_registry.attach(port_summary, fields=('lat', 'lon', 'region', 'coast', 'name'))
+                # Ports without coordinates are listed below the map instead
+                unmapped = port_summary.loc[port_summary['lat'].isna() | port_summary['lon'].isna(), 'port_display']
+                port_summary = port_summary.dropna(subset=['lat', 'lon'])
                 
                 fig_map = px.scatter_mapbox(
                     port_summary,
                     lat="lat", lon="lon", 
                     size="TEU_values", 
                     color="coast",
-                    hover_name="port_name",
+                    hover_name="port_display",
                     hover_data={"TEU_values": ":,.0f", "region": True},
                     color_discrete_sequence=px.colors.qualitative.Set1,
                     size_max=50,
@@ -571,16 +528,19 @@ elif dashboard == "Port Analytics":
                     title="Port Container Volume Distribution",
                     height=600
                 )
-                st.plotly_chart(fig_map, use_container_width=True)
+                plotly_chart(fig_map, use_container_width=True)
+                if not unmapped.empty:
+                    st.caption("No location on record for: " + ", ".join(unmapped))
                 
                 # Time series comparison
                 st.markdown("#### Port Performance Comparison Over Time")
+                port_series, level = core.time_series('port', port_filters, group='port_name')
                 fig_timeseries = px.line(
-                    filtered_df,
+                    port_series,
                     x='port',
                     y='TEU_values',
                     color='port_name',
-                    title='Monthly Container Throughput Trends',
+                    title=f'{LEVEL_LABELS[level]} Container Throughput Trends',
                     markers=True,
                     height=500
                 )
@@ -589,14 +549,18 @@ elif dashboard == "Port Analytics":
                     yaxis_title="TEU Values",
                     legend_title="Ports"
                 )
-                st.plotly_chart(fig_timeseries, use_container_width=True)
+                plotly_chart(fig_timeseries, use_container_width=True)
                 
             # Other analysis types can be added here...
             
             # Raw data option
             if show_raw_data:
                 st.markdown("### Raw Port Data")
-                st.dataframe(filtered_df.sample(min(500, len(filtered_df))))
+                raw_data_viewer(core, 'port', port_filters, key='port_raw')
+            
+            # Export option
+            with st.expander("📤 Export Filtered Port Data"):
+                export_button(core, 'port', port_filters, key='port_export')
                 
         else:
             st.warning("No port data available for the selected filters.")
@@ -615,27 +579,24 @@ elif dashboard == "Comparative Analysis":
         conversion_factor = st.slider("Rail-to-TEU Conversion Factor", 1.0, 5.0, 2.5, 0.1,
                                      help="Approximate TEU equivalent per railcar")
         
-        # Aggregate data by year
-        rail_yearly = rail_df.groupby('Year')['Carloads'].sum() * conversion_factor
-        port_yearly = port_df.groupby('year')['TEU_values'].sum()
+        # Compare yearly or monthly totals
+        granularity = st.radio("Comparison granularity", ["Yearly", "Monthly"], horizontal=True)
+        period_label = 'Year' if granularity == "Yearly" else 'Month'
         
-        # Align years
-        common_years = list(set(rail_yearly.index) & set(port_yearly.index))
-        if common_years:
-            rail_common = rail_yearly[common_years]
-            port_common = port_yearly[common_years]
-            
+        # Per-period totals are precomputed per data revision; the slider only rescales them
+        totals = core.comparison_totals('year' if granularity == "Yearly" else 'month')
+        if not totals.empty:
             comparison_df = pd.DataFrame({
-                'Year': common_years,
-                'Rail_TEU_Equivalent': rail_common.values,
-                'Port_TEU': port_common.values
+                'Period': totals.index,
+                'Rail_TEU_Equivalent': totals['Rail_Carloads'].to_numpy() * conversion_factor,
+                'Port_TEU': totals['Port_TEU'].to_numpy()
             })
             
             # Comparative visualization
             fig_comparison = go.Figure()
             
             fig_comparison.add_trace(go.Scatter(
-                x=comparison_df['Year'],
+                x=comparison_df['Period'],
                 y=comparison_df['Rail_TEU_Equivalent'],
                 mode='lines+markers',
                 name='Rail (TEU Equivalent)',
@@ -643,7 +604,7 @@ elif dashboard == "Comparative Analysis":
             ))
             
             fig_comparison.add_trace(go.Scatter(
-                x=comparison_df['Year'],
+                x=comparison_df['Period'],
                 y=comparison_df['Port_TEU'],
                 mode='lines+markers',
                 name='Port Container',
@@ -652,11 +613,11 @@ elif dashboard == "Comparative Analysis":
             
             fig_comparison.update_layout(
                 title='Multi-Modal Freight Volume Comparison',
-                xaxis_title='Year',
+                xaxis_title=period_label,
                 yaxis_title='Volume (TEU Equivalent)',
                 height=500
             )
-            st.plotly_chart(fig_comparison, use_container_width=True)
+            plotly_chart(fig_comparison, use_container_width=True)
     
     else:
         st.error("Unable to load data for comparative analysis.")
@@ -0,0 +1,144 @@
+"""
+Asyncio interface to the freight analytics API.
+
+``AsyncFreightDashboard`` mirrors ``FreightDashboard`` with awaitable
+methods. Parsing and aggregation run in an executor so the event loop
+stays responsive; concurrent awaits of the same call with the same
+arguments share one execution, and each caller receives its own copy of
+frame and dict results. Cancelling an await only stops the shared work
+when every caller waiting on it has been cancelled and the work has not
+started yet; work already running in a thread finishes and its result
+is cached by the core.
+"""
+
+import asyncio
+import copy
+import functools
+
+import pandas as pd
+
+from .dashboard import FreightDashboard
+from .query import run_query
+
+
+def _freeze(value):
+    """Hashable form of call arguments, e.g. filter dicts and lists."""
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _private(result):
+    if isinstance(result, pd.DataFrame):
+        return result.copy()
+    if isinstance(result, dict):
+        return copy.deepcopy(result)
+    return result
+
+
+class _Flight:
+    __slots__ = ('future', 'waiters')
+
+    def __init__(self, future):
+        self.future = future
+        self.waiters = 0
+
+
+class AsyncFreightDashboard:
+    """
+    Awaitable loaders, summaries, queries and forecasts.
+
+    Example:
+        async with AsyncFreightDashboard() as dashboard:
+            summary = await dashboard.get_rail_summary()
+    """
+
+    def __init__(self, data_dir=None, cache_dir=None, use_cache=True, backend='pandas', executor=None):
+        """
+        Args:
+            data_dir, cache_dir, use_cache, backend: As for
+                ``FreightDashboard``.
+            executor (concurrent.futures.Executor, optional): Where the
+                blocking work runs. Defaults to the event loop's default
+                thread pool. A process pool is not supported: the work
+                runs against this process's shared core.
+        """
+        self._dashboard = FreightDashboard(data_dir, cache_dir, use_cache, backend)
+        self._executor = executor
+        self._inflight = {}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Cancel calls that have not started yet."""
+        for flight in list(self._inflight.values()):
+            flight.future.cancel()
+
+    async def _call(self, name, func, *args):
+        key = (name, _freeze(args))
+        flight = self._inflight.get(key)
+        if flight is None:
+            loop = asyncio.get_running_loop()
+            flight = _Flight(loop.run_in_executor(self._executor, functools.partial(func, *args)))
+            self._inflight[key] = flight
+            flight.future.add_done_callback(
+                lambda _: self._inflight.pop(key, None) if self._inflight.get(key) is flight else None
+            )
+        flight.waiters += 1
+        try:
+            # Shielded so one caller's cancellation leaves the others waiting
+            result = await asyncio.shield(flight.future)
+        except asyncio.CancelledError:
+            if flight.waiters == 1 and not flight.future.done():
+                flight.future.cancel()
+            raise
+        finally:
+            flight.waiters -= 1
+        return _private(result)
+
+    async def load_rail_data(self):
+        """Rail freight data (a private copy)."""
+        return await self._call('rail_data', self._dashboard._core.rail_data)
+
+    async def load_port_data(self):
+        """Port container data (a private copy)."""
+        return await self._call('port_data', self._dashboard._core.port_data)
+
+    async def get_rail_summary(self):
+        """Summary statistics for rail data."""
+        return await self._call('rail_summary', self._dashboard.get_rail_summary)
+
+    async def get_port_summary(self):
+        """Summary statistics for port data."""
+        return await self._call('port_summary', self._dashboard.get_port_summary)
+
+    async def get_seasonal_analysis(self, mode='rail'):
+        """Seasonal statistics; see ``FreightDashboard.get_seasonal_analysis``."""
+        return await self._call('seasonal', self._dashboard.get_seasonal_analysis, mode)
+
+    async def get_group_summary(self, mode='rail', group_by='Railroad'):
+        """Per-group statistics; see ``FreightDashboard.get_group_summary``."""
+        return await self._call('group_summary', self._dashboard.get_group_summary, mode, group_by)
+
+    async def get_rankings(self, mode='port', entity='port_name', k=5, filters=None, level='month', window=1):
+        """Per-period top-K; see ``FreightDashboard.get_rankings``."""
+        return await self._call(
+            'rankings', self._dashboard.get_rankings, mode, entity, k, filters, level, window
+        )
+
+    async def query(self, mode='rail', filters=None, group_by=None, metrics=('sum',), time_grain=None):
+        """Grouped aggregates; see ``FreightDashboard.query``."""
+        return await self._call(
+            'query', run_query, self._dashboard._core, mode, filters, group_by, metrics, time_grain,
+            self._dashboard._backend
+        )
+
+    async def get_forecast(self, mode='rail', filters=None, horizon=6):
+        """Monthly forecast; see ``FreightDashboard.get_forecast``."""
+        return await self._call('forecast', self._dashboard.get_forecast, mode, filters, horizon)
@@ -0,0 +1,304 @@
+"""
+Headless alerting on the freight datasets.
+
+``Watcher`` keeps the datasets resident through the shared compute core,
+polls the source files for changes and evaluates the alert rules only
+for months that became complete since the previous poll. Alerts are
+written to one or more sinks (JSONL file, syslog, webhook).
+
+Nothing in this module imports Streamlit or Plotly, so it can run as a
+lightweight service next to (or instead of) the dashboard.
+"""
+
+import json
+import logging
+import logging.handlers
+import socket
+import time
+import urllib.request
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from .core import DATASET_COLUMNS
+from .ports import default_registry
+from .utilization import DEFAULT_CONSECUTIVE, DEFAULT_THRESHOLD, UtilizationEngine
+
+logger = logging.getLogger(__name__)
+
+# Series the rules track in each dataset
+SERIES_COLUMNS = {'rail': 'Railroad', 'port': 'port_name'}
+
+DEFAULT_INTERVAL = 60
+IQR_FACTOR = 1.5
+MIN_HISTORY_MONTHS = 12
+GROWTH_DROP_PCT = 20.0
+
+
+def make_alert(rule, dataset, series, period, value, message, state='raised'):
+    """Alert record as written to the sinks."""
+    return {
+        'time': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'rule': rule,
+        'state': state,
+        'dataset': dataset,
+        'series': None if series is None else str(series),
+        'period': pd.Timestamp(period).strftime('%Y-%m'),
+        'value': None if value is None or pd.isna(value) else float(value),
+        'message': message,
+    }
+
+
+def monthly_matrix(core, dataset):
+    """
+    Monthly totals per series as a (months x series) frame.
+
+    Built from the core's time pyramid, so it costs one pivot of the
+    month level rather than a pass over the raw rows.
+    """
+    columns = DATASET_COLUMNS[dataset]
+    monthly = core.pyramid(dataset, group=SERIES_COLUMNS[dataset]).levels['month']
+    matrix = monthly.pivot(index=columns['date'], columns=SERIES_COLUMNS[dataset], values=columns['value'])
+    return matrix.sort_index()
+
+
+def complete_months(core, dataset, matrix):
+    """
+    Months whose totals are final.
+
+    Monthly data is complete as soon as it appears. For weekly data the
+    latest month may still receive rows, so it is held back.
+    """
+    if core.pyramid(dataset, group=SERIES_COLUMNS[dataset]).native == 'month':
+        return matrix.index
+    return matrix.index[:-1]
+
+
+class AnomalyRule:
+    """Month totals outside the IQR fence of the series' earlier months."""
+
+    name = 'anomaly'
+
+    def __init__(self, factor=IQR_FACTOR, min_history=MIN_HISTORY_MONTHS):
+        self.factor = factor
+        self.min_history = min_history
+
+    def evaluate(self, dataset, matrix, months):
+        alerts = []
+        for month in months:
+            history = matrix.loc[matrix.index < month]
+            if len(history) < self.min_history:
+                continue
+            q1 = history.quantile(0.25)
+            q3 = history.quantile(0.75)
+            low = q1 - self.factor * (q3 - q1)
+            high = q3 + self.factor * (q3 - q1)
+            current = matrix.loc[month]
+            outside = (current < low) | (current > high)
+            for series in current.index[outside.to_numpy()]:
+                direction = "below" if current[series] < low[series] else "above"
+                alerts.append(make_alert(
+                    self.name, dataset, series, month, current[series],
+                    f"{series}: {current[series]:,.0f} in {month:%b %Y} is {direction} the usual range "
+                    f"({low[series]:,.0f}–{high[series]:,.0f})"
+                ))
+        return alerts
+
+
+class GrowthDropRule:
+    """Year-over-year decline of a month's total beyond a percentage."""
+
+    name = 'growth_drop'
+
+    def __init__(self, drop_pct=GROWTH_DROP_PCT):
+        self.drop_pct = drop_pct
+
+    def evaluate(self, dataset, matrix, months):
+        alerts = []
+        for month in months:
+            year_ago = month - pd.DateOffset(years=1)
+            if year_ago not in matrix.index:
+                continue
+            current = matrix.loc[month]
+            previous = matrix.loc[year_ago]
+            with np.errstate(divide='ignore', invalid='ignore'):
+                change = (current - previous) / previous * 100
+            for series in change.index[(change < -self.drop_pct).to_numpy()]:
+                alerts.append(make_alert(
+                    self.name, dataset, series, month, change[series],
+                    f"{series}: {month:%b %Y} is down {-change[series]:.1f}% year over year"
+                ))
+        return alerts
+
+
+class CapacityRule:
+    """Ports above the utilization threshold for consecutive months."""
+
+    name = 'capacity'
+
+    def __init__(self, threshold=DEFAULT_THRESHOLD, consecutive=DEFAULT_CONSECUTIVE, registry=None):
+        self.threshold = threshold
+        self.consecutive = consecutive
+        self.registry = registry or default_registry()
+        self.engine = None
+
+    def evaluate(self, df):
+        """
+        Extend the utilization engine with the new months of ``df``.
+
+        A new engine (first call, or earlier months changed) reports the
+        ports currently in alert; afterwards only transitions are reported.
+        """
+        fresh = self.engine is None or not self.engine.covers(df)
+        if fresh:
+            self.engine = UtilizationEngine(self.registry, self.threshold, self.consecutive)
+        results = self.engine.extend(df)
+        alerts = []
+        if fresh:
+            if not results:
+                return alerts
+            current = self.engine.alerts()
+            for row in current[current['alerting']].itertuples(index=False):
+                alerts.append(self._alert('raised', row.port_name, results[-1]['month'], row.utilization))
+            return alerts
+        for result in results:
+            for state in ('raised', 'cleared'):
+                for port in result[state]:
+                    alerts.append(self._alert(state, port, result['month'], result['utilization'].get(port)))
+        return alerts
+
+    def _alert(self, state, port, month, utilization):
+        verb = "above" if state == 'raised' else "back below"
+        return make_alert(
+            self.name, 'port', port, month, utilization,
+            f"{port}: rolling 12-month utilization {verb} {self.threshold:.0f}% "
+            f"(for {self.consecutive}+ months) as of {month:%b %Y}",
+            state=state
+        )
+
+
+class JsonlSink:
+    """Append alerts as JSON lines to a file."""
+
+    def __init__(self, path):
+        self.path = path
+
+    def emit(self, alerts):
+        with open(self.path, 'a', encoding='utf-8') as f:
+            for alert in alerts:
+                f.write(json.dumps(alert) + "\n")
+
+
+class SyslogSink:
+    """Send alerts to syslog, e.g. ``/dev/log`` or ``localhost:514``."""
+
+    def __init__(self, address='/dev/log'):
+        if ':' in address and not address.startswith('/'):
+            host, port = address.rsplit(':', 1)
+            address = (host, int(port))
+        self.handler = logging.handlers.SysLogHandler(address=address, socktype=socket.SOCK_DGRAM)
+        self.handler.ident = "freight-analytics: "
+        self._logger = logging.getLogger(f"{__name__}.syslog.{id(self)}")
+        self._logger.propagate = False
+        self._logger.addHandler(self.handler)
+        self._logger.setLevel(logging.INFO)
+
+    def emit(self, alerts):
+        for alert in alerts:
+            level = logging.WARNING if alert['state'] == 'raised' else logging.INFO
+            self._logger.log(level, json.dumps(alert))
+
+
+class WebhookSink:
+    """POST each batch of alerts as a JSON array to a URL."""
+
+    def __init__(self, url, timeout=10):
+        self.url = url
+        self.timeout = timeout
+
+    def emit(self, alerts):
+        request = urllib.request.Request(
+            self.url, data=json.dumps(alerts).encode('utf-8'),
+            headers={'Content-Type': 'application/json'}, method='POST'
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            response.read()
+
+
+class Watcher:
+    """
+    Poll the datasets and evaluate alert rules on new complete months.
+
+    The first poll evaluates only the most recent complete month, so a
+    fresh start reports the current state without replaying history.
+    """
+
+    def __init__(self, core, sinks, rules=None, capacity_rule=None, interval=DEFAULT_INTERVAL):
+        """
+        Args:
+            core (FreightCore): Shared compute core holding the datasets.
+            sinks (list): Objects with an ``emit(alerts)`` method.
+            rules (list, optional): Monthly series rules. Defaults to
+                ``AnomalyRule`` and ``GrowthDropRule``.
+            capacity_rule (CapacityRule, optional): Port utilization rule.
+            interval (float): Seconds between polls.
+        """
+        self.core = core
+        self.sinks = sinks
+        self.rules = rules if rules is not None else [AnomalyRule(), GrowthDropRule()]
+        self.capacity_rule = capacity_rule if capacity_rule is not None else CapacityRule()
+        self.interval = interval
+        self._versions = {}
+        self._evaluated = {}
+
+    def _new_months(self, dataset, months):
+        last = self._evaluated.get(dataset)
+        if last is None:
+            return months[-1:]
+        return months[months > last]
+
+    def check(self, dataset):
+        """Evaluate one dataset if its file changed; return its alerts."""
+        try:
+            version = self.core.version(dataset)
+        except FileNotFoundError as e:
+            logger.warning("%s", e)
+            return []
+        if self._versions.get(dataset) == version:
+            return []
+        self._versions[dataset] = version
+
+        matrix = monthly_matrix(self.core, dataset)
+        months = complete_months(self.core, dataset, matrix)
+        new = self._new_months(dataset, months)
+        alerts = []
+        for rule in self.rules:
+            alerts.extend(rule.evaluate(dataset, matrix, new))
+        if dataset == 'port' and self.capacity_rule:
+            alerts.extend(self.capacity_rule.evaluate(self.core.frame('port')))
+        if len(new):
+            self._evaluated[dataset] = new[-1]
+        return alerts
+
+    def poll(self):
+        """Check every dataset once and send any alerts to the sinks."""
+        alerts = []
+        for dataset in ('rail', 'port'):
+            alerts.extend(self.check(dataset))
+        if alerts:
+            for sink in self.sinks:
+                try:
+                    sink.emit(alerts)
+                except OSError as e:
+                    logger.error("Alert sink %s failed: %s", type(sink).__name__, e)
+        return alerts
+
+    def run(self, once=False):
+        """Poll until interrupted (or a single time with ``once``)."""
+        while True:
+            alerts = self.poll()
+            logger.info("Poll complete: %d alert(s)", len(alerts))
+            if once:
+                return
+            time.sleep(self.interval)
@@ -0,0 +1,256 @@
+"""
+Pluggable storage and compute backends for ``FreightDashboard``.
+
+``PandasBackend`` (the default) answers queries in memory with the
+planner in ``freight_analytics.query``. ``SQLiteBackend`` and
+``DuckDBBackend`` copy each dataset into an embedded, in-process SQL
+engine and run the same queries, summaries and seasonal statistics as
+SQL: SQLite with an index on the filter columns, DuckDB with its
+multi-threaded columnar scans. The SQL tables are reloaded whenever the
+source file changes; query results are cached on the shared core like
+those of the pandas backend.
+"""
+
+import sqlite3
+import threading
+
+import numpy as np
+import pandas as pd
+
+from .core import DATASET_COLUMNS, FILTER_COLUMNS, SUMMARY_COLUMNS
+from .query import answer_query
+
+
+def _quote(identifier):
+    return '"' + str(identifier).replace('"', '""') + '"'
+
+
+def _native(value):
+    return value.item() if isinstance(value, np.generic) else value
+
+
+class PandasBackend:
+    """In-memory backend using the shared frames and the query planner."""
+
+    name = 'pandas'
+
+    def query(self, core, dataset, key):
+        return answer_query(core, dataset, key)
+
+    def summary(self, core, dataset):
+        """Row count, date range, value total and distinct summary values."""
+        summary = core.summary(dataset)
+        totals = summary.table.iloc[0]
+        return {
+            'rows': int(totals['rows']),
+            'start': totals['start'],
+            'end': totals['end'],
+            'total': summary.table['sum'].iloc[0],
+            'values': summary.values,
+        }
+
+
+class _StdDev:
+    """Sample standard deviation aggregate for SQLite (Welford update)."""
+
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def step(self, value):
+        if value is None:
+            return
+        self.n += 1
+        delta = value - self.mean
+        self.mean += delta / self.n
+        self.m2 += delta * (value - self.mean)
+
+    def finalize(self):
+        return (self.m2 / (self.n - 1)) ** 0.5 if self.n > 1 else None
+
+
+class SQLBackend:
+    """
+    Shared SQL generation and table loading for the embedded engines.
+
+    Subclasses provide the connection, the load of one frame and the
+    dialect's date-bucket and standard deviation expressions.
+    """
+
+    name = None
+    std_function = None
+
+    def __init__(self):
+        self._versions = {}
+        self._lock = threading.Lock()
+
+    def _ensure(self, core, dataset):
+        version = core.version(dataset)
+        if self._versions.get(dataset) != version:
+            self._load(dataset, core.frame(dataset))
+            self._versions[dataset] = version
+
+    def _load(self, dataset, df):
+        raise NotImplementedError
+
+    def _bucket(self, level, column):
+        raise NotImplementedError
+
+    def _fetch(self, sql, params):
+        raise NotImplementedError
+
+    def _select(self, dataset, key):
+        filter_key, group_by, metrics, time_grain = key
+        columns = DATASET_COLUMNS[dataset]
+        functions = {'sum': 'SUM', 'mean': 'AVG', 'count': 'COUNT', 'min': 'MIN', 'max': 'MAX',
+                     'std': self.std_function}
+
+        select = [_quote(column) for column in group_by]
+        if time_grain:
+            select.append(f"{self._bucket(time_grain, _quote(columns['date']))} AS {_quote(columns['date'])}")
+        positions = ", ".join(str(i + 1) for i in range(len(select)))
+        select += [f"{functions[metric]}({_quote(columns['value'])}) AS {_quote(metric)}" for metric in metrics]
+
+        where, params = [], []
+        for column, values in filter_key:
+            values = [_native(value) for value in values if value is not None]
+            if not values:
+                where.append("1 = 0")
+                continue
+            where.append(f"{_quote(column)} IN ({', '.join('?' * len(values))})")
+            params.extend(values)
+
+        sql = f"SELECT {', '.join(select)} FROM {_quote(dataset)}"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        if positions:
+            sql += f" GROUP BY {positions} ORDER BY {positions}"
+        return sql, params
+
+    def query(self, core, dataset, key):
+        """Run a normalized query (see ``normalize_query``) as SQL."""
+        sql, params = self._select(dataset, key)
+        with self._lock:
+            self._ensure(core, dataset)
+            result = self._fetch(sql, params)
+        date_column = DATASET_COLUMNS[dataset]['date']
+        if key[3] and date_column in result:
+            result[date_column] = pd.to_datetime(result[date_column]).astype('datetime64[ns]')
+        return result
+
+    def summary(self, core, dataset):
+        """Row count, date range, value total and distinct summary values."""
+        columns = DATASET_COLUMNS[dataset]
+        date, value = _quote(columns['date']), _quote(columns['value'])
+        table = _quote(dataset)
+        with self._lock:
+            self._ensure(core, dataset)
+            totals = self._fetch(
+                f"SELECT COUNT(*) AS n, MIN({date}) AS start, MAX({date}) AS finish, SUM({value}) AS total "
+                f"FROM {table}", []
+            ).iloc[0]
+            values = {
+                column: self._fetch(
+                    f"SELECT DISTINCT {_quote(column)} AS v FROM {table} ORDER BY 1", []
+                )['v'].tolist()
+                for column in SUMMARY_COLUMNS[dataset]
+            }
+        return {
+            'rows': int(totals['n']),
+            'start': pd.Timestamp(totals['start']),
+            'end': pd.Timestamp(totals['finish']),
+            'total': totals['total'],
+            'values': values,
+        }
+
+
+class SQLiteBackend(SQLBackend):
+    """
+    SQLite backend with an index on each table's filter columns.
+
+    Dates are stored as ``YYYY-MM-DD`` text, which sorts and compares
+    like the dates themselves.
+    """
+
+    name = 'sqlite'
+    std_function = 'STDEV'
+
+    def __init__(self, database=':memory:'):
+        super().__init__()
+        self._conn = sqlite3.connect(database, check_same_thread=False)
+        self._conn.create_aggregate('STDEV', 1, _StdDev)
+
+    def _load(self, dataset, df):
+        date_column = DATASET_COLUMNS[dataset]['date']
+        table = df.copy()
+        table[date_column] = table[date_column].dt.strftime('%Y-%m-%d')
+        table.to_sql(dataset, self._conn, if_exists='replace', index=False)
+        filter_columns = ", ".join(_quote(column) for column in FILTER_COLUMNS[dataset])
+        self._conn.execute(
+            f"CREATE INDEX {_quote(f'idx_{dataset}_filters')} ON {_quote(dataset)} ({filter_columns})"
+        )
+        self._conn.commit()
+
+    def _bucket(self, level, column):
+        if level == 'week':
+            # strftime('%w') is 0 on Sunday; weeks start on Monday
+            return f"date({column}, '-' || ((CAST(strftime('%w', {column}) AS INTEGER) + 6) % 7) || ' days')"
+        if level == 'month':
+            return f"strftime('%Y-%m-01', {column})"
+        if level == 'quarter':
+            return (f"printf('%s-%02d-01', strftime('%Y', {column}), "
+                    f"((CAST(strftime('%m', {column}) AS INTEGER) - 1) / 3) * 3 + 1)")
+        return f"strftime('%Y-01-01', {column})"
+
+    def _fetch(self, sql, params):
+        return pd.read_sql_query(sql, self._conn, params=params)
+
+
+class DuckDBBackend(SQLBackend):
+    """DuckDB backend; queries scan its columnar tables on all cores."""
+
+    name = 'duckdb'
+    std_function = 'STDDEV_SAMP'
+
+    def __init__(self, database=':memory:', threads=None):
+        super().__init__()
+        try:
+            import duckdb
+        except ImportError:
+            raise ImportError("The DuckDB backend requires duckdb. Install with: pip install duckdb")
+        config = {'threads': threads} if threads else {}
+        self._conn = duckdb.connect(database, config=config)
+
+    def _load(self, dataset, df):
+        self._conn.register('_frame', df)
+        self._conn.execute(f"CREATE OR REPLACE TABLE {_quote(dataset)} AS SELECT * FROM _frame")
+        self._conn.unregister('_frame')
+
+    def _bucket(self, level, column):
+        return f"CAST(date_trunc('{level}', {column}) AS DATE)"
+
+    def _fetch(self, sql, params):
+        return self._conn.execute(sql, params).df()
+
+
+BACKENDS = {
+    'pandas': PandasBackend,
+    'sqlite': SQLiteBackend,
+    'duckdb': DuckDBBackend,
+}
+
+_backends = {}
+_backends_lock = threading.Lock()
+
+
+def get_backend(name='pandas'):
+    """Return the process-wide backend instance for a name."""
+    if name not in BACKENDS:
+        raise ValueError(f"Backend must be one of {tuple(BACKENDS)}")
+    with _backends_lock:
+        backend = _backends.get(name)
+        if backend is None:
+            backend = BACKENDS[name]()
+            _backends[name] = backend
+        return backend
@@ -0,0 +1,366 @@
+"""
+Bounded, memory-accounted caches for derived results.
+
+All caches created from one ``CachePolicy`` share a global byte budget.
+Each entry is measured when stored (DataFrames by their deep memory
+usage, Plotly figures by the arrays and strings in their traces), and
+when the budget is exceeded the policy evicts across every cache using
+LRU or LFU order. Individual caches can also expire entries after a TTL
+and cap their entry count.
+
+Caches are safe to share between threads. Lookups only take the lock of
+their own cache, and concurrent misses on the same key wait for a single
+computation (single-flight) instead of repeating it.
+"""
+
+import itertools
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_MAX_MB = 512
+EVICTION_POLICIES = ('lru', 'lfu')
+
+_MISSING = object()
+
+
+def measure_size(obj, _seen=None):
+    """
+    Estimate the memory held by a cached value in bytes.
+
+    Handles DataFrames/Series/Index (deep memory usage), numpy arrays,
+    Plotly figures, nested dicts, lists and tuples of those, and plain
+    objects by their attributes.
+    """
+    if _seen is None:
+        _seen = set()
+    if id(obj) in _seen:
+        return 0
+    _seen.add(id(obj))
+
+    if isinstance(obj, pd.DataFrame):
+        return int(obj.memory_usage(index=True, deep=True).sum())
+    if isinstance(obj, (pd.Series, pd.Index)):
+        return int(obj.memory_usage(deep=True))
+    if isinstance(obj, np.ndarray):
+        if obj.dtype == object:
+            return int(pd.Series(obj.ravel(), copy=False).memory_usage(index=False, deep=True))
+        return obj.nbytes
+    if hasattr(obj, 'to_plotly_json'):
+        return measure_size(obj.to_plotly_json(), _seen)
+    if isinstance(obj, dict):
+        return sys.getsizeof(obj) + sum(
+            measure_size(k, _seen) + measure_size(v, _seen) for k, v in obj.items()
+        )
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        return sys.getsizeof(obj) + sum(measure_size(v, _seen) for v in obj)
+    if hasattr(obj, '__dict__') and not isinstance(obj, type):
+        # Derived structures such as indexes and time pyramids
+        return sys.getsizeof(obj) + measure_size(vars(obj), _seen)
+    return sys.getsizeof(obj)
+
+
+class _Entry:
+    __slots__ = ('value', 'size', 'created', 'last_used', 'hits')
+
+    def __init__(self, value, size, created, last_used):
+        self.value = value
+        self.size = size
+        self.created = created
+        self.last_used = last_used
+        self.hits = 0
+
+
+class _Flight:
+    """A computation in progress that other callers can wait on."""
+
+    __slots__ = ('done', 'value', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+    def wait(self):
+        self.done.wait()
+        if self.error is not None:
+            raise self.error
+        return self.value
+
+
+class BoundedCache:
+    """
+    One named cache governed by a ``CachePolicy``.
+
+    Use ``CachePolicy.cache()`` to create instances.
+    """
+
+    def __init__(self, name, policy, ttl=None, max_entries=None):
+        self.name = name
+        self.policy = policy
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._inflight = {}
+        self.lock = threading.RLock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.rejections = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return self.get(key, _MISSING, count=False) is not _MISSING
+
+    def _expired(self, entry, now):
+        return self.ttl is not None and now - entry.created > self.ttl
+
+    def _remove(self, key):
+        entry = self._entries.pop(key)
+        self.bytes -= entry.size
+        self.policy._add_bytes(-entry.size)
+        return entry
+
+    def get(self, key, default=None, count=True):
+        """Return the cached value for ``key`` or ``default``."""
+        with self.lock:
+            entry = self._entries.get(key)
+            now = time.monotonic()
+            if entry is not None and self._expired(entry, now):
+                self._remove(key)
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                if count:
+                    self.misses += 1
+                return default
+            if count:
+                self.hits += 1
+                entry.hits += 1
+                entry.last_used = next(self.policy.clock)
+                self._entries.move_to_end(key)
+            return entry.value
+
+    def put(self, key, value):
+        """Store a value, evicting other entries if the budget requires it."""
+        size = measure_size(value)
+        with self.lock:
+            if key in self._entries:
+                self._remove(key)
+            if size > self.policy.max_bytes:
+                self.rejections += 1
+                return value
+            self._entries[key] = _Entry(value, size, time.monotonic(), next(self.policy.clock))
+            self.bytes += size
+            self.policy._add_bytes(size)
+            if self.max_entries is not None:
+                while len(self._entries) > self.max_entries:
+                    self._remove(next(iter(self._entries)))
+                    self.evictions += 1
+        # Outside this cache's lock: eviction may visit every cache
+        self.policy.enforce()
+        return value
+
+    def get_or_compute(self, key, compute):
+        """
+        Return the cached value or compute, store and return it.
+
+        Concurrent callers missing the same key wait for the first one's
+        computation; if it raises, they all see the same exception.
+        """
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        with self.lock:
+            value = self.get(key, _MISSING, count=False)
+            if value is not _MISSING:
+                return value
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[key] = _Flight()
+        if not leader:
+            return flight.wait()
+
+        try:
+            flight.value = self.put(key, compute())
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self.lock:
+                self._inflight.pop(key, None)
+            flight.done.set()
+        return flight.value
+
+    def items(self, predicate=None):
+        """Snapshot of ``(key, value)`` pairs, without counting as hits."""
+        with self.lock:
+            return [
+                (key, entry.value) for key, entry in self._entries.items()
+                if predicate is None or predicate(key)
+            ]
+
+    def discard(self, predicate):
+        """Drop every entry whose key satisfies ``predicate``."""
+        with self.lock:
+            for key in [k for k in self._entries if predicate(k)]:
+                self._remove(key)
+
+    def clear(self):
+        """Drop all entries."""
+        self.discard(lambda key: True)
+
+    def stats(self):
+        """Size, hit and eviction counters for this cache."""
+        with self.lock:
+            return self._stats()
+
+    def _stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'bytes': self.bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+            'rejections': self.rejections,
+            'ttl': self.ttl,
+            'max_entries': self.max_entries,
+        }
+
+
+class CachePolicy:
+    """
+    Global memory budget shared by a set of named caches.
+
+    Args:
+        max_bytes (int, optional): Budget across all caches. Defaults to
+            ``FREIGHT_CACHE_MAX_MB`` (or 512) megabytes.
+        eviction (str, optional): ``'lru'`` or ``'lfu'``. Defaults to
+            ``FREIGHT_CACHE_EVICTION`` or ``'lru'``.
+    """
+
+    def __init__(self, max_bytes=None, eviction=None):
+        if max_bytes is None:
+            max_bytes = int(float(os.environ.get("FREIGHT_CACHE_MAX_MB", DEFAULT_MAX_MB)) * 1024 * 1024)
+        eviction = eviction or os.environ.get("FREIGHT_CACHE_EVICTION", 'lru')
+        if eviction not in EVICTION_POLICIES:
+            raise ValueError("Eviction must be 'lru' or 'lfu'")
+        self.max_bytes = max_bytes
+        self.eviction = eviction
+        self.total_bytes = 0
+        # Serializes eviction and cache creation; never taken by lookups
+        self.lock = threading.RLock()
+        self._bytes_lock = threading.Lock()
+        self.clock = itertools.count()
+        self._caches = {}
+
+    def cache(self, name, ttl=None, max_entries=None):
+        """
+        Return the named cache, creating it on first use.
+
+        Args:
+            name (str): Cache name, reported in ``stats()``.
+            ttl (float, optional): Seconds before an entry expires.
+            max_entries (int, optional): Cap on the number of entries.
+        """
+        with self.lock:
+            cache = self._caches.get(name)
+            if cache is None:
+                cache = BoundedCache(name, self, ttl, max_entries)
+                self._caches[name] = cache
+            return cache
+
+    def caches(self):
+        """All caches governed by this policy."""
+        with self.lock:
+            return list(self._caches.values())
+
+    def _add_bytes(self, size):
+        with self._bytes_lock:
+            self.total_bytes += size
+
+    def _victim(self):
+        best = None
+        for cache in list(self._caches.values()):
+            with cache.lock:
+                if not cache._entries:
+                    continue
+                if self.eviction == 'lru':
+                    # Entries are kept in recency order, so the head is the LRU one
+                    key = next(iter(cache._entries))
+                    rank = cache._entries[key].last_used
+                    if best is None or rank < best[0]:
+                        best = (rank, cache, key)
+                else:
+                    for key, entry in cache._entries.items():
+                        rank = (entry.hits, entry.last_used)
+                        if best is None or rank < best[0]:
+                            best = (rank, cache, key)
+        return best
+
+    def enforce(self):
+        """Evict entries until the total size fits the budget."""
+        if self.total_bytes <= self.max_bytes:
+            return
+        with self.lock:
+            while self.total_bytes > self.max_bytes:
+                victim = self._victim()
+                if victim is None:
+                    break
+                _, cache, key = victim
+                with cache.lock:
+                    if key in cache._entries:
+                        cache._remove(key)
+                        cache.evictions += 1
+
+    def clear(self):
+        """Drop every entry in every cache."""
+        for cache in self.caches():
+            cache.clear()
+
+    def stats(self):
+        """Per-cache statistics plus budget totals."""
+        with self.lock:
+            caches = {cache.name: cache.stats() for cache in list(self._caches.values())}
+            return {
+                'max_bytes': self.max_bytes,
+                'total_bytes': self.total_bytes,
+                'eviction': self.eviction,
+                'hits': sum(c['hits'] for c in caches.values()),
+                'misses': sum(c['misses'] for c in caches.values()),
+                'evictions': sum(c['evictions'] for c in caches.values()),
+                'caches': caches,
+            }
+
+
+_default_policy = None
+_policy_lock = threading.Lock()
+
+
+def default_policy():
+    """The process-wide policy used by the shared compute core."""
+    global _default_policy
+    if _default_policy is None:
+        # Two sessions racing here must not each create a policy
+        with _policy_lock:
+            if _default_policy is None:
+                _default_policy = CachePolicy()
+    return _default_policy
+
+
+def cache_stats():
+    """Statistics of the process-wide cache policy."""
+    return default_policy().stats()
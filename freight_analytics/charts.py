@@ -0,0 +1,362 @@
+"""
+Compact Plotly payloads.
+
+``compact_figure`` rewrites the numeric data arrays of a figure's traces
+with Plotly's typed-array encoding (``{'dtype', 'bdata', 'shape'}``, the
+base64 of the raw little-endian bytes), using the narrowest type that
+holds every value exactly: a small integer type, float32 when no
+precision is lost, float64 otherwise. Dates are sent as float64
+milliseconds on a date axis instead of ISO strings. Evenly spaced
+coordinates collapse to ``x0``/``dx``, so traces sharing a regular axis
+(years, weeks, month numbers) no longer each carry a copy of it. Traces
+sharing an irregular axis (month starts, weeks with gaps) still carry one
+typed-array copy each: a plotly.js trace cannot refer to another trace's
+coordinates, and ``dx`` is a fixed number of milliseconds, not a month.
+
+plotly.js decodes typed arrays natively from 2.28 on (bundled with
+plotly 5.19 and Streamlit 1.34 and later), so the chart renders the same
+from a fraction of the bytes. With older releases installed the arrays
+are left as JSON lists; the date and linear-space rewrites still apply.
+
+When ``FREIGHT_CHART_SIZES`` is set (or debug logging is on), the
+dashboards measure each chart's payload before and after compaction;
+``chart_payload_stats()`` returns the latest sizes per chart.
+
+``figure_delta`` compares a figure with the one last sent to a client and
+returns only the traces that were added, changed or removed, for
+clients that keep the chart and update it with ``Plotly.react``.
+"""
+
+import base64
+import functools
+import hashlib
+import importlib.metadata
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+import plotly.colors
+import plotly.graph_objects as go
+import plotly.io as pio
+from plotly.offline import get_plotlyjs_version
+
+MIN_ARRAY_LENGTH = 8
+INTEGER_TYPES = ('i1', 'u1', 'i2', 'u2', 'i4', 'u4')
+
+# Trace attributes that may be typed arrays; dates only on the axes
+DATA_KEYS = ('x', 'y', 'z', 'values', 'customdata', 'lat', 'lon', 'open', 'high', 'low', 'close')
+MARKER_KEYS = ('color', 'colors', 'size')
+AXIS_KEYS = ('x', 'y')
+# Trace types that accept x0/dx and y0/dy in place of x and y
+LINEAR_SPACE_TYPES = {'scatter', 'scattergl', 'bar', 'heatmap'}
+
+# First plotly.js release decoding typed arrays, and the first Streamlit
+# release whose bundled plotly.js has it
+TYPED_ARRAY_PLOTLYJS = (2, 28)
+TYPED_ARRAY_STREAMLIT = (1, 34)
+
+MEASURE_ENV = "FREIGHT_CHART_SIZES"
+MAX_MEASURED_CHARTS = 256
+
+_payload_sizes = OrderedDict()
+_payload_sizes_lock = threading.Lock()
+
+
+def _release(version):
+    return tuple(int(part) for part in re.findall(r'\d+', version)[:2])
+
+
+@functools.lru_cache(maxsize=None)
+def typed_arrays_supported():
+    """
+    Whether the plotly.js that will draw the charts decodes typed arrays.
+
+    Checks the plotly.js bundled with plotly (served by ``react_chart``)
+    and the installed Streamlit release (for ``st.plotly_chart``).
+    """
+    if _release(get_plotlyjs_version()) < TYPED_ARRAY_PLOTLYJS:
+        return False
+    try:
+        streamlit_version = importlib.metadata.version('streamlit')
+    except importlib.metadata.PackageNotFoundError:
+        return True
+    return _release(streamlit_version) >= TYPED_ARRAY_STREAMLIT
+
+
+def _numeric(value, allow_dates):
+    """``(float or integer array, is_date)`` for numeric data, else None."""
+    if isinstance(value, (pd.Series, pd.Index)):
+        value = value.to_numpy()
+    if not isinstance(value, (np.ndarray, list, tuple)) or len(value) < MIN_ARRAY_LENGTH:
+        return None
+    values = np.asarray(value)
+    if values.dtype.kind in 'iuf':
+        return values, False
+    if values.dtype.kind == 'M':
+        return (values.astype('datetime64[ms]').astype(np.int64).astype(np.float64), True) if allow_dates else None
+    if values.dtype.kind != 'O' or values.ndim != 1:
+        return None
+
+    kind = pd.api.types.infer_dtype(values, skipna=True)
+    if kind in ('integer', 'floating', 'mixed-integer-float'):
+        return pd.to_numeric(pd.Series(values), errors='coerce').to_numpy(dtype=np.float64), False
+    if allow_dates and kind in ('datetime', 'datetime64', 'date'):
+        dates = pd.to_datetime(pd.Series(values)).to_numpy(dtype='datetime64[ms]')
+        ms = dates.astype(np.int64).astype(np.float64)
+        ms[np.isnat(dates)] = np.nan
+        return ms, True
+    return None
+
+
+def _dtype(values):
+    """Narrowest typed-array type holding ``values`` exactly, or None."""
+    if values.dtype.kind in 'iu':
+        low, high = values.min(), values.max()
+    else:
+        finite = np.isfinite(values)
+        if finite.all() and np.array_equal(values, np.round(values)):
+            low, high = values.min(), values.max()
+        else:
+            with np.errstate(over='ignore'):
+                single = values.astype(np.float32)
+            return 'f4' if np.array_equal(single, values, equal_nan=True) else 'f8'
+    for code in INTEGER_TYPES:
+        info = np.iinfo(code)
+        if info.min <= low and high <= info.max:
+            return code
+    # Integers beyond 32 bits only survive as float64 up to 2**53
+    return 'f8' if max(abs(int(low)), abs(int(high))) <= 2 ** 53 else None
+
+
+def encode_array(values):
+    """
+    Plotly typed-array spec for a numeric array, or None.
+
+    Returns:
+        dict: ``dtype``, ``bdata`` and, for 2-D arrays, ``shape``.
+    """
+    code = _dtype(values)
+    if code is None:
+        return None
+    raw = np.ascontiguousarray(values.astype('<' + code))
+    spec = {'dtype': code, 'bdata': base64.b64encode(raw.tobytes()).decode('ascii')}
+    if raw.ndim > 1:
+        spec['shape'] = ", ".join(str(size) for size in raw.shape)
+    return spec
+
+
+def _linear(values):
+    """``(start, step)`` when a 1-D array is evenly spaced, else None."""
+    if values.ndim != 1 or len(values) < 3 or not np.isfinite(values).all():
+        return None
+    steps = np.diff(values)
+    if steps[0] == 0 or not (steps == steps[0]).all():
+        return None
+    return values[0], steps[0]
+
+
+def _axis_layout(trace, key):
+    anchor = trace.get(f'{key}axis') or key
+    return f'{key}axis' + anchor[1:]
+
+
+def _compact_trace(trace, layout, typed_arrays):
+    linear_space = trace.get('type', 'scatter') in LINEAR_SPACE_TYPES
+    for key in DATA_KEYS:
+        numeric = _numeric(trace.get(key), allow_dates=key in AXIS_KEYS)
+        if numeric is None:
+            continue
+        values, is_date = numeric
+        if is_date:
+            axis = layout.setdefault(_axis_layout(trace, key), {})
+            if axis.get('type', 'date') != 'date':
+                continue
+            axis['type'] = 'date'
+
+        linear = _linear(values) if linear_space and key in AXIS_KEYS else None
+        if linear is not None:
+            start, step = linear
+            del trace[key]
+            trace[f'{key}0'] = pd.Timestamp(int(start), unit='ms').isoformat() if is_date else start.item()
+            trace[f'd{key}'] = step.item()
+            continue
+        spec = encode_array(values) if typed_arrays else None
+        if spec is not None:
+            trace[key] = spec
+
+    marker = trace.get('marker')
+    if typed_arrays and isinstance(marker, dict):
+        for key in MARKER_KEYS:
+            numeric = _numeric(marker.get(key), allow_dates=False)
+            if numeric is not None:
+                spec = encode_array(numeric[0])
+                if spec is not None:
+                    marker[key] = spec
+
+
+class CompactFigure(go.Figure):
+    """
+    Serialization wrapper around a compacted figure dict.
+
+    ``st.plotly_chart`` and ``plotly.io.to_json`` read the figure through
+    ``to_dict()``/``to_plotly_json()``, which return the compact payload;
+    the wrapper itself holds no traces.
+    """
+
+    def __init__(self, payload):
+        super().__init__()
+        self._payload = payload
+
+    def to_dict(self):
+        return self._payload
+
+    def to_plotly_json(self):
+        return self._payload
+
+
+def compact_figure(fig, typed_arrays=None):
+    """
+    Figure with typed-array trace data and linear-space axes.
+
+    Args:
+        fig (plotly.graph_objects.Figure or dict): Figure to send.
+        typed_arrays (bool, optional): Encode typed arrays; defaults to
+            ``typed_arrays_supported()``.
+
+    Returns:
+        CompactFigure: Figure to pass to ``st.plotly_chart``.
+    """
+    payload = fig.to_dict() if isinstance(fig, go.Figure) else dict(fig)
+    payload['layout'] = dict(payload.get('layout') or {})
+    if typed_arrays is None:
+        typed_arrays = typed_arrays_supported()
+    for trace in payload.get('data', []):
+        _compact_trace(trace, payload['layout'], typed_arrays)
+    return CompactFigure(payload)
+
+
+def payload_sizes(fig, compact=None):
+    """
+    JSON payload bytes of a figure before and after compaction.
+
+    Returns:
+        dict: ``json_bytes``, ``compact_bytes`` and ``ratio`` (compact over
+        original).
+    """
+    compact = compact if compact is not None else compact_figure(fig)
+    before = len(pio.to_json(fig, validate=False).encode('utf-8'))
+    after = len(pio.to_json(compact, validate=False).encode('utf-8'))
+    return {'json_bytes': before, 'compact_bytes': after, 'ratio': after / before if before else 1.0}
+
+
+def measuring_payloads():
+    """Whether ``FREIGHT_CHART_SIZES`` asks for per-chart payload sizes."""
+    return os.environ.get(MEASURE_ENV, "").strip().lower() in ("1", "true", "yes", "on")
+
+
+def record_payload_sizes(name, sizes):
+    """Keep the latest ``payload_sizes`` of the chart called ``name``."""
+    with _payload_sizes_lock:
+        _payload_sizes.pop(name, None)
+        _payload_sizes[name] = dict(sizes)
+        while len(_payload_sizes) > MAX_MEASURED_CHARTS:
+            _payload_sizes.popitem(last=False)
+
+
+def chart_payload_stats():
+    """
+    Payload sizes of the charts measured in this process.
+
+    Returns:
+        dict: ``charts`` (chart title to its latest ``payload_sizes``) and
+        the ``json_bytes``, ``compact_bytes`` and ``ratio`` over them.
+    """
+    with _payload_sizes_lock:
+        charts = {name: dict(sizes) for name, sizes in _payload_sizes.items()}
+    before = sum(sizes['json_bytes'] for sizes in charts.values())
+    after = sum(sizes['compact_bytes'] for sizes in charts.values())
+    return {'charts': charts, 'json_bytes': before, 'compact_bytes': after,
+            'ratio': after / before if before else 1.0}
+
+
+def color_map(values, palette=None):
+    """
+    Fixed color per value, e.g. per railroad of the full option list.
+
+    Passed as ``color_discrete_map`` it keeps each series' color when the
+    selection changes, so unaffected traces stay unchanged.
+    """
+    palette = palette or plotly.colors.qualitative.Plotly
+    return {value: palette[i % len(palette)] for i, value in enumerate(values)}
+
+
+def figure_payload(fig):
+    """Compact figure as plain JSON-ready dicts and lists."""
+    return json.loads(pio.to_json(compact_figure(fig), validate=False))
+
+
+def _trace_ids(traces):
+    ids, seen = [], {}
+    for position, trace in enumerate(traces):
+        base = str(trace.get('uid') or trace.get('name') or position)
+        count = seen.get(base, 0)
+        seen[base] = count + 1
+        ids.append(base if count == 0 else f'{base}#{count}')
+    return ids
+
+
+def _digest(value):
+    return hashlib.sha1(json.dumps(value, sort_keys=True, separators=(',', ':')).encode('utf-8')).hexdigest()
+
+
+def figure_delta(payload, sent=None, full=False):
+    """
+    Changes from the figure last sent to a client to ``payload``.
+
+    Traces are matched by ``uid``, else by name, else by position; each
+    trace's ``uid`` is set to its id so ``Plotly.react`` matches them too.
+
+    Args:
+        payload (dict): JSON-ready figure, e.g. from ``figure_payload``.
+        sent (dict, optional): State returned by the previous call.
+        full (bool): Send every trace even if ``sent`` is given.
+
+    Returns:
+        tuple: ``(delta, state)``. The delta has ``version``, ``base`` (the
+        version it applies to; None for a full figure), ``order`` (trace
+        ids), ``traces`` (id to added or changed trace), ``remove`` (ids)
+        and ``layout`` (None when unchanged). With nothing changed the
+        previous delta is returned again.
+    """
+    traces = payload.get('data', [])
+    ids = _trace_ids(traces)
+    digests = {}
+    for trace_id, trace in zip(ids, traces):
+        trace['uid'] = trace_id
+        digests[trace_id] = _digest(trace)
+    layout = payload.get('layout', {})
+    layout_digest = _digest(layout)
+
+    base = None if full or sent is None else sent
+    previous = base['traces'] if base else {}
+    changed = {trace_id: trace for trace_id, trace in zip(ids, traces) if previous.get(trace_id) != digests[trace_id]}
+    removed = [trace_id for trace_id in previous if trace_id not in digests]
+    layout_changed = base is None or base['layout'] != layout_digest
+    if base and not changed and not removed and not layout_changed and base['order'] == ids:
+        return base['delta'], base
+
+    version = sent['version'] + 1 if sent else 1
+    delta = {
+        'version': version,
+        'base': base['version'] if base else None,
+        'order': ids,
+        'traces': changed,
+        'remove': removed,
+        'layout': layout if layout_changed else None,
+    }
+    state = {'version': version, 'traces': digests, 'layout': layout_digest, 'order': ids, 'delta': delta}
+    return delta, state
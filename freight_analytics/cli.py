@@ -17,6 +17,11 @@ Examples:
   freight-dashboard --port 8502        # Launch on custom port
   freight-dashboard --host 0.0.0.0    # Launch accessible from network
   freight-dashboard --demo             # Launch with demo data
+  freight-dashboard watch --jsonl alerts.jsonl   # Headless alerting
+  freight-dashboard report --output reports      # Static HTML reports
+  freight-dashboard snapshot -o state.pkl        # Warm-start snapshot
+  freight-dashboard warmup --app streamlit_app.py  # Boot-time warm-up
+  freight-dashboard validate                     # Data validation report
         """
     )
     
@@ -46,8 +51,34 @@ Examples:
         version=f"freight-analytics-dashboard {get_version()}"
     )
     
+    subparsers = parser.add_subparsers(dest="command", metavar="command")
+    add_watch_parser(subparsers)
+    add_report_parser(subparsers)
+    add_snapshot_parser(subparsers)
+    add_warmup_parsers(subparsers)
+    add_validate_parser(subparsers)
+    
     args = parser.parse_args()
     
+    if args.command == "watch":
+        watch(args)
+        return
+    if args.command == "report":
+        report(args)
+        return
+    if args.command == "snapshot":
+        snapshot(args)
+        return
+    if args.command == "warmup":
+        warmup(args)
+        return
+    if args.command == "ready":
+        ready(args)
+        return
+    if args.command == "validate":
+        validate(args)
+        return
+    
     # Get the package directory
     package_dir = Path(__file__).parent
     app_file = package_dir / "app.py"
@@ -82,6 +113,216 @@ Examples:
         print("❌ Streamlit not found. Please install with: pip install streamlit")
         sys.exit(1)
 
+def add_watch_parser(subparsers):
+    """Arguments of the headless ``watch`` command."""
+    parser = subparsers.add_parser(
+        "watch",
+        help="Watch the data files and write alerts without starting the dashboard",
+        description="Keep the datasets loaded, poll the data files for changes and "
+                    "evaluate the anomaly, growth-drop and capacity rules on new months."
+    )
+    parser.add_argument("--data-dir", help="Directory with the data files (default: search the usual locations)")
+    parser.add_argument("--interval", type=float, default=60, help="Seconds between checks (default: 60)")
+    parser.add_argument("--once", action="store_true", help="Check once and exit")
+    parser.add_argument("--jsonl", metavar="PATH", help="Append alerts as JSON lines to PATH")
+    parser.add_argument("--syslog", metavar="ADDRESS", nargs="?", const="/dev/log",
+                        help="Send alerts to syslog (default: /dev/log, or host:port)")
+    parser.add_argument("--webhook", metavar="URL", help="POST alerts as JSON to URL")
+    parser.add_argument("--threshold", type=float, default=80.0,
+                        help="Capacity utilization alert threshold in percent (default: 80)")
+    parser.add_argument("--consecutive", type=int, default=3,
+                        help="Months above the threshold before alerting (default: 3)")
+    parser.add_argument("--growth-drop", type=float, default=20.0,
+                        help="Year-over-year monthly decline that raises an alert, in percent (default: 20)")
+    return parser
+
+def watch(args):
+    """Run the headless alerting loop."""
+    import logging
+    from .alerts import (
+        AnomalyRule, CapacityRule, GrowthDropRule, JsonlSink, SyslogSink, Watcher, WebhookSink
+    )
+    from .core import get_core
+    
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    
+    sinks = []
+    if args.jsonl:
+        sinks.append(JsonlSink(args.jsonl))
+    if args.syslog:
+        sinks.append(SyslogSink(args.syslog))
+    if args.webhook:
+        sinks.append(WebhookSink(args.webhook))
+    if not sinks:
+        print("❌ No alert sink given. Use --jsonl, --syslog and/or --webhook.")
+        sys.exit(2)
+    
+    watcher = Watcher(
+        get_core(args.data_dir),
+        sinks,
+        rules=[AnomalyRule(), GrowthDropRule(args.growth_drop)],
+        capacity_rule=CapacityRule(args.threshold, args.consecutive),
+        interval=args.interval
+    )
+    
+    print("🔔 Watching freight data for alerts...")
+    print("🛑 Press Ctrl+C to stop")
+    try:
+        watcher.run(once=args.once)
+    except KeyboardInterrupt:
+        print("\n👋 Watcher stopped.")
+
+def add_report_parser(subparsers):
+    """Arguments of the ``report`` command."""
+    parser = subparsers.add_parser(
+        "report",
+        help="Render static HTML reports for every railroad and port",
+        description="Render a self-contained HTML report per railroad and per port. "
+                    "Entities whose input rows are unchanged since the last run are skipped."
+    )
+    parser.add_argument("--output", "-o", default="reports", help="Output directory (default: reports)")
+    parser.add_argument("--dataset", choices=["rail", "port", "all"], default="all",
+                        help="Which entities to report on (default: all)")
+    parser.add_argument("--data-dir", help="Directory with the data files (default: search the usual locations)")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+    parser.add_argument("--force", action="store_true", help="Re-render reports even if their inputs are unchanged")
+    parser.add_argument("--plotlyjs", choices=["inline", "cdn", "directory"], default="inline",
+                        help="Embed plotly.js in every report (inline, the default), load it from the "
+                             "CDN, or share one plotly.min.js per dataset directory")
+    return parser
+
+def report(args):
+    """Render the static report pack."""
+    import time
+    from .reports import generate_reports
+    
+    datasets = ("rail", "port") if args.dataset == "all" else (args.dataset,)
+    print(f"📄 Rendering reports into {args.output}...")
+    started = time.perf_counter()
+    result = generate_reports(
+        args.output, datasets, data_dir=args.data_dir, workers=args.workers, force=args.force,
+        allow_fork=True, plotlyjs=args.plotlyjs
+    )
+    elapsed = time.perf_counter() - started
+    print(f"✅ {len(result['rendered'])} rendered, {len(result['skipped'])} unchanged "
+          f"in {elapsed:.1f}s")
+
+def add_snapshot_parser(subparsers):
+    """Arguments of the ``snapshot`` command."""
+    parser = subparsers.add_parser(
+        "snapshot",
+        help="Write a warm-start snapshot of the preprocessed data",
+        description="Load and preprocess the datasets, build the default aggregates and "
+                    "write them to a snapshot file. Point FREIGHT_SNAPSHOT at the file to "
+                    "start dashboards warm."
+    )
+    parser.add_argument("--output", "-o",
+                        help="Snapshot file (default: $FREIGHT_SNAPSHOT or the cache directory)")
+    parser.add_argument("--data-dir", help="Directory with the data files (default: search the usual locations)")
+    return parser
+
+def snapshot(args):
+    """Build the warm-start snapshot."""
+    import time
+    from .core import get_core
+    from .snapshot import default_snapshot_path, save_snapshot
+    
+    path = Path(args.output) if args.output else default_snapshot_path()
+    print(f"📦 Building snapshot {path}...")
+    started = time.perf_counter()
+    try:
+        header = save_snapshot(get_core(args.data_dir), path)
+    except FileNotFoundError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    elapsed = time.perf_counter() - started
+    size_mb = path.stat().st_size / 1024 / 1024
+    print(f"✅ {', '.join(header['versions'])} snapshot written ({size_mb:.1f} MB) in {elapsed:.1f}s")
+
+def add_warmup_parsers(subparsers):
+    """Arguments of the ``warmup`` and ``ready`` commands."""
+    warmup_parser = subparsers.add_parser(
+        "warmup",
+        help="Warm the data and default views before the server starts",
+        description="Load the datasets, render every page and analysis type of the "
+                    "dashboard headlessly, write the warm-start snapshot and mark the "
+                    "replica ready."
+    )
+    warmup_parser.add_argument("--app", default=str(Path(__file__).parent / "app.py"),
+                               help="Dashboard script to render (default: the packaged app)")
+    warmup_parser.add_argument("--snapshot", help="Snapshot file (default: $FREIGHT_SNAPSHOT or the cache directory)")
+    warmup_parser.add_argument("--ready-file", help="Ready marker (default: $FREIGHT_READY_FILE)")
+    warmup_parser.add_argument("--data-dir", help="Directory with the data files (default: search the usual locations)")
+    
+    ready_parser = subparsers.add_parser(
+        "ready",
+        help="Exit 0 once warm-up has finished and the server is healthy",
+        description="Readiness probe for containers: succeeds only after 'warmup' has "
+                    "finished and the Streamlit health endpoint answers."
+    )
+    ready_parser.add_argument("--ready-file", help="Ready marker (default: $FREIGHT_READY_FILE)")
+    ready_parser.add_argument("--url", default="http://localhost:8501/_stcore/health",
+                              help="Server health URL; empty to skip (default: %(default)s)")
+    return warmup_parser, ready_parser
+
+def warmup(args):
+    """Run the boot-time warm-up."""
+    import logging
+    from .warmup import warm_up
+    
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    print("🔥 Warming up data and default views...")
+    info = warm_up(args.app, args.snapshot, args.ready_file, args.data_dir)
+    for dataset, reason in info['missing'].items():
+        print(f"⚠️ {dataset} not warmed: {reason}")
+    print(f"✅ Ready in {info['seconds']:.1f}s: {len(info['rendered'])} views rendered, "
+          f"{len(info['failed'])} failed")
+
+def ready(args):
+    """Exit with 0 when the replica is ready for traffic."""
+    from .warmup import is_ready
+    
+    sys.exit(0 if is_ready(args.ready_file, args.url) else 1)
+
+def add_validate_parser(subparsers):
+    """Arguments of the ``validate`` command."""
+    parser = subparsers.add_parser(
+        "validate",
+        help="Show the data validation report",
+        description="Show the checks recorded when each dataset was parsed into the cache. "
+                    "Exits non-zero when a dataset fails the schema or dtype checks, or any "
+                    "check with --strict."
+    )
+    parser.add_argument("--dataset", choices=["rail", "port"], action="append",
+                        help="Dataset to report on; repeat for both (default: both)")
+    parser.add_argument("--data-dir", help="Directory with the data files (default: search the usual locations)")
+    parser.add_argument("--strict", action="store_true", help="Fail on warnings as well")
+    return parser
+
+def validate(args):
+    """Print each dataset's validation report."""
+    from .core import get_core
+    
+    core = get_core(args.data_dir)
+    failed = False
+    for dataset in args.dataset or ["rail", "port"]:
+        try:
+            report = core.validation(dataset)
+        except FileNotFoundError as e:
+            print(f"❌ {e}")
+            failed = True
+            continue
+        status = "✅" if report['valid'] and not report['warnings'] else ("⚠️" if report['valid'] else "❌")
+        print(f"{status} {dataset}: {report['rows']:,} rows")
+        for name, result in report['checks'].items():
+            if not result['passed']:
+                print(f"   {name}: {result['count']:,}")
+                for example in result['examples']:
+                    print(f"      {example}")
+        failed = failed or not report['valid'] or (args.strict and bool(report['warnings']))
+    if failed:
+        sys.exit(1)
+
 def get_version():
     """Get package version."""
     try:
@@ -0,0 +1,752 @@
+"""
+Shared compute core for every dashboard entry point.
+
+The package app, ``streamlit_app.py``, the scripts under ``Script/`` and
+``FreightDashboard`` all load data and derived aggregates through this
+module. Loaded frames and aggregates live in process-wide caches keyed by
+the source file revision, so several dashboards hosted in one process
+share a single copy of each dataset and a single warm cache.
+
+Frames returned from the core are shared: callers must treat them as
+read-only and copy before mutating. The core is safe to use from several
+threads; concurrent first requests for a dataset wait for a single load.
+"""
+
+import os
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .cache import default_policy
+from .hierarchy import DEFAULT_TOP, top_n_rollup
+from .index import TableIndex, sort_row_ids
+from .ingest import source_files
+from .ports import default_registry
+from .pyramid import TimePyramid
+from .ranking import Rankings
+from .snapshot import load_snapshot
+from .summary import GroupSummary
+from .store import ColumnarCache, load_dataset, source_fingerprint
+from .validation import validate_frame
+from .utilization import DEFAULT_CONSECUTIVE, DEFAULT_THRESHOLD, UtilizationEngine
+
+DATASET_FILES = {
+    'rail': "Rail_Carloadings_originated.csv",
+    'port': "port_dataset.json",
+}
+
+# Environment variables naming a dataset source: a file, directory or glob;
+# they apply to cores without explicit search directories
+DATASET_SOURCE_ENV = {
+    'rail': "FREIGHT_RAIL_SOURCE",
+    'port': "FREIGHT_PORT_SOURCE",
+}
+
+# Column names differ between the two datasets
+DATASET_COLUMNS = {
+    'rail': {'date': 'Date', 'year': 'Year', 'month': 'Month', 'value': 'Carloads', 'season': 'Season'},
+    'port': {'date': 'port', 'year': 'year', 'month': 'month_num', 'value': 'TEU_values', 'season': 'season'},
+}
+
+# Columns the dashboards filter on, indexed for row-id selection
+FILTER_COLUMNS = {
+    'rail': ('Year', 'Railroad', 'Commodity'),
+    'port': ('year', 'month', 'port_name'),
+}
+
+# Columns whose distinct values the summaries report
+SUMMARY_COLUMNS = {
+    'rail': ('Year', 'Railroad', 'Commodity'),
+    'port': ('year', 'port_name'),
+}
+
+# Bounds for the derived-result caches; selection-dependent results
+# expire so that rarely revisited filter combinations do not linger.
+# Whole-dataset results (one entry per data revision, or a handful of
+# variants) never expire and keep only a few revisions.
+DERIVED_CACHE_SETTINGS = {
+    'index': {'ttl': None, 'max_entries': 8},
+    'validation': {'ttl': None, 'max_entries': 8},
+    'cube': {'ttl': None, 'max_entries': 8},
+    'distinct': {'ttl': None, 'max_entries': 64},
+    'utilization': {'ttl': None, 'max_entries': 16},
+    'comparison': {'ttl': None, 'max_entries': 16},
+    'selection': {'ttl': 1800, 'max_entries': 256},
+    'filter': {'ttl': 1800, 'max_entries': 128},
+    'page_order': {'ttl': 1800, 'max_entries': 64},
+    'kpis': {'ttl': 1800, 'max_entries': 512},
+    'pyramid': {'ttl': 1800, 'max_entries': 128},
+    'query': {'ttl': 1800, 'max_entries': 256},
+    'forecast': {'ttl': 1800, 'max_entries': 128},
+    'summary': {'ttl': 1800, 'max_entries': 64},
+    'ranking': {'ttl': 1800, 'max_entries': 128},
+    'rollup': {'ttl': 1800, 'max_entries': 128},
+}
+
+# Seconds a dataset's revision key is reused before the source is checked
+# on disk again, so the many lookups of one rerun stat it at most once
+VERSION_TTL = float(os.environ.get("FREIGHT_VERSION_TTL", "1.0"))
+
+PACKAGE_DATA_DIR = Path(__file__).parent / "data"
+REPO_DATA_DIR = Path(__file__).resolve().parent.parent / "Data"
+
+# Process-wide state shared by every FreightCore instance; derived
+# results are held in caches of the default CachePolicy
+_frames = {}
+_cores = {}
+# (checked at, revision key) per core location and dataset
+_versions = {}
+# Latest utilization engine per port source, extended as new months arrive
+_utilization = {}
+# One lock per dataset source (and per core) so concurrent loads become one
+_load_locks = {}
+_locks_lock = threading.Lock()
+
+
+def _source_lock(key):
+    with _locks_lock:
+        return _load_locks.setdefault(key, threading.Lock())
+
+
+def default_search_dirs():
+    """Directories searched for the datasets when no data_dir is given."""
+    dirs = []
+    env_dir = os.environ.get("FREIGHT_DATA_DIR")
+    if env_dir:
+        dirs.append(Path(env_dir))
+    dirs.extend([PACKAGE_DATA_DIR, Path("Data"), REPO_DATA_DIR, Path(".")])
+    # The scripts under Script/ are started from that directory
+    dirs.append(Path("../Data"))
+    return dirs
+
+
+def _normalize(values):
+    """Turn a filter selection into a hashable, order-independent key."""
+    if values is None:
+        return None
+    return tuple(sorted(set(values), key=str))
+
+
+class FreightCore:
+    """
+    Loader and aggregate cache shared by all dashboards.
+
+    A core only decides where the source files are found; frames and
+    derived results are stored in module-level caches keyed by source
+    path and revision, so two cores that resolve to the same file share
+    the same data.
+    """
+
+    def __init__(self, search_dirs=None, cache=None):
+        """
+        Args:
+            search_dirs (list, optional): Directories searched in order for
+                each dataset file. Defaults to ``default_search_dirs()``
+                and the ``FREIGHT_*_SOURCE`` variables; explicit
+                directories take precedence over those variables.
+            cache (ColumnarCache or False, optional): On-disk cache used on
+                cold loads; ``False`` disables it.
+        """
+        self.explicit_dirs = bool(search_dirs)
+        self.search_dirs = [Path(d) for d in (search_dirs or default_search_dirs())]
+        self._cache = ColumnarCache() if cache is None else cache
+
+    def source_path(self, dataset):
+        """
+        Return the source of a dataset.
+
+        The first search directory holding the dataset file, or a directory
+        of part files named after it (e.g. ``Data/Rail_Carloadings_originated/``),
+        wins. Without explicit search directories,
+        ``FREIGHT_RAIL_SOURCE``/``FREIGHT_PORT_SOURCE`` can name a file,
+        directory or glob pattern instead.
+        """
+        if dataset not in DATASET_FILES:
+            raise ValueError("Dataset must be 'rail' or 'port'")
+        env_source = None if self.explicit_dirs else os.environ.get(DATASET_SOURCE_ENV[dataset])
+        if env_source:
+            source_files(env_source)
+            return Path(env_source)
+        for directory in self.search_dirs:
+            path = directory / DATASET_FILES[dataset]
+            if path.exists():
+                return path
+            parts = directory / Path(DATASET_FILES[dataset]).stem
+            if parts.is_dir():
+                return parts
+        searched = ", ".join(str(d) for d in self.search_dirs)
+        raise FileNotFoundError(f"{DATASET_FILES[dataset]} not found in: {searched}")
+
+    def version(self, dataset, refresh=False):
+        """
+        Revision key of the dataset currently on disk.
+
+        The key is reused for ``VERSION_TTL`` seconds, so the cached
+        lookups of a rerun do not each stat the source files; pass
+        ``refresh`` to check the disk now.
+        """
+        key = (dataset, os.getcwd(), tuple(self.search_dirs), self.explicit_dirs,
+               os.environ.get(DATASET_SOURCE_ENV.get(dataset, ''), ''))
+        checked = _versions.get(key)
+        now = time.monotonic()
+        if not refresh and checked is not None and now - checked[0] < VERSION_TTL:
+            return checked[1]
+        fingerprint = source_fingerprint(self.source_path(dataset))
+        version = (dataset, fingerprint['path'], fingerprint['size'], fingerprint['mtime_ns'])
+        _versions[key] = (now, version)
+        return version
+
+    def frame(self, dataset):
+        """
+        Return the shared, preprocessed frame for a dataset.
+
+        The file is reloaded when its size or mtime changes; derived results
+        for the previous revision are dropped at the same time.
+        """
+        version = self.version(dataset)
+        source = version[1]
+        entry = _frames.get((dataset, source))
+        if entry is not None and entry[0] == version:
+            return entry[1]
+        # Single-flight: callers arriving during a load wait for its result
+        with _source_lock((dataset, source)):
+            entry = _frames.get((dataset, source))
+            if entry is not None and entry[0] == version:
+                return entry[1]
+            df = load_dataset(dataset, self.source_path(dataset), self._cache)
+            _frames[(dataset, source)] = (version, df)
+            for cache in default_policy().caches():
+                cache.discard(lambda k: k[0][:2] == (dataset, source) and k[0] != version)
+            return df
+
+    def validation(self, dataset):
+        """
+        Validation report of the current source revision.
+
+        Read from the cache manifest written when the source was parsed;
+        without an on-disk cache the loaded frame is validated once per
+        revision.
+        """
+        source = self.source_path(dataset)
+        self.frame(dataset)
+        report = self._cache.validation(dataset, source) if self._cache else None
+        if report is None:
+            report = self.cached(dataset, 'validation', None, lambda df: validate_frame(dataset, df))
+        return report
+
+    def rail_data(self):
+        """Shared rail frame (read-only)."""
+        return self.frame('rail')
+
+    def port_data(self):
+        """Shared port frame (read-only)."""
+        return self.frame('port')
+
+    def cached(self, dataset, name, key, compute):
+        """
+        Memoize a derived result per dataset revision.
+
+        Args:
+            dataset (str): ``'rail'`` or ``'port'``.
+            name (str): Name of the derived result.
+            key (hashable): Normalized arguments of the computation.
+            compute (callable): Called with the dataset frame on a miss.
+
+        Names listed in ``DERIVED_CACHE_SETTINGS`` get its TTL and entry
+        cap; any other name is bounded by the global byte budget only.
+        """
+        version = self.version(dataset)
+        cache = default_policy().cache(name, **DERIVED_CACHE_SETTINGS.get(name, {}))
+        return cache.get_or_compute((version, key), lambda: compute(self.frame(dataset)))
+
+    def distinct(self, dataset, column, sort=True):
+        """Distinct values of a column, e.g. for filter widgets."""
+        def compute(df):
+            values = df[column].unique().tolist()
+            return sorted(values) if sort else values
+
+        return self.cached(dataset, 'distinct', (column, sort), compute)
+
+    # Filtering
+
+    def index(self, dataset):
+        """Row-id index on the dataset's filter columns."""
+        return self.cached(
+            dataset, 'index', None,
+            lambda df: TableIndex(df, FILTER_COLUMNS[dataset])
+        )
+
+    def selection_key(self, dataset, filters):
+        """Normalized, hashable form of a filter dict."""
+        unknown = set(filters) - set(FILTER_COLUMNS[dataset])
+        if unknown:
+            raise ValueError(f"Cannot filter {dataset} data on: {sorted(unknown)}")
+        return tuple((column, _normalize(filters.get(column))) for column in FILTER_COLUMNS[dataset])
+
+    def row_ids(self, dataset, filters):
+        """Ascending row positions of the rows matching ``filters``."""
+        key = self.selection_key(dataset, filters)
+        return self.cached(
+            dataset, 'selection', key,
+            lambda df: self.index(dataset).select(dict(key))
+        )
+
+    def select(self, dataset, filters):
+        """Rows matching ``filters``, a dict of column to selected values."""
+        key = self.selection_key(dataset, filters)
+        return self.cached(
+            dataset, 'filter', key,
+            lambda df: df.take(self.row_ids(dataset, filters))
+        )
+
+    def filter_rail(self, years=None, railroads=None, commodities=None):
+        """Rail rows matching the selections; None means no restriction."""
+        return self.select('rail', {'Year': years, 'Railroad': railroads, 'Commodity': commodities})
+
+    def filter_port(self, years=None, months=None, ports=None):
+        """Port rows matching the selections; None means no restriction."""
+        return self.select('port', {'year': years, 'month': months, 'port_name': ports})
+
+    def page(self, dataset, filters, page=1, page_size=100, sort_by=None, ascending=True):
+        """
+        One page of the rows matching ``filters``.
+
+        Only the requested rows are materialized. The sorted order of a
+        selection is computed once (stable, ties in table order) and reused
+        while paging.
+
+        Args:
+            page (int): 1-based page number; clamped to the valid range.
+            page_size (int): Rows per page.
+            sort_by (str, optional): Column to sort on; table order if None.
+            ascending (bool): Sort direction.
+
+        Returns:
+            tuple: ``(rows, total_rows, page)`` with the clamped page number.
+        """
+        key = (self.selection_key(dataset, filters), sort_by, ascending)
+        ordered = self.cached(
+            dataset, 'page_order', key,
+            lambda df: sort_row_ids(df, self.row_ids(dataset, filters), sort_by, ascending)
+        )
+        total = len(ordered)
+        pages = max(1, -(-total // page_size))
+        page = min(max(1, int(page)), pages)
+        start = (page - 1) * page_size
+        rows = self.frame(dataset).take(ordered[start:start + page_size])
+        return rows, total, page
+
+    # Aggregates
+
+    def rail_kpis(self, years=None, railroads=None, commodities=None):
+        """Headline KPIs for the rail page."""
+        key = (_normalize(years), _normalize(railroads), _normalize(commodities))
+        filters = {'Year': years, 'Railroad': railroads, 'Commodity': commodities}
+
+        def compute(_):
+            pyramid = self.pyramid('rail', filters)
+            if pyramid.start is None:
+                return None
+            monthly = pyramid.levels['month']
+            yearly = pyramid.levels['year']
+            yearly = pd.Series(yearly['Carloads'].to_numpy(), index=yearly['Date'].dt.year)
+            growth_rate = 0
+            selected = key[0] or sorted(yearly.index)
+            if len(selected) > 1:
+                first_year = yearly.get(min(selected), 0)
+                last_year = yearly.get(max(selected), 0)
+                if first_year > 0:
+                    growth_rate = ((last_year - first_year) / first_year) * 100
+            return {
+                'total_carloads': yearly.sum(),
+                'avg_monthly': monthly['Carloads'].mean(),
+                'peak_month': monthly.groupby(monthly['Date'].dt.month)['Carloads'].sum().idxmax(),
+                'growth_rate': growth_rate,
+            }
+
+        return self.cached('rail', 'kpis', key, compute)
+
+    def port_kpis(self, years=None, months=None, ports=None):
+        """Headline KPIs for the port page."""
+        key = (_normalize(years), _normalize(months), _normalize(ports))
+        filters = {'year': years, 'month': months, 'port_name': ports}
+
+        def compute(_):
+            df = self.select('port', filters)
+            if df.empty:
+                return None
+            by_port = self.pyramid('port', filters, 'port_name').levels['year']
+            return {
+                'total_teu': df['TEU_values'].sum(),
+                'avg_monthly': self.pyramid('port', filters).levels['month']['TEU_values'].mean(),
+                'top_port': by_port.groupby('port_name')['TEU_values'].sum().idxmax(),
+                'port_count': df['port_name'].nunique(),
+            }
+
+        return self.cached('port', 'kpis', key, compute)
+
+    # Time series
+
+    def pyramid(self, dataset, filters=None, group=None):
+        """
+        Week/month/quarter/year totals of the rows matching ``filters``.
+
+        Built once per selection, group column and data revision.
+
+        Args:
+            dataset (str): ``'rail'`` or ``'port'``.
+            filters (dict, optional): Column to selected values.
+            group (str, optional): Column to split the series by.
+
+        Returns:
+            TimePyramid: Shared, read-only pyramid.
+        """
+        filters = filters or {}
+        columns = DATASET_COLUMNS[dataset]
+        return self.cached(
+            dataset, 'pyramid', (self.selection_key(dataset, filters), group),
+            lambda df: TimePyramid(self.select(dataset, filters), columns['date'], columns['value'], group)
+        )
+
+    def time_series(self, dataset, filters=None, group=None, level=None, start=None, end=None, width=None):
+        """
+        Totals over time at a given or automatically chosen resolution.
+
+        Without ``level`` the coarsest level that still gives enough
+        points for the date span and chart ``width`` (pixels) is used.
+
+        Returns:
+            tuple: ``(frame, level)`` with the bucket start in the dataset's
+            date column.
+        """
+        return self.pyramid(dataset, filters, group).series(level, start, end, width)
+
+    def rankings(self, dataset, entity, filters=None, level='month', window=1):
+        """
+        Per-period ranks and top-K of an entity column, e.g. ports.
+
+        Built from the pyramid of the selection, once per selection,
+        entity, level, window and data revision.
+
+        Args:
+            dataset (str): ``'rail'`` or ``'port'``.
+            entity (str): Column to rank, e.g. ``'Railroad'``.
+            filters (dict, optional): Column to selected values.
+            level (str): Period length, from ``pyramid.LEVELS``.
+            window (int): Periods summed into each period's score.
+
+        Returns:
+            Rankings: Shared, read-only rankings.
+        """
+        filters = filters or {}
+        columns = DATASET_COLUMNS[dataset]
+        return self.cached(
+            dataset, 'ranking', (self.selection_key(dataset, filters), entity, level, window),
+            lambda _: Rankings(self.pyramid(dataset, filters, entity).series(level)[0],
+                               columns['date'], entity, columns['value'], window)
+        )
+
+    def rollup(self, dataset, parent, child, filters=None, top=DEFAULT_TOP):
+        """
+        Totals per parent and child with small children folded into "Other".
+
+        Computed once per selection, columns, ``top`` and data revision;
+        see ``hierarchy.top_n_rollup``.
+
+        Args:
+            dataset (str): ``'rail'`` or ``'port'``.
+            parent (str): Parent column, e.g. ``'Season'``.
+            child (str): Child column, e.g. ``'Commodity'``.
+            filters (dict, optional): Column to selected values.
+            top (int, optional): Children kept per parent; None keeps all.
+
+        Returns:
+            pandas.DataFrame: Shared, read-only breakdown.
+        """
+        filters = filters or {}
+        value = DATASET_COLUMNS[dataset]['value']
+
+        def compute(_):
+            totals = self.select(dataset, filters).groupby([parent, child], observed=True)[value].sum()
+            return top_n_rollup(totals.reset_index(), parent, child, value, top)
+
+        return self.cached(dataset, 'rollup', (self.selection_key(dataset, filters), parent, child, top), compute)
+
+    def utilization(self, threshold=DEFAULT_THRESHOLD, consecutive=DEFAULT_CONSECUTIVE):
+        """
+        Rolling 12-month capacity utilization and alert state per port.
+
+        When the port file gains new months, the engine built for the
+        previous revision is copied and extended with those months only;
+        it is rebuilt if earlier months changed.
+
+        Returns:
+            UtilizationEngine: Shared, read-only engine.
+        """
+        def compute(df):
+            key = (str(self.source_path('port')), threshold, consecutive)
+            previous = _utilization.get(key)
+            if previous is not None and previous.covers(df):
+                engine = previous.copy()
+            else:
+                engine = UtilizationEngine(default_registry(), threshold, consecutive)
+            engine.extend(df)
+            _utilization[key] = engine
+            return engine
+
+        return self.cached('port', 'utilization', (threshold, consecutive), compute)
+
+    def summary(self, dataset, group=None):
+        """
+        One-pass statistics of the value column, overall or per group.
+
+        Args:
+            dataset (str): ``'rail'`` or ``'port'``.
+            group (str, optional): Column to split by, e.g. ``'Railroad'``.
+
+        Returns:
+            GroupSummary: Shared, read-only summary of the current revision.
+        """
+        columns = DATASET_COLUMNS[dataset]
+        return self.cached(
+            dataset, 'summary', group,
+            lambda df: GroupSummary(df, columns['value'], columns['date'], group,
+                                    [c for c in SUMMARY_COLUMNS[dataset] if c != group])
+        )
+
+    def yearly_totals(self, dataset):
+        """Total volume per year for a dataset."""
+        columns = DATASET_COLUMNS[dataset]
+        yearly = self.pyramid(dataset).levels['year']
+        return pd.Series(
+            yearly[columns['value']].to_numpy(),
+            index=pd.Index(yearly[columns['date']].dt.year, name=columns['year']),
+            name=columns['value']
+        )
+
+    def monthly_totals(self, dataset):
+        """Total volume per calendar month, indexed by month start."""
+        columns = DATASET_COLUMNS[dataset]
+        monthly = self.pyramid(dataset).levels['month']
+        return pd.Series(
+            monthly[columns['value']].to_numpy(),
+            index=pd.DatetimeIndex(monthly[columns['date']]),
+            name=columns['value']
+        )
+
+    def comparison_totals(self, granularity='year'):
+        """
+        Rail carloads and port TEU aligned on the periods both datasets cover.
+
+        The result only changes with the data, so callers scale it (e.g. by
+        a conversion factor) instead of recomputing it.
+
+        Args:
+            granularity (str): ``'year'`` or ``'month'``.
+
+        Returns:
+            pandas.DataFrame: ``Rail_Carloads`` and ``Port_TEU`` indexed by
+            period in ascending order.
+        """
+        if granularity not in ('year', 'month'):
+            raise ValueError("Granularity must be 'year' or 'month'")
+        totals = self.yearly_totals if granularity == 'year' else self.monthly_totals
+
+        def compute(_):
+            rail = totals('rail')
+            port = totals('port')
+            periods = rail.index.intersection(port.index).sort_values()
+            return pd.DataFrame({
+                'Rail_Carloads': rail.reindex(periods).to_numpy(),
+                'Port_TEU': port.reindex(periods).to_numpy(),
+            }, index=periods)
+
+        # Keyed on the port revision; the rail revision is part of the key
+        return self.cached('port', 'comparison', (granularity, self.version('rail')), compute)
+
+    def forecast(self, dataset, filters=None, horizon=6):
+        """
+        Monthly totals with a trend-plus-seasonality forecast.
+
+        A linear trend is fitted to the monthly totals; with two or more
+        years of history the average deviation of each calendar month from
+        the trend is added. The band spans 1.96 residual standard
+        deviations. A possibly partial last month of weekly data is left
+        out of the fit.
+
+        Args:
+            dataset (str): ``'rail'`` or ``'port'``.
+            filters (dict, optional): Column to selected values.
+            horizon (int): Months to forecast past the last full month.
+
+        Returns:
+            pandas.DataFrame or None: The date column, ``actual`` (NaN for
+            future months), ``forecast`` (the fit over the history),
+            ``lower`` and ``upper``; None with fewer than three months.
+        """
+        filters = filters or {}
+        columns = DATASET_COLUMNS[dataset]
+
+        def compute(_):
+            pyramid = self.pyramid(dataset, filters)
+            monthly = pyramid.levels['month']
+            if pyramid.native == 'week':
+                monthly = monthly.iloc[:-1]
+            if len(monthly) < 3:
+                return None
+            months = monthly[columns['date']].to_numpy(dtype='datetime64[M]').astype(np.int64)
+            values = monthly[columns['value']].to_numpy(dtype=np.float64)
+
+            slope, intercept = np.polyfit(months, values, 1)
+            seasonal = np.zeros(12)
+            if len(values) >= 24:
+                residual = pd.Series(values - (slope * months + intercept))
+                seasonal = residual.groupby(months % 12).mean().reindex(range(12), fill_value=0.0).to_numpy()
+
+            future = np.arange(months[-1] + 1, months[-1] + 1 + horizon)
+            all_months = np.concatenate([months, future])
+            forecast = slope * all_months + intercept + seasonal[all_months % 12]
+            spread = 1.96 * np.std(values - forecast[:len(values)])
+            return pd.DataFrame({
+                columns['date']: all_months.astype('datetime64[M]').astype('datetime64[ns]'),
+                'actual': np.concatenate([values, np.full(horizon, np.nan)]),
+                'forecast': forecast,
+                'lower': forecast - spread,
+                'upper': forecast + spread,
+            })
+
+        return self.cached(dataset, 'forecast', (self.selection_key(dataset, filters), horizon), compute)
+
+    # Warm start
+
+    def default_filters(self, dataset):
+        """
+        The dashboards' initial sidebar selection for a dataset.
+
+        Every year, railroad and month, the first five commodities and the
+        first three ports.
+        """
+        if dataset == 'rail':
+            return {
+                'Year': self.distinct('rail', 'Year'),
+                'Railroad': self.distinct('rail', 'Railroad'),
+                'Commodity': self.distinct('rail', 'Commodity')[:5],
+            }
+        return {
+            'year': self.distinct('port', 'year'),
+            'month': self.distinct('port', 'month', sort=False),
+            'port_name': self.distinct('port', 'port_name')[:3],
+        }
+
+    def warm(self, datasets=('rail', 'port')):
+        """
+        Compute what a first page view needs.
+
+        Loads each dataset and builds its index, filter options and the
+        KPIs, time series and seasonal breakdown of the default selection, plus the port
+        utilization engine and the comparison totals.
+        """
+        for dataset in datasets:
+            filters = self.default_filters(dataset)
+            if dataset == 'rail':
+                self.rail_kpis(filters['Year'], filters['Railroad'], filters['Commodity'])
+                self.time_series('rail', filters, group='Railroad')
+                self.rollup('rail', 'Season', 'Commodity', filters)
+            else:
+                self.port_kpis(filters['year'], filters['month'], filters['port_name'])
+                self.time_series('port', filters, group='port_name')
+                self.utilization()
+            self.pyramid(dataset)
+        if set(datasets) >= {'rail', 'port'}:
+            for granularity in ('year', 'month'):
+                self.comparison_totals(granularity)
+        return self
+
+    def state(self, datasets=('rail', 'port')):
+        """
+        Loaded frames and derived results of the current data revisions.
+
+        Returns:
+            dict: ``versions`` and ``frames`` per dataset, ``derived`` as
+            cache name to ``(key, value)`` pairs and the ``utilization``
+            engines. Values are shared, not copied.
+        """
+        versions = {dataset: self.version(dataset) for dataset in datasets}
+        current = set(versions.values())
+        sources = {version[1] for version in versions.values()}
+        return {
+            'versions': versions,
+            'frames': {dataset: self.frame(dataset) for dataset in datasets},
+            'derived': {
+                cache.name: cache.items(lambda key: key[0] in current)
+                for cache in default_policy().caches()
+            },
+            'utilization': {
+                key: engine for key, engine in _utilization.items()
+                if str(Path(key[0]).resolve()) in sources
+            },
+        }
+
+    def restore(self, state):
+        """
+        Install a ``state()`` taken from another process.
+
+        Only datasets whose file on disk still has the recorded revision
+        are restored; derived results of other revisions are never hit.
+
+        Returns:
+            list: The restored datasets.
+        """
+        restored = []
+        for dataset, version in state['versions'].items():
+            try:
+                if self.version(dataset) != version:
+                    continue
+            except FileNotFoundError:
+                continue
+            _frames[(dataset, version[1])] = (version, state['frames'][dataset])
+            restored.append(dataset)
+        current = {state['versions'][dataset] for dataset in restored}
+        for name, items in state['derived'].items():
+            cache = default_policy().cache(name, **DERIVED_CACHE_SETTINGS.get(name, {}))
+            for key, value in items:
+                if key[0] in current:
+                    cache.put(key, value)
+        if 'port' in restored:
+            _utilization.update(state['utilization'])
+        return restored
+
+
+def get_core(data_dir=None, cache_dir=None, use_cache=True):
+    """
+    Return the process-wide core for a data location.
+
+    When ``FREIGHT_SNAPSHOT`` names a snapshot file (see
+    ``freight_analytics.snapshot``), a newly created core restores it, so
+    the first request in the process is served from warm caches.
+
+    Args:
+        data_dir (str or Path, optional): Only look for datasets here.
+            Defaults to ``default_search_dirs()``.
+        cache_dir (str or Path, optional): Columnar cache directory.
+        use_cache (bool): Set False to bypass the on-disk cache.
+
+    Returns:
+        FreightCore: The shared core instance.
+    """
+    search_dirs = [Path(data_dir)] if data_dir is not None else default_search_dirs()
+    key = (tuple(str(d.resolve()) for d in search_dirs), str(cache_dir), use_cache)
+    core = _cores.get(key)
+    if core is None:
+        with _source_lock(('core', key)):
+            core = _cores.get(key)
+            if core is None:
+                cache = ColumnarCache(cache_dir) if use_cache else False
+                core = FreightCore(search_dirs if data_dir is not None else None, cache)
+                if os.environ.get("FREIGHT_SNAPSHOT"):
+                    load_snapshot(core)
+                _cores[key] = core
+    return core
@@ -1,11 +1,15 @@
 """Main FreightDashboard class for programmatic use."""
 
 import pandas as pd
-import json
 from pathlib import Path
 import warnings
 warnings.filterwarnings('ignore')
 
+from .backends import get_backend
+from .core import DATASET_COLUMNS, get_core
+from .export import EXPORT_CHUNK_ROWS, iter_export, write_export
+from .query import run_query
+
 class FreightDashboard:
     """
     Freight Analytics Dashboard for programmatic use.
@@ -14,99 +18,75 @@ class FreightDashboard:
     functions that can be used in other Python applications.
     """
     
-    def __init__(self, data_dir=None):
+    def __init__(self, data_dir=None, cache_dir=None, use_cache=True, backend='pandas'):
         """
         Initialize the FreightDashboard.
         
         Args:
             data_dir (str, optional): Path to data directory. 
                                     If None, uses package data.
+            cache_dir (str, optional): Directory for the columnar cache.
+                                    If None, uses FREIGHT_CACHE_DIR or ~/.cache.
+            use_cache (bool): Set False to always parse the source files.
+            backend (str): Engine for queries, summaries and seasonal
+                stats: 'pandas' (default), 'sqlite' or 'duckdb'
+                (requires duckdb).
         """
         if data_dir is None:
             self.data_dir = Path(__file__).parent / "data"
         else:
             self.data_dir = Path(data_dir)
         
-        self._rail_data = None
-        self._port_data = None
+        self._core = get_core(self.data_dir, cache_dir, use_cache)
+        self._backend = get_backend(backend)
     
     def load_rail_data(self):
         """Load and return rail freight data."""
-        if self._rail_data is None:
-            rail_file = self.data_dir / "Rail_Carloadings_originated.csv"
-            if rail_file.exists():
-                self._rail_data = pd.read_csv(rail_file)
-                self._rail_data['Date'] = pd.to_datetime(self._rail_data['Date'])
-                self._rail_data['Season'] = self._rail_data['Month'].apply(self._get_season)
-            else:
-                raise FileNotFoundError(f"Rail data file not found: {rail_file}")
-        
-        return self._rail_data.copy()
+        return self._core.rail_data().copy()
     
     def load_port_data(self):
         """Load and return port container data."""
-        if self._port_data is None:
-            port_file = self.data_dir / "port_dataset.json"
-            if port_file.exists():
-                with open(port_file, 'r') as f:
-                    data = json.load(f)
-                
-                df = pd.DataFrame(data)
-                df_melted = df.melt(id_vars=["port"], var_name="port_name", value_name="TEU_values")
-                df_melted['port'] = pd.to_datetime(df_melted['port'], errors='coerce')
-                df_melted['TEU_values'] = pd.to_numeric(df_melted['TEU_values'], errors='coerce')
-                df_melted = df_melted.dropna(subset=['TEU_values'])
-                df_melted['month'] = df_melted['port'].dt.strftime('%b')
-                df_melted['year'] = df_melted['port'].dt.year
-                df_melted['season'] = df_melted['month'].apply(self._get_season_water)
-                
-                self._port_data = df_melted
-            else:
-                raise FileNotFoundError(f"Port data file not found: {port_file}")
-        
-        return self._port_data.copy()
+        return self._core.port_data().copy()
     
     def get_rail_summary(self):
         """Get summary statistics for rail data."""
-        rail_df = self.load_rail_data()
+        summary = self._backend.summary(self._core, 'rail')
         
         return {
-            'total_records': len(rail_df),
+            'total_records': summary['rows'],
             'date_range': {
-                'start': rail_df['Date'].min().strftime('%Y-%m-%d'),
-                'end': rail_df['Date'].max().strftime('%Y-%m-%d')
+                'start': summary['start'].strftime('%Y-%m-%d'),
+                'end': summary['end'].strftime('%Y-%m-%d')
             },
-            'total_carloads': rail_df['Carloads'].sum(),
-            'unique_railroads': rail_df['Railroad'].nunique(),
-            'unique_commodities': rail_df['Commodity'].nunique(),
-            'years_covered': sorted(rail_df['Year'].unique().tolist())
+            'total_carloads': summary['total'],
+            'unique_railroads': len(summary['values']['Railroad']),
+            'unique_commodities': len(summary['values']['Commodity']),
+            'years_covered': summary['values']['Year']
         }
     
     def get_port_summary(self):
         """Get summary statistics for port data."""
-        port_df = self.load_port_data()
+        summary = self._backend.summary(self._core, 'port')
         
         return {
-            'total_records': len(port_df),
+            'total_records': summary['rows'],
             'date_range': {
-                'start': port_df['port'].min().strftime('%Y-%m-%d'),
-                'end': port_df['port'].max().strftime('%Y-%m-%d')
+                'start': summary['start'].strftime('%Y-%m-%d'),
+                'end': summary['end'].strftime('%Y-%m-%d')
             },
-            'total_teu': port_df['TEU_values'].sum(),
-            'unique_ports': port_df['port_name'].nunique(),
-            'years_covered': sorted(port_df['year'].unique().tolist()),
-            'ports': sorted(port_df['port_name'].unique().tolist())
+            'total_teu': summary['total'],
+            'unique_ports': len(summary['values']['port_name']),
+            'years_covered': summary['values']['year'],
+            'ports': summary['values']['port_name']
         }
     
     def get_rail_by_year(self, year):
         """Get rail data for a specific year."""
-        rail_df = self.load_rail_data()
-        return rail_df[rail_df['Year'] == year].copy()
+        return self._core.filter_rail(years=[year]).copy()
     
     def get_port_by_year(self, year):
         """Get port data for a specific year."""
-        port_df = self.load_port_data()
-        return port_df[port_df['year'] == year].copy()
+        return self._core.filter_port(years=[year]).copy()
     
     def get_seasonal_analysis(self, mode='rail'):
         """
@@ -118,42 +98,127 @@ class FreightDashboard:
         Returns:
             dict: Seasonal statistics
         """
-        if mode == 'rail':
-            df = self.load_rail_data()
-            groupby_col = 'Carloads'
-        elif mode == 'port':
-            df = self.load_port_data()
-            groupby_col = 'TEU_values'
-        else:
+        if mode not in ('rail', 'port'):
             raise ValueError("Mode must be 'rail' or 'port'")
+        # Rail data names the column 'Season', port data 'season'
+        season = DATASET_COLUMNS[mode]['season']
         
-        seasonal_stats = df.groupby('Season')[groupby_col].agg([
-            'sum', 'mean', 'count', 'std'
-        ]).round(2)
+        if self._backend.name != 'pandas':
+            result = self.query(mode, group_by=[season], metrics=['sum', 'mean', 'count', 'std'])
+            return result.set_index(season).round(2).to_dict()
+        
+        seasonal_stats = self._core.summary(mode, season).table[['sum', 'mean', 'count', 'std']].round(2)
         
         return seasonal_stats.to_dict()
     
-    def _get_season(self, month):
-        """Determine season based on month for rail data."""
-        if month in [12, 1, 2]:
-            return 'Winter'
-        elif month in [3, 4, 5]:
-            return 'Spring'
-        elif month in [6, 7, 8]:
-            return 'Summer'
-        elif month in [9, 10, 11]:
-            return 'Fall'
+    def get_group_summary(self, mode='rail', group_by='Railroad'):
+        """
+        Summary statistics for every group at once.
+        
+        Computed in one pass over the data and cached per data revision.
+        
+        Args:
+            mode (str): 'rail' or 'port'
+            group_by (str): Column to group by, e.g. 'Railroad', 'Commodity'
+                or 'port_name'
+            
+        Returns:
+            pandas.DataFrame: One row per group with rows, count, sum, mean,
+            std, min, max, start, end and distinct_<column> counts
+        """
+        if mode not in ('rail', 'port'):
+            raise ValueError("Mode must be 'rail' or 'port'")
+        return self._core.summary(mode, group_by).table.copy()
+
+    def query(self, mode='rail', filters=None, group_by=None, metrics=('sum',), time_grain=None):
+        """
+        Grouped aggregates of the carloads (rail) or TEU (port) column.
+        
+        Each query is answered from a monthly pre-aggregated cube, the
+        filter-column index or a scan, whichever is cheapest, with the
+        filters applied before grouping. Results are cached per query.
+        
+        Args:
+            mode (str): 'rail' or 'port'
+            filters (dict, optional): Column to value or list of values,
+                e.g. {'Railroad': ['BNSF', 'UP'], 'Season': 'Winter'}
+            group_by (list, optional): Columns to group by, e.g. ['Railroad']
+            metrics (list): Any of 'sum', 'mean', 'count', 'min', 'max', 'std'
+            time_grain (str, optional): 'week', 'month', 'quarter' or 'year';
+                groups by the period start in the date column
+        
+        Returns:
+            pandas.DataFrame: One row per group with a column per metric;
+            attrs['source'] is 'cube', 'index' or 'scan', or the SQL
+            backend's name
+        """
+        result = run_query(self._core, mode, filters, group_by, metrics, time_grain, self._backend)
+        return result.copy()
+
+    def get_forecast(self, mode='rail', filters=None, horizon=6):
+        """
+        Monthly totals with a trend and seasonality forecast.
+        
+        Args:
+            mode (str): 'rail' or 'port'
+            filters (dict, optional): Column to selected values, e.g.
+                {'Railroad': ['BNSF']}
+            horizon (int): Months to forecast
+            
+        Returns:
+            pandas.DataFrame: Month, 'actual', 'forecast', 'lower' and
+            'upper'; None if fewer than three months are selected
+        """
+        if mode not in ('rail', 'port'):
+            raise ValueError("Mode must be 'rail' or 'port'")
+        forecast = self._core.forecast(mode, filters, horizon)
+        return None if forecast is None else forecast.copy()
+
+    def get_rankings(self, mode='port', entity='port_name', k=5, filters=None, level='month', window=1):
+        """
+        Top-K entities of every period.
+        
+        Args:
+            mode (str): 'rail' or 'port'
+            entity (str): Column to rank, e.g. 'port_name', 'Railroad' or
+                'Commodity'
+            k (int): Entities per period
+            filters (dict, optional): Column to selected values
+            level (str): 'week', 'month', 'quarter' or 'year'
+            window (int): Periods summed into each score, for sliding
+                window rankings
+            
+        Returns:
+            pandas.DataFrame: Period start, 'rank', entity and value
+        """
+        if mode not in ('rail', 'port'):
+            raise ValueError("Mode must be 'rail' or 'port'")
+        return self._core.rankings(mode, entity, filters, level, window).top(k)
     
-    def _get_season_water(self, month):
-        """Determine season based on month for water data."""
-        if month in ['Dec', 'Jan', 'Feb']:
-            return 'Winter'
-        elif month in ['Mar', 'Apr', 'May']:
-            return 'Spring'
-        elif month in ['Jun', 'Jul', 'Aug']:
-            return 'Summer'
-        elif month in ['Sep', 'Oct', 'Nov']:
-            return 'Fall'
+    def export(self, filters=None, format='csv', mode='rail', path=None, chunk_rows=EXPORT_CHUNK_ROWS):
+        """
+        Export filtered rail or port rows as CSV or Parquet.
+
+        Rows are streamed from the indexed selection in chunks, so the
+        full filtered table is never built in memory.
+
+        Args:
+            filters (dict, optional): Column to selected values, e.g.
+                {'Year': [2022], 'Railroad': ['BNSF']}. None exports all rows.
+            format (str): 'csv' or 'parquet' (requires pyarrow)
+            mode (str): 'rail' or 'port'
+            path (str, optional): File to write. If None, returns an
+                iterator of bytes chunks instead.
+            chunk_rows (int): Rows per chunk
+
+        Returns:
+            int or iterator: Bytes written when path is given, else the chunks
+        """
+        if mode not in ('rail', 'port'):
+            raise ValueError("Mode must be 'rail' or 'port'")
+        if path is None:
+            return iter_export(self._core, mode, filters, format, chunk_rows)
+        return write_export(self._core, mode, path, filters, format, chunk_rows)
 
 # Example usage functions
 def quick_rail_summary():
@@ -0,0 +1,121 @@
+"""Shared date parsing for the freight loaders."""
+
+import logging
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Candidate formats in order of preference; US month-first wins ambiguous dates
+DATE_FORMATS = [
+    '%Y-%m-%d',
+    '%m/%d/%Y',
+    '%m/%d/%y',
+    '%Y/%m/%d',
+    '%d/%m/%Y',
+    '%m-%d-%Y',
+    '%Y%m%d',
+    '%Y-%m-%d %H:%M:%S',
+    '%m/%d/%Y %H:%M',
+    '%m/%d/%Y %H:%M:%S',
+    '%b %Y',
+    '%B %Y',
+]
+
+FORMAT_SAMPLE_SIZE = 50
+MAX_EXAMPLES = 5
+
+
+def detect_date_format(values, formats=None):
+    """
+    Detect the single format used by a collection of date strings.
+
+    Args:
+        values (iterable): Date strings; only a sample is inspected.
+        formats (list, optional): Candidate ``strptime`` formats.
+
+    Returns:
+        str or None: The first candidate that parses every sampled value,
+        or None when no candidate fits.
+    """
+    sample = [v for v in values if isinstance(v, str) and v.strip()]
+    if not sample:
+        return None
+    if len(sample) > FORMAT_SAMPLE_SIZE:
+        step = len(sample) // FORMAT_SAMPLE_SIZE
+        sample = sample[::step][:FORMAT_SAMPLE_SIZE] + [sample[-1]]
+
+    for fmt in formats or DATE_FORMATS:
+        try:
+            for value in sample:
+                datetime.strptime(value.strip(), fmt)
+        except ValueError:
+            continue
+        return fmt
+    return None
+
+
+def parse_dates(values, fmt=None, errors='coerce'):
+    """
+    Parse date strings once per distinct value and broadcast the result.
+
+    The format is detected once from the distinct strings and each distinct
+    string is converted a single time, so repeated dates (one per railroad
+    and commodity, or one per port) cost nothing extra. The format is
+    detected from a sample, so values that do not match it are parsed
+    again one by one with format inference.
+
+    Args:
+        values (array-like): Date strings or datetime-like values.
+        fmt (str, optional): Known format; detected when omitted.
+        errors (str): ``'coerce'`` turns values that cannot be parsed into
+            NaT and logs a warning with their count; ``'raise'`` raises
+            ``ValueError`` for them. Blank values are NaT either way.
+
+    Returns:
+        numpy.ndarray: ``datetime64[ns]`` array aligned with ``values``.
+    """
+    if isinstance(values, (pd.Series, pd.Index)):
+        if pd.api.types.is_datetime64_any_dtype(values.dtype):
+            return values.to_numpy(dtype='datetime64[ns]')
+        values = values.to_numpy()
+
+    codes, uniques = pd.factorize(np.asarray(values, dtype=object))
+    if fmt is None:
+        fmt = detect_date_format(uniques)
+
+    if fmt is None:
+        parsed = pd.to_datetime(pd.Index(uniques), errors='coerce')
+    else:
+        parsed = pd.to_datetime(pd.Index(uniques), format=fmt, errors='coerce')
+    parsed = parsed.values.astype('datetime64[ns]')
+
+    blank = np.array([isinstance(v, str) and not v.strip() for v in uniques], dtype=bool)
+    failed = np.isnat(parsed) & ~blank
+    if failed.any():
+        # Values in another format than the detected one; each is inferred on its own
+        parsed[failed] = [pd.to_datetime(value, errors='coerce').to_datetime64() for value in uniques[failed]]
+        failed &= np.isnat(parsed)
+    if failed.any():
+        rows = int(failed[codes[codes >= 0]].sum())
+        examples = ", ".join(repr(v) for v in uniques[failed][:MAX_EXAMPLES])
+        if errors == 'raise':
+            raise ValueError(f"{rows} value(s) could not be parsed as dates, e.g. {examples}")
+        logger.warning("%d value(s) could not be parsed as dates and are missing, e.g. %s", rows, examples)
+
+    result = parsed.take(codes)
+    if (codes < 0).any():
+        result[codes < 0] = np.datetime64('NaT')
+    return result
+
+
+def to_epoch_days(dates):
+    """Convert a datetime64 array to int64 days since 1970-01-01 (NaT preserved as int64 min)."""
+    return np.asarray(dates).astype('datetime64[D]').view(np.int64)
+
+
+def from_epoch_days(days):
+    """Inverse of ``to_epoch_days``; returns ``datetime64[ns]``."""
+    return np.asarray(days, dtype=np.int64).view('datetime64[D]').astype('datetime64[ns]')
@@ -0,0 +1,127 @@
+"""Streaming export of filtered freight data."""
+
+import contextlib
+import io
+import os
+from pathlib import Path
+
+EXPORT_FORMATS = ('csv', 'parquet')
+EXPORT_CHUNK_ROWS = 50000
+
+
+class _ByteSink(io.RawIOBase):
+    """Write-only file object that buffers bytes until they are drained."""
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def drain(self):
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def _chunks(core, dataset, filters, chunk_rows):
+    frame = core.frame(dataset)
+    row_ids = core.row_ids(dataset, filters or {})
+    for start in range(0, len(row_ids), chunk_rows):
+        yield frame.take(row_ids[start:start + chunk_rows])
+
+
+def _iter_csv(core, dataset, filters, chunk_rows):
+    header = True
+    for chunk in _chunks(core, dataset, filters, chunk_rows):
+        yield chunk.to_csv(index=False, header=header).encode("utf-8")
+        header = False
+    if header:
+        # No matching rows: still emit the header line
+        yield core.frame(dataset).head(0).to_csv(index=False).encode("utf-8")
+
+
+def _iter_parquet(core, dataset, filters, chunk_rows):
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("Parquet export requires pyarrow. Install with: pip install pyarrow")
+
+    sink = _ByteSink()
+    writer = None
+    schema = None
+    for chunk in _chunks(core, dataset, filters, chunk_rows):
+        table = pa.Table.from_pandas(chunk, schema=schema, preserve_index=False)
+        if writer is None:
+            schema = table.schema
+            writer = pq.ParquetWriter(pa.PythonFile(sink, mode='w'), schema)
+        # One row group per chunk; hand each finished group to the caller
+        writer.write_table(table)
+        yield sink.drain()
+    if writer is None:
+        table = pa.Table.from_pandas(core.frame(dataset).head(0), preserve_index=False)
+        writer = pq.ParquetWriter(pa.PythonFile(sink, mode='w'), table.schema)
+    writer.close()
+    yield sink.drain()
+
+
+def iter_export(core, dataset, filters=None, format='csv', chunk_rows=EXPORT_CHUNK_ROWS):
+    """
+    Stream the rows matching ``filters`` as encoded bytes.
+
+    Rows are read from the core's row-id selection ``chunk_rows`` at a
+    time, so only one chunk is materialized at any point.
+
+    Args:
+        core (FreightCore): Shared compute core.
+        dataset (str): ``'rail'`` or ``'port'``.
+        filters (dict, optional): Column to selected values.
+        format (str): ``'csv'`` or ``'parquet'``.
+        chunk_rows (int): Rows per chunk (and per Parquet row group).
+
+    Yields:
+        bytes: Consecutive pieces of the encoded file.
+    """
+    if format not in EXPORT_FORMATS:
+        raise ValueError("Format must be 'csv' or 'parquet'")
+    if format == 'csv':
+        return _iter_csv(core, dataset, filters, chunk_rows)
+    return _iter_parquet(core, dataset, filters, chunk_rows)
+
+
+def write_export(core, dataset, destination, filters=None, format='csv', chunk_rows=EXPORT_CHUNK_ROWS):
+    """
+    Write the rows matching ``filters`` to a path or binary file object.
+
+    Returns:
+        int: Number of bytes written.
+    """
+    written = 0
+    if isinstance(destination, (str, Path)):
+        tmp_path = f"{destination}.partial"
+        try:
+            with open(tmp_path, 'wb') as f:
+                for piece in iter_export(core, dataset, filters, format, chunk_rows):
+                    f.write(piece)
+                    written += len(piece)
+            os.replace(tmp_path, destination)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.unlink(tmp_path)
+            raise
+    else:
+        for piece in iter_export(core, dataset, filters, format, chunk_rows):
+            destination.write(piece)
+            written += len(piece)
+    return written
@@ -0,0 +1,57 @@
+"""
+Bounded two-level breakdowns for sunburst and treemap charts.
+
+``top_n_rollup`` keeps the largest ``top`` children of every parent
+(e.g. the top commodities of each season) and folds the rest into one
+``"Other"`` child, so a chart has at most ``top + 1`` leaves per parent
+however many children the data has.
+"""
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_TOP = 8
+OTHER_LABEL = "Other"
+
+
+def top_n_rollup(totals, parent, child, value, top=DEFAULT_TOP, other=OTHER_LABEL):
+    """
+    Keep the ``top`` largest children per parent and fold the rest.
+
+    A lone remaining child is kept rather than renamed, since folding it
+    would not shrink the chart.
+
+    Args:
+        totals (pandas.DataFrame): One row per parent and child.
+        parent (str): Parent column, e.g. ``'Season'``.
+        child (str): Child column, e.g. ``'Commodity'``.
+        value (str): Column to rank and sum.
+        top (int, optional): Children kept per parent; None keeps all.
+        other (str): Label of the folded child.
+
+    Returns:
+        pandas.DataFrame: ``parent``, ``child``, ``value`` and ``members``
+        (children folded into the row, 1 for kept children), sorted by
+        parent then value, with ``other`` last within its parent.
+    """
+    ordered = totals[[parent, child, value]].sort_values(
+        [parent, value, child], ascending=[True, False, True], kind='stable'
+    ).reset_index(drop=True)
+    ordered['members'] = 1
+    if top is None:
+        return ordered
+
+    position = ordered.groupby(parent, sort=False).cumcount().to_numpy()
+    size = ordered.groupby(parent, sort=False)[child].transform('size').to_numpy()
+    folded = (position >= top) & (size > top + 1)
+    if not folded.any():
+        return ordered
+
+    kept = ordered[~folded]
+    rest = ordered[folded].groupby(parent, sort=True).agg(**{
+        value: (value, 'sum'), 'members': ('members', 'sum'),
+    }).reset_index()
+    rest[child] = other
+    result = pd.concat([kept, rest[[parent, child, value, 'members']]], ignore_index=True)
+    order = np.lexsort((result[child].eq(other).to_numpy(), pd.factorize(result[parent], sort=True)[0]))
+    return result.take(order).reset_index(drop=True)
@@ -0,0 +1,75 @@
+"""Row-id indexes over the in-memory freight tables."""
+
+import numpy as np
+import pandas as pd
+
+
+class TableIndex:
+    """
+    Dictionary-encoded index on the filterable columns of a table.
+
+    Each indexed column is factorized once into integer codes. A selection
+    is answered by marking the selected codes in a small lookup table and
+    gathering it by the code array, which yields the matching row ids in
+    table order without comparing any strings.
+    """
+
+    def __init__(self, df, columns):
+        """
+        Args:
+            df (pandas.DataFrame): Table to index.
+            columns (iterable): Columns that selections may filter on.
+        """
+        self.n_rows = len(df)
+        self.codes = {}
+        self.values = {}
+        for column in columns:
+            codes, uniques = pd.factorize(df[column], sort=True)
+            self.codes[column] = codes.astype(np.int32)
+            self.values[column] = pd.Index(uniques)
+
+    def _column_mask(self, column, selected):
+        values = self.values[column]
+        lookup = np.zeros(len(values) + 1, dtype=bool)
+        positions = values.get_indexer(pd.Index(list(selected)))
+        lookup[positions[positions >= 0]] = True
+        # Code -1 (missing value) maps to the trailing False slot
+        return lookup[self.codes[column]]
+
+    def select(self, filters):
+        """
+        Row ids matching every filter.
+
+        Args:
+            filters (dict): Column name to selected values. ``None`` values
+                leave that column unrestricted.
+
+        Returns:
+            numpy.ndarray: Ascending row positions.
+        """
+        mask = None
+        for column, selected in filters.items():
+            if selected is None:
+                continue
+            column_mask = self._column_mask(column, selected)
+            mask = column_mask if mask is None else mask & column_mask
+        if mask is None:
+            return np.arange(self.n_rows)
+        return np.flatnonzero(mask)
+
+
+def sort_row_ids(df, row_ids, sort_by=None, ascending=True):
+    """
+    Order row ids by a column with a stable sort.
+
+    Ties keep table order, so paging through a sorted selection is
+    deterministic across reruns.
+
+    Returns:
+        numpy.ndarray: ``row_ids`` reordered.
+    """
+    if sort_by is None:
+        return row_ids
+    values = pd.Series(df[sort_by].to_numpy()[row_ids])
+    order = values.sort_values(ascending=ascending, kind='mergesort', na_position='last').index
+    return row_ids[order.to_numpy()]
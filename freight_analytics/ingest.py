@@ -0,0 +1,336 @@
+"""
+Fast ingest paths for the freight datasets.
+
+A dataset source is one file, a directory of part files (e.g. one rail
+CSV per year and region) or a glob pattern. Several parts are parsed in
+parallel in a process pool, reconciled to one schema and written once
+into preallocated columns.
+"""
+
+import glob
+import json
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .dates import parse_dates
+from .parallel import pool_context
+
+logger = logging.getLogger(__name__)
+
+MONTH_LABELS = np.array(
+    ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun',
+     'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec'],
+    dtype=object
+)
+SEASON_LABELS = np.array(['Winter', 'Spring', 'Summer', 'Fall'], dtype=object)
+
+# Season code for each month number; index 0 is unused so months index directly
+MONTH_TO_SEASON = np.array([0, 0, 0, 1, 1, 1, 2, 2, 2, 3, 3, 3, 0], dtype=np.int8)
+
+PORT_DATE_FIELD = "port"
+
+# Part files picked up from a directory source
+SOURCE_SUFFIXES = ('.csv', '.json')
+
+RAIL_COLUMNS = ('Date', 'Year', 'Month', 'Railroad', 'Commodity', 'Carloads')
+
+
+def source_files(source):
+    """
+    Files making up a dataset source.
+
+    Args:
+        source (str or Path): A file, a directory (its CSV/JSON files) or a
+            glob pattern such as ``Data/rail/*.csv``.
+
+    Returns:
+        list: Paths, sorted for directories and patterns.
+    """
+    path = Path(source)
+    if path.is_dir():
+        files = sorted(p for p in path.iterdir()
+                       if p.is_file() and p.suffix.lower() in SOURCE_SUFFIXES and not p.name.startswith('.'))
+    elif glob.has_magic(str(source)):
+        files = sorted(Path(p) for p in glob.glob(str(source)) if Path(p).is_file())
+    else:
+        return [path]
+    if not files:
+        raise FileNotFoundError(f"No data files in {source}")
+    return files
+
+
+def parse_files(parse, paths, workers=None):
+    """
+    Apply ``parse`` to every file, in a process pool when there are several.
+
+    Workers are started with ``forkserver`` or ``spawn`` (see
+    ``parallel.pool_context``), so this is safe to call from the threaded
+    dashboard server.
+
+    Args:
+        parse (callable): Module-level function taking one path.
+        paths (list): Files to parse.
+        workers (int, optional): Pool size. Defaults to the CPU count.
+
+    Returns:
+        list: Results in the order of ``paths``.
+    """
+    workers = min(workers or os.cpu_count() or 1, len(paths))
+    if workers <= 1:
+        return [parse(path) for path in paths]
+    with ProcessPoolExecutor(max_workers=workers, mp_context=pool_context()) as pool:
+        return list(pool.map(parse, paths))
+
+
+def _concat_column(arrays, lengths):
+    """One column from per-part arrays, None where a part lacks it."""
+    present = [a for a in arrays if a is not None]
+    kinds = {a.dtype.kind for a in present}
+    complete = len(present) == len(arrays)
+    if kinds <= set('iub'):
+        # Parts without the column need a NaN, so integers widen to float
+        dtype = np.result_type(*present) if complete else np.dtype(np.float64)
+    elif kinds <= set('iubf'):
+        dtype = np.result_type(np.float64, *present)
+    elif kinds == {'M'}:
+        dtype = np.dtype('datetime64[ns]')
+    else:
+        dtype = np.dtype(object)
+
+    out = np.empty(sum(lengths), dtype=dtype)
+    start = 0
+    for values, length in zip(arrays, lengths):
+        stop = start + length
+        if values is None:
+            out[start:stop] = np.datetime64('NaT') if dtype.kind == 'M' else (None if dtype == object else np.nan)
+        else:
+            out[start:stop] = values
+        start = stop
+    return out
+
+
+def concat_frames(frames):
+    """
+    Concatenate part frames whose columns may differ.
+
+    Columns are taken in first-seen order; a column missing from a part
+    is NaN/None there. Each output column is allocated once at its full
+    length with a dtype every part fits (numeric columns widen, anything
+    mixed becomes object) and each part is copied straight into its slice.
+
+    Returns:
+        pandas.DataFrame: All rows, part by part.
+    """
+    if len(frames) == 1:
+        return frames[0]
+    columns = list(dict.fromkeys(column for frame in frames for column in frame.columns))
+    lengths = [len(frame) for frame in frames]
+    data = {}
+    for column in columns:
+        arrays = [frame[column].to_numpy() if column in frame.columns else None for frame in frames]
+        data[column] = _concat_column(arrays, lengths)
+    return pd.DataFrame(data, copy=False)
+
+
+class PortMatrix:
+    """
+    Port TEU values held as a dense (dates x ports) matrix.
+
+    The JSON source stores one record per month with a TEU string per port.
+    Keeping it as a matrix means dates are parsed once per record and the
+    long format the dashboards use is a pure reshape of the matrix.
+    """
+
+    def __init__(self, dates, ports, values):
+        """
+        Args:
+            dates (numpy.ndarray): datetime64 array, one entry per matrix row.
+            ports (list): Port names, one per matrix column.
+            values (numpy.ndarray): float64 TEU matrix of shape (dates, ports).
+        """
+        self.dates = dates
+        self.ports = list(ports)
+        self.values = values
+
+    @property
+    def shape(self):
+        return self.values.shape
+
+    def to_frame(self):
+        """
+        Reshape the matrix into the long port frame.
+
+        Rows are ordered port-major like ``DataFrame.melt`` output. Missing
+        TEU values are dropped, as are values on a missing or unparseable
+        date, which is logged with their count.
+
+        Returns:
+            pandas.DataFrame: Columns ``port`` (date), ``port_name``,
+            ``TEU_values``, ``month_num``, ``month``, ``year`` and ``season``.
+        """
+        n_dates, n_ports = self.values.shape
+        dates = pd.DatetimeIndex(self.dates)
+
+        # Per-date attributes are computed once and broadcast by tiling
+        valid_date = ~dates.isna()
+        month_num = np.zeros(n_dates, dtype=np.int8)
+        year = np.zeros(n_dates, dtype=np.int32)
+        month_num[valid_date] = dates.month[valid_date]
+        year[valid_date] = dates.year[valid_date]
+
+        teu = self.values.T.ravel()
+        has_value = ~np.isnan(teu)
+        keep = has_value & np.tile(valid_date, n_ports)
+        undated = int(has_value.sum() - keep.sum())
+        if undated:
+            logger.warning("Dropping %d port TEU value(s) without a valid date", undated)
+
+        port_codes = np.repeat(np.arange(n_ports), n_dates)[keep]
+        month_long = np.tile(month_num, n_ports)[keep]
+
+        return pd.DataFrame({
+            'port': np.tile(dates.values, n_ports)[keep],
+            'port_name': np.asarray(self.ports, dtype=object)[port_codes],
+            'TEU_values': teu[keep],
+            'month_num': month_long,
+            'month': MONTH_LABELS[month_long - 1],
+            'year': np.tile(year, n_ports)[keep],
+            'season': SEASON_LABELS[MONTH_TO_SEASON[month_long]],
+        })
+
+
+def read_port_matrix(source):
+    """
+    Parse the port JSON dataset straight into a ``PortMatrix``.
+
+    Args:
+        source (str, Path or list): Path to ``port_dataset.json`` or the
+            already decoded list of records.
+
+    Returns:
+        PortMatrix: Parsed TEU matrix.
+    """
+    if isinstance(source, (str, Path)):
+        with open(source, 'r') as f:
+            records = json.load(f)
+    else:
+        records = source
+
+    ports = []
+    seen = set()
+    for record in records:
+        for key in record:
+            if key != PORT_DATE_FIELD and key not in seen:
+                seen.add(key)
+                ports.append(key)
+
+    raw_dates = [record.get(PORT_DATE_FIELD) for record in records]
+    rows = [[record.get(port) for port in ports] for record in records]
+
+    try:
+        values = np.array(rows, dtype=np.float64).reshape(len(records), len(ports))
+    except (TypeError, ValueError):
+        # Blank or non-numeric entries: fall back to a coercing parse
+        flat = pd.to_numeric(pd.Series(np.array(rows, dtype=object).ravel()), errors='coerce')
+        values = flat.to_numpy(dtype=np.float64).reshape(len(records), len(ports))
+
+    dates = parse_dates(raw_dates)
+
+    return PortMatrix(dates, ports, values)
+
+
+def concat_port_matrices(matrices):
+    """
+    Stack port matrices read from several files.
+
+    The result has the union of the ports, in first-seen order, and the
+    dates of every part in turn; a port missing from a part is NaN there
+    and dropped by ``to_frame``.
+    """
+    if len(matrices) == 1:
+        return matrices[0]
+    index = {}
+    for matrix in matrices:
+        for port in matrix.ports:
+            index.setdefault(port, len(index))
+
+    n_dates = sum(len(matrix.dates) for matrix in matrices)
+    dates = np.empty(n_dates, dtype='datetime64[ns]')
+    values = np.full((n_dates, len(index)), np.nan)
+    start = 0
+    for matrix in matrices:
+        stop = start + len(matrix.dates)
+        dates[start:stop] = matrix.dates
+        values[start:stop, [index[port] for port in matrix.ports]] = matrix.values
+        start = stop
+    return PortMatrix(dates, list(index), values)
+
+
+def load_port_frame(source, workers=None):
+    """
+    Parse the port JSON dataset and return the long port frame.
+
+    Args:
+        source (str or Path): ``port_dataset.json``, a directory of port
+            JSON files or a glob pattern; see ``source_files``.
+        workers (int, optional): Parse pool size for several files.
+    """
+    return concat_port_matrices(parse_files(read_port_matrix, source_files(source), workers)).to_frame()
+
+
+def season_labels(months):
+    """Map month numbers (1-12) to season labels with a lookup table."""
+    months = np.asarray(months)
+    labels = np.full(len(months), None, dtype=object)
+    valid = (months >= 1) & (months <= 12)
+    labels[valid] = SEASON_LABELS[MONTH_TO_SEASON[months[valid].astype(np.int64)]]
+    return labels
+
+
+_RAIL_NAMES = {column.lower(): column for column in RAIL_COLUMNS}
+
+
+def read_rail_part(path):
+    """
+    Read one rail carloadings CSV with parsed dates.
+
+    Column names are matched to the canonical ones regardless of case and
+    surrounding spaces, and ``Year``/``Month`` are derived from ``Date``
+    when a file leaves them out.
+    """
+    df = pd.read_csv(path)
+    renames = {column: _RAIL_NAMES[column.strip().lower()] for column in df.columns
+               if column.strip().lower() in _RAIL_NAMES and column != _RAIL_NAMES[column.strip().lower()]}
+    if renames:
+        df = df.rename(columns=renames)
+    df['Date'] = parse_dates(df['Date'], errors='raise')
+    if 'Year' not in df.columns or 'Month' not in df.columns:
+        dates = pd.DatetimeIndex(df['Date'])
+        if 'Year' not in df.columns:
+            df['Year'] = dates.year.to_numpy(dtype=np.int64)
+        if 'Month' not in df.columns:
+            df['Month'] = dates.month.to_numpy(dtype=np.int64)
+    return df
+
+
+def load_rail_frame(source, workers=None):
+    """
+    Read the rail carloadings CSV and add the derived columns.
+
+    Args:
+        source (str or Path): ``Rail_Carloadings_originated.csv``, a
+            directory of rail CSV files (e.g. one per year and region) or
+            a glob pattern; see ``source_files``.
+        workers (int, optional): Parse pool size for several files.
+
+    Returns:
+        pandas.DataFrame: Rail records with parsed ``Date`` and ``Season``.
+    """
+    df = concat_frames(parse_files(read_rail_part, source_files(source), workers))
+    df['Season'] = season_labels(df['Month'])
+    return df
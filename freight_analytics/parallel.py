@@ -0,0 +1,32 @@
+"""
+Start methods for worker process pools.
+
+``fork`` is the cheapest way to start workers: they inherit the parent's
+loaded frames instead of loading their own. Forking a process that runs
+other threads, like the Streamlit server, copies any lock another thread
+holds at that moment (the core's load locks, logging handlers), and a
+child that needs that lock hangs. Pools therefore use ``forkserver``
+(or ``spawn`` where it is unavailable) unless the caller is a
+single-threaded command-line run that opts into ``fork``.
+"""
+
+import multiprocessing
+import threading
+
+
+def pool_context(allow_fork=False):
+    """
+    Multiprocessing context for a worker pool.
+
+    Args:
+        allow_fork (bool): Use ``fork`` when the platform has it and this
+            process runs a single thread, e.g. from the command line.
+
+    Returns:
+        multiprocessing.context.BaseContext: Context to pass as
+        ``mp_context``.
+    """
+    methods = multiprocessing.get_all_start_methods()
+    if allow_fork and 'fork' in methods and threading.active_count() == 1:
+        return multiprocessing.get_context('fork')
+    return multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
@@ -0,0 +1,194 @@
+"""
+Port dimension table.
+
+Location, coast, region, display name and yearly capacity for each port,
+keyed by the port code used in the port dataset (``port_name``). The
+registry is read from ``data/port_registry.csv`` and
+``data/port_capacity.csv``; set ``FREIGHT_PORT_REGISTRY`` and
+``FREIGHT_PORT_CAPACITY`` to use other files with the same columns.
+
+Attributes are attached to a frame with one categorical code lookup per
+call instead of a Python-level lookup per row. Ports missing from the
+registry get NaN coordinates and capacity, ``"Unknown"`` region and
+coast, and a display name derived from the code.
+"""
+
+import hashlib
+import os
+import threading
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+PORT_DATA_DIR = Path(__file__).parent / "data"
+REGISTRY_FILE = "port_registry.csv"
+CAPACITY_FILE = "port_capacity.csv"
+
+PORT_FIELDS = ('name', 'lat', 'lon', 'region', 'coast')
+UNKNOWN = "Unknown"
+_FALLBACKS = {'lat': np.nan, 'lon': np.nan, 'region': UNKNOWN, 'coast': UNKNOWN}
+
+
+def display_name(code):
+    """Readable name derived from a port code, e.g. ``'oakland_ca'``."""
+    return str(code).replace('_', ' ').title()
+
+
+class PortRegistry:
+    """
+    Port attributes and capacity history keyed by port code.
+
+    Capacity entries apply from their year until the next entry for the
+    same port; years before a port's first entry have no capacity.
+    """
+
+    def __init__(self, ports, capacity=None):
+        """
+        Args:
+            ports (pandas.DataFrame): One row per port with a ``code``
+                column and any of ``name``, ``lat``, ``lon``, ``region``
+                and ``coast``.
+            capacity (pandas.DataFrame, optional): ``code``, ``year`` and
+                ``capacity_teu`` rows.
+        """
+        ports = ports.drop_duplicates('code', keep='last').reset_index(drop=True)
+        self.codes = pd.Index(ports['code'].astype(str))
+        self._columns = {}
+        for field in PORT_FIELDS:
+            if field in ('lat', 'lon'):
+                values = pd.to_numeric(ports.get(field), errors='coerce') if field in ports else np.nan
+                values = np.broadcast_to(np.asarray(values, dtype=np.float64), len(ports)).copy()
+            elif field in ports:
+                values = ports[field].fillna(UNKNOWN if field != 'name' else '').to_numpy(dtype=object)
+            else:
+                values = np.full(len(ports), UNKNOWN, dtype=object)
+            if field == 'name':
+                # Missing names fall back to the code
+                missing = values == ''
+                values[missing] = [display_name(code) for code in self.codes[missing]]
+            self._columns[field] = values
+
+        self._capacity = None
+        self._first_year = 0
+        if capacity is not None and len(capacity):
+            self._build_capacity(capacity)
+
+        # Content hash, so results derived from the registry can tell when it changed
+        digest = hashlib.sha1()
+        for table in (ports, capacity):
+            if table is not None:
+                digest.update(",".join(map(str, table.columns)).encode('utf-8'))
+                digest.update(pd.util.hash_pandas_object(table, index=False).to_numpy().tobytes())
+        self.digest = digest.hexdigest()
+
+    def _build_capacity(self, capacity):
+        # Dense (port x year) matrix, forward-filled along years
+        codes = self.codes.get_indexer(capacity['code'].astype(str))
+        years = capacity['year'].to_numpy(dtype=np.int64)
+        known = codes >= 0
+        self._first_year = int(years.min())
+        matrix = np.full((len(self.codes), int(years.max()) - self._first_year + 1), np.nan)
+        matrix[codes[known], years[known] - self._first_year] = capacity['capacity_teu'].to_numpy(dtype=np.float64)[known]
+        self._capacity = pd.DataFrame(matrix.T).ffill().to_numpy().T
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __contains__(self, code):
+        return code in self.codes
+
+    def lookup_codes(self, ports):
+        """Registry positions of port codes; -1 for unknown ports."""
+        # Each distinct code is looked up once and broadcast back
+        codes, uniques = pd.factorize(pd.Series(ports, copy=False).astype(str))
+        return self.codes.get_indexer(uniques).astype(np.int64)[codes]
+
+    def field(self, ports, field):
+        """
+        Values of one registry field for a sequence of port codes.
+
+        Returns:
+            numpy.ndarray: Aligned with ``ports``; unknown ports get the
+            field's fallback.
+        """
+        if field not in PORT_FIELDS:
+            raise ValueError(f"Field must be one of {PORT_FIELDS}")
+        codes = self.lookup_codes(ports)
+        # Trailing slot holds the fallback, so code -1 selects it
+        table = np.append(self._columns[field], None if field == 'name' else _FALLBACKS[field])
+        values = table[codes]
+        unknown = codes < 0
+        if field == 'name' and unknown.any():
+            names = pd.Series(ports, copy=False).astype(str)[unknown]
+            values[unknown] = names.str.replace('_', ' ').str.title().to_numpy()
+        return values
+
+    def attach(self, df, column='port_name', fields=('lat', 'lon', 'region', 'coast')):
+        """
+        Copy of ``df`` with registry fields joined on a port code column.
+
+        Args:
+            df (pandas.DataFrame): Frame with port codes in ``column``.
+            column (str): Port code column.
+            fields (iterable): Registry fields to add; ``'name'`` is added
+                as ``port_display``.
+        """
+        out = df.copy()
+        ports = out[column]
+        for field in fields:
+            out['port_display' if field == 'name' else field] = self.field(ports, field)
+        return out
+
+    def capacity(self, ports, years):
+        """
+        Capacity in TEU per (port, year) pair.
+
+        Returns:
+            numpy.ndarray: Float capacities; NaN for unknown ports and
+            years before a port's first capacity entry.
+        """
+        codes = self.lookup_codes(ports)
+        years = np.asarray(years, dtype=np.int64)
+        out = np.full(len(codes), np.nan)
+        if self._capacity is None:
+            return out
+        offsets = np.clip(years - self._first_year, -1, self._capacity.shape[1] - 1)
+        valid = (codes >= 0) & (offsets >= 0)
+        out[valid] = self._capacity[codes[valid], offsets[valid]]
+        return out
+
+    def display_names(self, ports):
+        """Display names for a sequence of port codes."""
+        return self.field(ports, 'name')
+
+
+def load_port_registry(registry_path=None, capacity_path=None):
+    """
+    Read a registry from CSV files.
+
+    Args:
+        registry_path (str or Path, optional): Port attributes file.
+            Defaults to ``FREIGHT_PORT_REGISTRY`` or the packaged file.
+        capacity_path (str or Path, optional): Capacity history file.
+            Defaults to ``FREIGHT_PORT_CAPACITY`` or the packaged file.
+    """
+    registry_path = registry_path or os.environ.get("FREIGHT_PORT_REGISTRY") or PORT_DATA_DIR / REGISTRY_FILE
+    capacity_path = capacity_path or os.environ.get("FREIGHT_PORT_CAPACITY") or PORT_DATA_DIR / CAPACITY_FILE
+    ports = pd.read_csv(registry_path)
+    capacity = pd.read_csv(capacity_path) if Path(capacity_path).exists() else None
+    return PortRegistry(ports, capacity)
+
+
+_default_registry = None
+_registry_lock = threading.Lock()
+
+
+def default_registry():
+    """The process-wide registry, read on first use."""
+    global _default_registry
+    if _default_registry is None:
+        with _registry_lock:
+            if _default_registry is None:
+                _default_registry = load_port_registry()
+    return _default_registry
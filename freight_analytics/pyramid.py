@@ -0,0 +1,155 @@
+"""
+Multi-resolution time aggregation.
+
+A ``TimePyramid`` holds the totals of one value column at week, month,
+quarter and year resolution, optionally split by a group column. Week
+and month totals are aggregated from the rows; quarter totals are built
+from month totals and year totals from quarter totals, so each level
+costs roughly as much as the level below it rather than a pass over the
+raw rows. Charts ask the pyramid for the coarsest level that still gives
+enough points across the requested span and chart width.
+"""
+
+import numpy as np
+import pandas as pd
+
+LEVELS = ('week', 'month', 'quarter', 'year')
+LEVEL_DAYS = {'week': 7, 'month': 30.44, 'quarter': 91.31, 'year': 365.25}
+LEVEL_LABELS = {'week': "Weekly", 'month': "Monthly", 'quarter': "Quarterly", 'year': "Yearly"}
+
+DEFAULT_CHART_WIDTH = 1000
+POINT_SPACING_PX = 20
+MIN_POINTS = 12
+
+
+def _week_start(dates):
+    # Day 0 (1970-01-01) is a Thursday; shift so buckets start on Monday
+    days = dates.astype('datetime64[D]').astype(np.int64)
+    return (days - (days + 3) % 7).astype('datetime64[D]')
+
+
+def _month_start(dates, months_per_bucket=1):
+    months = dates.astype('datetime64[M]').astype(np.int64)
+    months = months - months % months_per_bucket
+    return months.astype('datetime64[M]').astype('datetime64[D]')
+
+
+def bucket_start(level, dates):
+    """Start date of the ``level`` bucket containing each date."""
+    dates = np.asarray(dates, dtype='datetime64[ns]')
+    if level == 'week':
+        return _week_start(dates)
+    return _month_start(dates, {'month': 1, 'quarter': 3, 'year': 12}[level])
+
+
+def _native_level(dates):
+    """Finest level that is coarser than or equal to the data's spacing."""
+    unique = np.unique(dates.astype('datetime64[D]'))
+    if len(unique) < 2:
+        return 'week'
+    spacing = np.median(np.diff(unique.astype(np.int64)))
+    return 'month' if spacing >= 28 else 'week'
+
+
+class TimePyramid:
+    """
+    Totals of a value column at several time resolutions.
+
+    Each level is a long-format frame with the bucket start date in
+    ``date_column``, the optional ``group_column`` and the summed
+    ``value_column``, sorted by group then date.
+    """
+
+    def __init__(self, df, date_column, value_column, group_column=None):
+        """
+        Args:
+            df (pandas.DataFrame): Rows to aggregate.
+            date_column (str): Datetime column.
+            value_column (str): Column to sum.
+            group_column (str, optional): Column to keep as a series key.
+        """
+        self.date_column = date_column
+        self.value_column = value_column
+        self.group_column = group_column
+        self.levels = {}
+
+        dates = df[date_column].to_numpy(dtype='datetime64[ns]')
+        valid = ~np.isnat(dates)
+        dates = dates[valid]
+        values = df[value_column].to_numpy()[valid]
+        groups = df[group_column].to_numpy()[valid] if group_column else None
+
+        self.native = _native_level(dates) if len(dates) else 'week'
+        if self.native == 'week':
+            self.levels['week'] = self._aggregate(_week_start(dates), groups, values)
+        self.levels['month'] = self._aggregate(_month_start(dates), groups, values)
+        self.levels['quarter'] = self._roll_up(self.levels['month'], 'quarter')
+        self.levels['year'] = self._roll_up(self.levels['quarter'], 'year')
+
+        if len(dates):
+            self.start = pd.Timestamp(dates.min())
+            self.end = pd.Timestamp(dates.max())
+        else:
+            self.start = self.end = None
+
+    def _aggregate(self, buckets, groups, values):
+        keys = {self.date_column: buckets}
+        if groups is not None:
+            keys = {self.group_column: groups, **keys}
+        frame = pd.DataFrame({**keys, self.value_column: values})
+        by = list(keys)
+        totals = frame.groupby(by, sort=True)[self.value_column].sum().reset_index()
+        totals[self.date_column] = totals[self.date_column].astype('datetime64[ns]')
+        return totals
+
+    def _roll_up(self, finer, level):
+        buckets = bucket_start(level, finer[self.date_column].to_numpy())
+        groups = finer[self.group_column].to_numpy() if self.group_column else None
+        return self._aggregate(buckets, groups, finer[self.value_column].to_numpy())
+
+    def available_levels(self):
+        """Levels held by this pyramid, finest first."""
+        return [level for level in LEVELS if level in self.levels]
+
+    def choose_level(self, start=None, end=None, width=None):
+        """
+        Coarsest level with enough points for the span and chart width.
+
+        A chart ``width`` pixels wide wants about one point every
+        ``POINT_SPACING_PX`` pixels and never fewer than ``MIN_POINTS``.
+        If no level is fine enough the finest available level is used.
+        """
+        start = pd.Timestamp(start) if start is not None else self.start
+        end = pd.Timestamp(end) if end is not None else self.end
+        available = self.available_levels()
+        if start is None or end is None:
+            return available[0]
+        span_days = max((end - start).days, 1)
+        wanted = max(MIN_POINTS, (width or DEFAULT_CHART_WIDTH) // POINT_SPACING_PX)
+        for level in reversed(available):
+            if span_days / LEVEL_DAYS[level] + 1 >= wanted:
+                return level
+        return available[0]
+
+    def series(self, level=None, start=None, end=None, width=None):
+        """
+        Totals for a date range at a given or automatically chosen level.
+
+        Returns:
+            tuple: ``(frame, level)``; the frame is shared and read-only.
+        """
+        level = level or self.choose_level(start, end, width)
+        if level not in self.levels:
+            raise ValueError(f"Level must be one of {self.available_levels()}")
+        frame = self.levels[level]
+        if start is not None or end is not None:
+            dates = frame[self.date_column]
+            mask = np.ones(len(frame), dtype=bool)
+            if start is not None:
+                # Keep the bucket that contains the start date
+                first = bucket_start(level, [pd.Timestamp(start).to_datetime64()])[0]
+                mask &= (dates >= first).to_numpy()
+            if end is not None:
+                mask &= (dates <= pd.Timestamp(end)).to_numpy()
+            frame = frame[mask]
+        return frame, level
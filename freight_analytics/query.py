@@ -0,0 +1,193 @@
+"""
+Declarative grouped queries over the freight datasets.
+
+A query names filters (column to accepted values), grouping columns,
+metrics of the dataset's value column and an optional time grain. The
+planner answers it from the cheapest source that can:
+
+* ``cube``: monthly totals, counts, minima and maxima per combination of
+  every categorical column, built once per data revision. Answers
+  queries at month, quarter or year grain (or without a grain) for the
+  decomposable metrics.
+* ``index``: the row-id index on the dataset's filter columns selects
+  the rows before the remaining filters and the grouping run.
+* ``scan``: a filtered pass over the full table.
+
+Filters are always applied before grouping, and results are cached per
+data revision under the normalized query. Rows with a missing value in a
+grouping column form their own group in every source.
+"""
+
+import numpy as np
+import pandas as pd
+
+from .core import DATASET_COLUMNS, FILTER_COLUMNS, _normalize
+from .pyramid import LEVELS, bucket_start
+
+METRICS = ('sum', 'mean', 'count', 'min', 'max', 'std')
+CUBE_METRICS = ('sum', 'mean', 'count', 'min', 'max')
+CUBE_GRAINS = (None, 'month', 'quarter', 'year')
+SOURCES = ('cube', 'index', 'scan')
+
+_CUBE_MONTH = '_month'
+
+
+def normalize_query(core, dataset, filters=None, group_by=None, metrics=('sum',), time_grain=None):
+    """
+    Validate a query and return its hashable key.
+
+    Filter values may be a single value or a collection; the order of
+    filters and filter values does not matter. ``group_by`` and
+    ``metrics`` keep their order, which is the result's column order.
+    """
+    if dataset not in DATASET_COLUMNS:
+        raise ValueError("Mode must be 'rail' or 'port'")
+    columns = DATASET_COLUMNS[dataset]
+    frame_columns = set(core.frame(dataset).columns) - {columns['date'], columns['value']}
+
+    filters = filters or {}
+    unknown = (set(filters) | set(group_by or ())) - frame_columns
+    if unknown:
+        raise ValueError(f"Cannot filter or group {dataset} data on: {sorted(unknown)}")
+    metrics = tuple(metrics or ('sum',))
+    invalid = [metric for metric in metrics if metric not in METRICS]
+    if invalid:
+        raise ValueError(f"Metrics must be among {METRICS}, got {invalid}")
+    if time_grain is not None and time_grain not in LEVELS:
+        raise ValueError(f"Time grain must be one of {LEVELS}")
+
+    filter_key = tuple(sorted(
+        (column, _normalize([values] if np.isscalar(values) else values))
+        for column, values in filters.items()
+        if values is not None
+    ))
+    return filter_key, tuple(group_by or ()), metrics, time_grain
+
+
+def _cube(core, dataset):
+    """Monthly sum/count/min/max per combination of the categorical columns."""
+    columns = DATASET_COLUMNS[dataset]
+
+    def compute(df):
+        dimensions = [c for c in df.columns if c not in (columns['date'], columns['value'])]
+        month = bucket_start('month', df[columns['date']].to_numpy()).astype('datetime64[ns]')
+        keyed = df[dimensions + [columns['value']]].assign(**{_CUBE_MONTH: month})
+        grouped = keyed.groupby(dimensions + [_CUBE_MONTH], sort=False, observed=True, dropna=False)
+        return grouped[columns['value']].agg(['sum', 'count', 'min', 'max']).reset_index()
+
+    return core.cached(dataset, 'cube', None, compute)
+
+
+def plan(core, dataset, key):
+    """
+    Choose the source for a normalized query.
+
+    The cube is used whenever it can answer the query and has fewer rows
+    than the rows the index would select; the index whenever a filter
+    column is indexed; otherwise the table is scanned.
+    """
+    filter_key, _, metrics, time_grain = key
+    indexed = {column: values for column, values in filter_key if column in FILTER_COLUMNS[dataset]}
+    row_count = len(core.row_ids(dataset, indexed)) if indexed else len(core.frame(dataset))
+
+    if time_grain in CUBE_GRAINS and all(metric in CUBE_METRICS for metric in metrics):
+        if len(_cube(core, dataset)) < row_count:
+            return 'cube'
+    return 'index' if indexed else 'scan'
+
+
+def _mask(df, filters):
+    mask = np.ones(len(df), dtype=bool)
+    for column, values in filters:
+        mask &= df[column].isin(values).to_numpy()
+    return mask
+
+
+def _group_keys(df, date_values, group_by, time_grain, date_column):
+    keys = {column: df[column].to_numpy() for column in group_by}
+    if time_grain:
+        keys[date_column] = bucket_start(time_grain, date_values).astype('datetime64[ns]')
+    return pd.DataFrame(keys, index=df.index)
+
+
+def _from_rows(core, dataset, key, source):
+    filter_key, group_by, metrics, time_grain = key
+    columns = DATASET_COLUMNS[dataset]
+    df = core.frame(dataset)
+    remaining = filter_key
+    if source == 'index':
+        indexed = {column: values for column, values in filter_key if column in FILTER_COLUMNS[dataset]}
+        df = df.take(core.row_ids(dataset, indexed))
+        remaining = tuple((c, v) for c, v in filter_key if c not in indexed)
+    if remaining:
+        df = df[_mask(df, remaining)]
+
+    keys = _group_keys(df, df[columns['date']].to_numpy(), group_by, time_grain, columns['date'])
+    values = df[columns['value']]
+    if keys.shape[1] == 0:
+        return pd.DataFrame({metric: [values.agg(metric)] for metric in metrics})
+    return values.groupby([keys[c] for c in keys.columns], dropna=False).agg(list(metrics)).reset_index()
+
+
+def _from_cube(core, dataset, key):
+    filter_key, group_by, metrics, time_grain = key
+    columns = DATASET_COLUMNS[dataset]
+    cube = _cube(core, dataset)
+    if filter_key:
+        cube = cube[_mask(cube, filter_key)]
+
+    keys = _group_keys(cube, cube[_CUBE_MONTH].to_numpy(), group_by, time_grain, columns['date'])
+    parts = cube[['sum', 'count', 'min', 'max']]
+    if keys.shape[1] == 0:
+        rolled = pd.DataFrame({
+            'sum': [parts['sum'].sum()], 'count': [parts['count'].sum()],
+            'min': [parts['min'].min()], 'max': [parts['max'].max()],
+        })
+    else:
+        rolled = parts.groupby([keys[c] for c in keys.columns], dropna=False).agg(
+            {'sum': 'sum', 'count': 'sum', 'min': 'min', 'max': 'max'}
+        )
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rolled['mean'] = rolled['sum'] / rolled['count']
+    result = rolled[list(metrics)]
+    return result.reset_index(drop=keys.shape[1] == 0)
+
+
+def answer_query(core, dataset, key):
+    """Plan and answer a normalized query in memory (uncached)."""
+    source = plan(core, dataset, key)
+    result = _from_cube(core, dataset, key) if source == 'cube' else _from_rows(core, dataset, key, source)
+    result.attrs['source'] = source
+    return result
+
+
+def run_query(core, dataset, filters=None, group_by=None, metrics=('sum',), time_grain=None, backend=None):
+    """
+    Answer a grouped query, planning and caching it on the shared core.
+
+    Args:
+        core (FreightCore): Shared compute core.
+        dataset (str): ``'rail'`` or ``'port'``.
+        filters (dict, optional): Column to accepted value(s).
+        group_by (list, optional): Columns to group by.
+        metrics (list): Aggregates of the value column, from ``METRICS``.
+        time_grain (str, optional): ``'week'``, ``'month'``, ``'quarter'``
+            or ``'year'``; adds the bucket start in the date column.
+        backend (optional): A backend from ``freight_analytics.backends``
+            to run the query; the in-memory planner when None.
+
+    Returns:
+        pandas.DataFrame: Shared, read-only result with the group columns,
+        the date column (with a time grain) and one column per metric.
+        ``attrs['source']`` names the planner's source or the backend.
+    """
+    key = normalize_query(core, dataset, filters, group_by, metrics, time_grain)
+    if backend is None or backend.name == 'pandas':
+        return core.cached(dataset, 'query', key, lambda _: answer_query(core, dataset, key))
+
+    def compute(_):
+        result = backend.query(core, dataset, key)
+        result.attrs['source'] = backend.name
+        return result
+
+    return core.cached(dataset, 'query', (backend.name, key), compute)
@@ -0,0 +1,151 @@
+"""
+Rank-over-time and top-K leaderboards.
+
+``Rankings`` lays period totals out as a (period × entity) matrix and
+ranks every period at once: top-K uses ``numpy.argpartition`` along the
+entity axis, so only the K leaders of each period are sorted, and full
+ranks for bump charts come from one sort of the whole matrix. With a
+sliding window each period is scored by the total of the ``window``
+periods ending there, computed from running sums of the matrix.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+class Rankings:
+    """
+    Per-period ranks of the entities of a long-format totals frame.
+
+    Rank 1 is the largest value. Entities without a value in a period
+    are not ranked there; equal values rank in entity order.
+    """
+
+    def __init__(self, totals, date_column, entity_column, value_column, window=1):
+        """
+        Args:
+            totals (pandas.DataFrame): One row per period and entity, e.g. a
+                ``TimePyramid`` level.
+            date_column (str): Period start column.
+            entity_column (str): Column of the ranked entities.
+            value_column (str): Column to rank by.
+            window (int): Number of periods summed into each score; the
+                first ``window - 1`` periods are dropped.
+        """
+        if window < 1:
+            raise ValueError("Window must be at least 1 period")
+        self.date_column = date_column
+        self.entity_column = entity_column
+        self.value_column = value_column
+        self.window = window
+
+        period_codes, periods = pd.factorize(totals[date_column], sort=True)
+        entity_codes, entities = pd.factorize(totals[entity_column], sort=True)
+        matrix = np.full((len(periods), len(entities)), np.nan)
+        matrix[period_codes, entity_codes] = totals[value_column].to_numpy(dtype=np.float64)
+
+        if window > 1:
+            present = ~np.isnan(matrix)
+            running = np.vstack([np.zeros((1, len(entities))), np.cumsum(np.nan_to_num(matrix), axis=0)])
+            counts = np.vstack([np.zeros((1, len(entities)), dtype=np.int64), np.cumsum(present, axis=0)])
+            sums = running[window:] - running[:-window]
+            seen = counts[window:] - counts[:-window]
+            matrix = np.where(seen > 0, sums, np.nan)
+            periods = periods[window - 1:]
+
+        self.periods = pd.DatetimeIndex(periods, name=date_column)
+        self.entities = pd.Index(entities, name=entity_column)
+        self.values = matrix
+        # Missing values sort after every real value
+        self._scores = np.where(np.isnan(matrix), -np.inf, matrix)
+        self._ranks = None
+
+    @property
+    def ranks(self):
+        """(period × entity) matrix of ranks, NaN where an entity has no value."""
+        if self._ranks is None:
+            n_periods, n_entities = self.values.shape
+            order = np.argsort(-self._scores, axis=1, kind='stable')
+            ranks = np.empty((n_periods, n_entities))
+            np.put_along_axis(ranks, order, np.broadcast_to(np.arange(1, n_entities + 1.0), order.shape), axis=1)
+            ranks[np.isnan(self.values)] = np.nan
+            self._ranks = ranks
+        return self._ranks
+
+    def top_indices(self, k=5):
+        """
+        Entity positions of the top ``k`` in every period, best first.
+
+        Returns:
+            numpy.ndarray: (period × k) array; entities tied for the K-th
+            place may appear in either order.
+        """
+        n_entities = self.values.shape[1]
+        k = min(k, n_entities)
+        if k == 0:
+            return np.empty((len(self.periods), 0), dtype=np.int64)
+        if k < n_entities:
+            leaders = np.argpartition(-self._scores, k - 1, axis=1)[:, :k]
+        else:
+            leaders = np.broadcast_to(np.arange(n_entities), self._scores.shape)
+        scores = np.take_along_axis(self._scores, leaders, axis=1)
+        order = np.lexsort((leaders, -scores), axis=1)
+        return np.take_along_axis(leaders, order, axis=1)
+
+    def top(self, k=5):
+        """
+        Top ``k`` entities of every period.
+
+        Returns:
+            pandas.DataFrame: Long format with the date, ``rank``, entity and
+            value columns; periods with fewer than ``k`` ranked entities have
+            fewer rows.
+        """
+        leaders = self.top_indices(k)
+        n_periods, width = leaders.shape
+        values = np.take_along_axis(self.values, leaders, axis=1).ravel()
+        result = pd.DataFrame({
+            self.date_column: np.repeat(self.periods.to_numpy(), width),
+            'rank': np.tile(np.arange(1, width + 1), n_periods),
+            self.entity_column: self.entities.to_numpy()[leaders.ravel()],
+            self.value_column: values,
+        })
+        return result[~np.isnan(values)].reset_index(drop=True)
+
+    def leaderboard(self, k=5, period=None):
+        """Top ``k`` of one period, the latest by default."""
+        if not len(self.periods):
+            return self.top(k)
+        period = self.periods[-1] if period is None else pd.Timestamp(period)
+        board = self.top(k)
+        return board[board[self.date_column] == period].reset_index(drop=True)
+
+    def bump(self, k=5):
+        """
+        Rank history of every entity that reaches the top ``k`` in any period.
+
+        Returns:
+            pandas.DataFrame: Long format with the date, entity, value and
+            ``rank`` columns, for rank-over-time charts.
+        """
+        leaders = np.unique(self.top_indices(k))
+        ranks = self.ranks[:, leaders]
+        values = self.values[:, leaders]
+        result = pd.DataFrame({
+            self.date_column: np.repeat(self.periods.to_numpy(), len(leaders)),
+            self.entity_column: np.tile(self.entities.to_numpy()[leaders], len(self.periods)),
+            self.value_column: values.ravel(),
+            'rank': ranks.ravel(),
+        })
+        return result.dropna(subset=['rank']).reset_index(drop=True)
+
+    def totals(self, k=5):
+        """Top ``k`` entities by their total over all periods, largest first."""
+        present = ~np.isnan(self.values).all(axis=0)
+        totals = np.where(present, np.nansum(self.values, axis=0), -np.inf)
+        k = min(k, int(present.sum()))
+        if k == 0:
+            return pd.Series([], index=self.entities[:0], name=self.value_column, dtype=np.float64)
+        leaders = np.argpartition(-totals, k - 1)[:k] if k < len(totals) else np.flatnonzero(present)
+        leaders = leaders[np.lexsort((leaders, -totals[leaders]))]
+        return pd.Series(totals[leaders], index=self.entities[leaders], name=self.value_column)
@@ -0,0 +1,138 @@
+"""
+Incremental Plotly charts for Streamlit.
+
+``react_chart`` renders a figure through a small component that keeps
+the chart in the browser between reruns and redraws it with
+``Plotly.react``. Each rerun sends only the traces added or changed
+since the last render in the session, the ids of removed traces and the
+layout when it changed (see ``charts.figure_delta``), so adding one
+railroad to a selection ships one trace rather than the whole figure.
+A browser that has lost its copy of the chart, e.g. after the frame was
+reloaded, asks once for the full figure.
+
+The component page and plotly.js (from the installed plotly package) are
+written to a directory in the temp directory on first use, so the chart
+needs no network access.
+"""
+
+import tempfile
+import threading
+from pathlib import Path
+
+import plotly
+import streamlit as st
+import streamlit.components.v1 as components
+from plotly.offline import get_plotlyjs
+
+from .charts import figure_delta, figure_payload
+
+COMPONENT_NAME = "freight_plotly_react"
+DEFAULT_HEIGHT = 450
+
+_PAGE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<script src="plotly.min.js"></script>
+<style>html, body { margin: 0; padding: 0; overflow: hidden; } #chart { width: 100%; }</style>
+</head>
+<body>
+<div id="chart"></div>
+<script>
+const chart = document.getElementById("chart");
+const state = {version: null, traces: new Map(), order: [], layout: {}};
+
+function post(type, data) {
+  window.parent.postMessage(Object.assign({isStreamlitMessage: true, type: type}, data), "*");
+}
+
+function render(args) {
+  const delta = args.delta;
+  if (delta.version === state.version) {
+    return;
+  }
+  if (delta.base !== null && delta.base !== state.version) {
+    // The traces this delta builds on are gone: ask for the full figure
+    post("streamlit:setComponentValue", {value: delta.version, dataType: "json"});
+    return;
+  }
+  if (delta.base === null) {
+    state.traces.clear();
+  }
+  delta.remove.forEach(id => state.traces.delete(id));
+  Object.entries(delta.traces).forEach(([id, trace]) => state.traces.set(id, trace));
+  if (delta.layout !== null) {
+    state.layout = delta.layout;
+  }
+  state.order = delta.order;
+  state.version = delta.version;
+
+  chart.style.height = args.height + "px";
+  const layout = Object.assign({}, state.layout, {height: args.height, autosize: true});
+  Plotly.react(chart, state.order.map(id => state.traces.get(id)), layout,
+               {responsive: true, displaylogo: false});
+  post("streamlit:setFrameHeight", {height: args.height});
+}
+
+window.addEventListener("message", event => {
+  if (event.data && event.data.type === "streamlit:render") {
+    render(event.data.args);
+  }
+});
+post("streamlit:componentReady", {apiVersion: 1});
+</script>
+</body>
+</html>
+"""
+
+_component = None
+_component_lock = threading.Lock()
+
+
+def _component_dir():
+    directory = Path(tempfile.gettempdir()) / f"{COMPONENT_NAME}-{plotly.__version__}"
+    directory.mkdir(parents=True, exist_ok=True)
+    page = directory / "index.html"
+    if not page.exists() or page.read_text(encoding="utf-8") != _PAGE:
+        page.write_text(_PAGE, encoding="utf-8")
+    script = directory / "plotly.min.js"
+    if not script.exists():
+        partial = directory / f"plotly.min.js.{threading.get_ident()}.partial"
+        partial.write_text(get_plotlyjs(), encoding="utf-8")
+        partial.replace(script)
+    return directory
+
+
+def _declare():
+    global _component
+    with _component_lock:
+        if _component is None:
+            _component = components.declare_component(COMPONENT_NAME, path=str(_component_dir()))
+        return _component
+
+
+def react_chart(fig, key, height=None):
+    """
+    Show a figure, sending only what changed since this session's last render.
+
+    Args:
+        fig (plotly.graph_objects.Figure): Figure to show. Traces are
+            matched across reruns by ``uid`` or name, so give series stable
+            names and colors (see ``charts.color_map``).
+        key (str): Component key, unique per chart on a page.
+        height (int, optional): Chart height in pixels; defaults to the
+            figure's layout height.
+    """
+    payload = figure_payload(fig)
+    height = height or payload.get('layout', {}).get('height') or DEFAULT_HEIGHT
+
+    state_key = f"{key}_sent"
+    sent = st.session_state.get(state_key)
+    # The component's value is the version a client could not apply
+    requested = st.session_state.get(key)
+    resync = sent is not None and requested is not None and requested != sent.get('resynced')
+    delta, state = figure_delta(payload, sent, full=resync)
+    state['resynced'] = requested
+    st.session_state[state_key] = state
+
+    return _declare()(delta=delta, height=height, key=key, default=None)
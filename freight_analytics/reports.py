@@ -0,0 +1,361 @@
+"""
+Static HTML report packs for every railroad and port.
+
+Each report is an HTML file built from the same core aggregations the
+dashboard uses: headline KPIs, the time pyramid series, seasonal totals
+and, for ports, rolling capacity utilization. By default every report
+embeds plotly.js, so a single file can be mailed on its own and opens
+offline. ``plotlyjs='cdn'`` loads it from the Plotly CDN instead, and
+``plotlyjs='directory'`` writes it once per dataset directory as
+``plotly.min.js`` for packs that are always copied as a whole.
+
+Reports are rendered in a process pool. The parent loads the datasets
+once before the pool starts; command-line runs on platforms that fork
+share that copy of the data with the workers, otherwise each worker
+loads it from the columnar cache (see ``parallel.pool_context``). A
+manifest in the output directory records a fingerprint of each entity's
+report inputs (its rows, the report version, the plotly.js mode and, for
+ports, the port registry and alert threshold) and the report's file;
+entities whose fingerprint is unchanged are skipped on the next run.
+"""
+
+import hashlib
+import html
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+from plotly.offline import get_plotlyjs
+
+from .core import get_core
+from .parallel import pool_context
+from .ports import default_registry
+from .pyramid import LEVEL_LABELS
+
+REPORT_VERSION = 2
+MANIFEST_FILE = "manifest.json"
+PLOTLYJS_FILE = "plotly.min.js"
+PLOTLYJS_MODES = {'inline': True, 'cdn': 'cdn', 'directory': 'directory'}
+ENTITY_COLUMNS = {'rail': 'Railroad', 'port': 'port_name'}
+
+_PAGE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<style>
+    body {{ font-family: -apple-system, Segoe UI, Roboto, sans-serif; margin: 2rem auto; max-width: 1100px; color: #222; }}
+    h1 {{ color: #1f4e79; }}
+    h2 {{ color: #2c5aa0; border-left: 4px solid #ff6b6b; padding-left: 0.75rem; }}
+    .kpis {{ display: flex; gap: 1rem; flex-wrap: wrap; }}
+    .kpi {{ background: linear-gradient(45deg, #667eea 0%, #764ba2 100%); color: white;
+            border-radius: 10px; padding: 1rem 1.5rem; min-width: 180px; text-align: center; }}
+    .kpi h3 {{ margin: 0 0 0.5rem; font-size: 0.95rem; font-weight: normal; }}
+    .kpi p {{ margin: 0; font-size: 1.4rem; font-weight: bold; }}
+    footer {{ color: #666; font-size: 0.85rem; margin-top: 2rem; }}
+</style>
+</head>
+<body>
+<h1>{title}</h1>
+<div class="kpis">{kpis}</div>
+{sections}
+<footer>Generated {generated} · US Freight Analytics</footer>
+</body>
+</html>
+"""
+
+
+def slugify(name):
+    """File-system safe name for an entity."""
+    return re.sub(r'[^A-Za-z0-9]+', '_', str(name)).strip('_').lower() or "entity"
+
+
+def report_slugs(entities):
+    """
+    File name stem of each entity's report.
+
+    Entities whose names slugify alike get ``_2``, ``_3``... in sorted
+    order, so no report overwrites another.
+    """
+    slugs, taken = {}, set()
+    for entity in sorted(entities, key=str):
+        base = slug = slugify(entity)
+        suffix = 1
+        while slug in taken:
+            suffix += 1
+            slug = f"{base}_{suffix}"
+        taken.add(slug)
+        slugs[entity] = slug
+    return slugs
+
+
+def _report_context(core, dataset):
+    """Inputs other than the entity's rows that change a report."""
+    if dataset == 'port':
+        return f"{default_registry().digest}:{core.utilization().threshold}"
+    return ""
+
+
+def entity_fingerprints(core, dataset, plotlyjs='inline'):
+    """
+    Fingerprint of each entity's report inputs.
+
+    Row hashes are computed once for the whole frame and summed per
+    entity, so fingerprinting every entity is a single vectorized pass.
+    The report version, the plotly.js mode and, for ports, the registry
+    (names, regions and capacity) and alert threshold are part of every
+    fingerprint.
+    """
+    df = core.frame(dataset)
+    column = ENTITY_COLUMNS[dataset]
+    context = f"{plotlyjs}:{_report_context(core, dataset)}"
+    row_hashes = pd.util.hash_pandas_object(df, index=False).astype('uint64')
+    sums = row_hashes.groupby(df[column].to_numpy()).sum()
+    counts = df.groupby(column).size()
+    fingerprints = {}
+    for entity, total in sums.items():
+        digest = hashlib.sha1(
+            f"{REPORT_VERSION}:{dataset}:{context}:{entity}:{counts[entity]}:{int(total)}".encode()
+        )
+        fingerprints[entity] = digest.hexdigest()
+    return fingerprints
+
+
+def write_plotlyjs(directory):
+    """Write the installed plotly.js next to the reports unless it is already there."""
+    path = Path(directory) / PLOTLYJS_FILE
+    script = get_plotlyjs()
+    if path.exists() and path.stat().st_size == len(script.encode('utf-8')):
+        return path
+    tmp_path = f"{path}.{os.getpid()}.partial"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(script)
+    os.replace(tmp_path, path)
+    return path
+
+
+def _kpi_cards(items):
+    return "".join(
+        f'<div class="kpi"><h3>{html.escape(label)}</h3><p>{html.escape(value)}</p></div>'
+        for label, value in items
+    )
+
+
+def _sections(figures, plotlyjs='inline'):
+    parts = []
+    for i, (heading, fig) in enumerate(figures):
+        # Only the first figure carries (or loads) plotly.js
+        parts.append(f"<h2>{html.escape(heading)}</h2>")
+        include = PLOTLYJS_MODES[plotlyjs] if i == 0 else False
+        parts.append(fig.to_html(full_html=False, include_plotlyjs=include))
+    return "\n".join(parts)
+
+
+def rail_report(core, railroad):
+    """Title, KPI cards and figures for one railroad."""
+    import plotly.express as px
+
+    filters = {'Railroad': [railroad]}
+    kpis = core.rail_kpis(railroads=[railroad])
+    cards = [
+        ("Total Carloads", f"{kpis['total_carloads']:,.0f}"),
+        ("Monthly Average", f"{kpis['avg_monthly']:,.0f}"),
+        ("Peak Month", f"Month {kpis['peak_month']}"),
+        ("Growth Rate", f"{kpis['growth_rate']:.1f}%"),
+    ]
+
+    series, level = core.time_series('rail', filters, group='Commodity')
+    fig_trend = px.line(series, x='Date', y='Carloads', color='Commodity', markers=True,
+                        title=f'{LEVEL_LABELS[level]} Carloads by Commodity')
+
+    df = core.select('rail', filters)
+    seasonal = df.groupby(['Season', 'Commodity'])['Carloads'].sum().reset_index()
+    fig_seasonal = px.bar(seasonal, x='Season', y='Carloads', color='Commodity',
+                          title='Seasonal Carloads by Commodity')
+
+    yearly = core.pyramid('rail', filters).levels['year']
+    fig_yearly = px.bar(x=yearly['Date'].dt.year, y=yearly['Carloads'], title='Carloads per Year',
+                        labels={'x': 'Year', 'y': 'Carloads'})
+
+    figures = [("Trend", fig_trend), ("Seasonality", fig_seasonal), ("Yearly Totals", fig_yearly)]
+    return f"{railroad} Rail Report", cards, figures
+
+
+def port_report(core, port):
+    """Title, KPI cards and figures for one port."""
+    import plotly.express as px
+
+    registry = default_registry()
+    name = registry.display_names([port])[0]
+    filters = {'port_name': [port]}
+    kpis = core.port_kpis(ports=[port])
+    cards = [
+        ("Total TEU", f"{kpis['total_teu']:,.0f}"),
+        ("Monthly Average", f"{kpis['avg_monthly']:,.0f}"),
+        ("Region", str(registry.field([port], 'region')[0])),
+        ("Coast", str(registry.field([port], 'coast')[0])),
+    ]
+
+    series, level = core.time_series('port', filters)
+    fig_trend = px.line(series, x='port', y='TEU_values', markers=True,
+                        title=f'{LEVEL_LABELS[level]} Container Throughput',
+                        labels={'port': 'Date', 'TEU_values': 'TEU'})
+
+    df = core.select('port', filters)
+    seasonal = df.groupby(['year', 'season'])['TEU_values'].sum().reset_index()
+    fig_seasonal = px.bar(seasonal, x='year', y='TEU_values', color='season', barmode='group',
+                          title='Seasonal TEU per Year', labels={'TEU_values': 'TEU'})
+
+    figures = [("Throughput", fig_trend), ("Seasonality", fig_seasonal)]
+
+    utilization = core.utilization().frame()
+    utilization = utilization[(utilization['port_name'] == port)].dropna(subset=['utilization'])
+    if not utilization.empty:
+        fig_util = px.line(utilization, x='port', y='utilization', markers=True,
+                           title='Rolling 12-Month Capacity Utilization',
+                           labels={'port': 'Month', 'utilization': 'Utilization (%)'})
+        fig_util.add_hline(y=core.utilization().threshold, line_dash="dash", line_color="red")
+        figures.append(("Capacity", fig_util))
+    return f"Port of {name} Report", cards, figures
+
+
+REPORT_BUILDERS = {'rail': rail_report, 'port': port_report}
+
+
+def render_report(core, dataset, entity, path, plotlyjs='inline'):
+    """
+    Write the HTML report for one entity to ``path``.
+
+    With ``plotlyjs='directory'`` the caller writes ``plotly.min.js``
+    next to the report (see ``write_plotlyjs``).
+    """
+    title, cards, figures = REPORT_BUILDERS[dataset](core, entity)
+    page = _PAGE.format(
+        title=html.escape(title),
+        kpis=_kpi_cards(cards),
+        sections=_sections(figures, plotlyjs),
+        generated=datetime.now().strftime('%Y-%m-%d %H:%M'),
+    )
+    tmp_path = f"{path}.partial"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(page)
+    os.replace(tmp_path, path)
+    return str(path)
+
+
+_worker_core = None
+
+
+def _init_worker(data_dir, cache_dir, use_cache):
+    global _worker_core
+    # With fork the parent's loaded frames are inherited and this is a lookup
+    _worker_core = get_core(data_dir, cache_dir, use_cache)
+
+
+def _render_task(task):
+    dataset, entity, path, plotlyjs = task
+    return dataset, entity, render_report(_worker_core, dataset, entity, path, plotlyjs)
+
+
+def generate_reports(output_dir, datasets=('rail', 'port'), data_dir=None, cache_dir=None,
+                     use_cache=True, workers=None, force=False, entities=None, allow_fork=False,
+                     plotlyjs='inline'):
+    """
+    Render reports for every railroad and/or port.
+
+    Args:
+        output_dir (str or Path): Directory for the reports and manifest.
+        datasets (iterable): ``'rail'`` and/or ``'port'``.
+        data_dir (str, optional): Data directory; see ``get_core``.
+        cache_dir (str, optional): Columnar cache directory.
+        use_cache (bool): Set False to bypass the columnar cache.
+        workers (int, optional): Pool size. Defaults to the CPU count;
+            ``1`` renders in this process.
+        force (bool): Render even when the inputs are unchanged.
+        entities (iterable, optional): Only these railroads/ports.
+        allow_fork (bool): Let workers inherit the loaded data by forking
+            when this process is single-threaded; set by the CLI.
+        plotlyjs (str): ``'inline'`` embeds plotly.js in every report
+            (self-contained, the default), ``'cdn'`` loads it from the
+            Plotly CDN and ``'directory'`` shares one ``plotly.min.js``
+            per dataset directory.
+
+    Returns:
+        dict: ``rendered`` and ``skipped`` lists of (dataset, entity).
+    """
+    if plotlyjs not in PLOTLYJS_MODES:
+        raise ValueError(f"Unknown plotlyjs mode {plotlyjs!r}; expected one of {', '.join(PLOTLYJS_MODES)}")
+    output_dir = Path(output_dir)
+    core = get_core(data_dir, cache_dir, use_cache)
+    manifest_path = output_dir / MANIFEST_FILE
+    try:
+        manifest = json.loads(manifest_path.read_text())
+    except (OSError, ValueError):
+        manifest = {}
+
+    tasks, skipped, entries = [], [], {}
+    for dataset in datasets:
+        (output_dir / dataset).mkdir(parents=True, exist_ok=True)
+        if plotlyjs == 'directory':
+            write_plotlyjs(output_dir / dataset)
+        fingerprints = entity_fingerprints(core, dataset, plotlyjs)
+        slugs = report_slugs(fingerprints)
+        for entity, fingerprint in fingerprints.items():
+            if entities is not None and entity not in entities:
+                continue
+            key = f"{dataset}/{entity}"
+            entry = {'fingerprint': fingerprint, 'file': f"{dataset}/{slugs[entity]}.html"}
+            entries[key] = entry
+            if not force and manifest.get(key) == entry and (output_dir / entry['file']).exists():
+                skipped.append((dataset, entity))
+                continue
+            tasks.append((dataset, entity, str(output_dir / entry['file']), plotlyjs))
+        # Warm shared aggregates before the pool starts so forked workers inherit them
+        if dataset == 'port':
+            core.utilization()
+
+    rendered = []
+    if tasks:
+        workers = workers or os.cpu_count() or 1
+        if workers == 1 or len(tasks) == 1:
+            _init_worker(data_dir, cache_dir, use_cache)
+            results = map(_render_task, tasks)
+        else:
+            pool = ProcessPoolExecutor(
+                max_workers=min(workers, len(tasks)), mp_context=pool_context(allow_fork),
+                initializer=_init_worker, initargs=(data_dir, cache_dir, use_cache)
+            )
+            with pool:
+                results = list(pool.map(_render_task, tasks))
+        for dataset, entity, _ in results:
+            rendered.append((dataset, entity))
+            manifest[f"{dataset}/{entity}"] = entries[f"{dataset}/{entity}"]
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path.write_text(json.dumps(manifest, indent=2, sort_keys=True))
+    _write_index(output_dir, manifest)
+    return {'rendered': rendered, 'skipped': skipped}
+
+
+def _write_index(output_dir, manifest):
+    links = {}
+    for key in sorted(manifest):
+        dataset, entity = key.split('/', 1)
+        entry = manifest[key]
+        if isinstance(entry, dict) and (output_dir / entry['file']).exists():
+            links.setdefault(dataset, []).append(
+                f'<li><a href="{html.escape(entry["file"])}">{html.escape(entity)}</a></li>'
+            )
+    headings = {'rail': "Railroads", 'port': "Ports"}
+    body = "".join(
+        f"<h2>{headings[dataset]}</h2><ul>{''.join(items)}</ul>" for dataset, items in links.items()
+    )
+    (output_dir / "index.html").write_text(
+        f"<!DOCTYPE html><html><head><meta charset=\"utf-8\"><title>Freight Reports</title></head>"
+        f"<body><h1>Freight Reports</h1>{body}</body></html>",
+        encoding='utf-8'
+    )
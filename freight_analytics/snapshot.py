@@ -0,0 +1,139 @@
+"""
+Warm-start snapshots of the shared compute core.
+
+A snapshot holds the preprocessed frames and the derived results built
+by ``FreightCore.warm()`` (row indexes, filter options, time pyramids,
+KPIs, the utilization engine) for the data revisions on disk when it
+was taken. Restoring it is a single unpickle, so a fresh process serves
+its first page view without parsing or aggregating anything.
+
+A snapshot is only used when its format version and the package,
+Python, pandas and numpy versions match the running process, and each
+dataset is only restored while its source file is unchanged. Snapshots
+are pickles: only load files you built yourself.
+"""
+
+import logging
+import os
+import pickle
+import platform
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .store import default_cache_dir
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_VERSION = 2
+SNAPSHOT_FILE = "snapshot.pkl"
+
+
+def default_snapshot_path():
+    """Snapshot file from ``FREIGHT_SNAPSHOT`` or the columnar cache directory."""
+    env_path = os.environ.get("FREIGHT_SNAPSHOT")
+    if env_path:
+        return Path(env_path)
+    return default_cache_dir() / SNAPSHOT_FILE
+
+
+def runtime_versions():
+    """Versions a snapshot must have been written with to be loaded."""
+    from . import __version__
+
+    return {
+        'snapshot_version': SNAPSHOT_VERSION,
+        'package': __version__,
+        'python': ".".join(platform.python_version_tuple()[:2]),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+    }
+
+
+def available_datasets(core, datasets=('rail', 'port')):
+    """
+    Split ``datasets`` by whether their source can be found.
+
+    Returns:
+        tuple: ``(available, missing)``, a tuple of dataset names and a
+        dict of dataset name to the reason it is missing.
+    """
+    available, missing = [], {}
+    for dataset in datasets:
+        try:
+            core.source_path(dataset)
+            available.append(dataset)
+        except FileNotFoundError as e:
+            missing[dataset] = str(e)
+    return tuple(available), missing
+
+
+def save_snapshot(core, path=None, datasets=('rail', 'port')):
+    """
+    Warm ``core`` and write its state to a snapshot file.
+
+    The file starts with a small header (versions and data revisions)
+    followed by the state, and is replaced atomically. Datasets whose
+    source file is missing are left out.
+
+    Returns:
+        dict: The header written.
+    """
+    path = Path(path) if path is not None else default_snapshot_path()
+    datasets, missing = available_datasets(core, datasets)
+    for dataset, reason in missing.items():
+        logger.warning("Leaving %s out of the snapshot: %s", dataset, reason)
+    if not datasets:
+        raise FileNotFoundError("No dataset found to snapshot")
+    state = core.warm(datasets).state(datasets)
+    header = {**runtime_versions(), 'created': time.time(), 'versions': state['versions']}
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".partial")
+    with open(tmp_path, 'wb') as f:
+        pickle.dump(header, f, protocol=pickle.HIGHEST_PROTOCOL)
+        pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+    return header
+
+
+def load_snapshot(core, path=None):
+    """
+    Restore a snapshot into the process-wide core state.
+
+    Unusable snapshots (missing, other versions, data changed since)
+    are skipped with a log message; the core then loads as usual.
+
+    Returns:
+        list: The datasets restored from the snapshot.
+    """
+    path = Path(path) if path is not None else default_snapshot_path()
+    try:
+        with open(path, 'rb') as f:
+            header = pickle.load(f)
+            expected = runtime_versions()
+            found = {key: header.get(key) for key in expected}
+            if found != expected:
+                logger.info("Ignoring snapshot %s built for %s", path, found)
+                return []
+            if not any(_is_current(core, dataset, version) for dataset, version in header['versions'].items()):
+                logger.info("Ignoring snapshot %s: data changed since it was built", path)
+                return []
+            state = pickle.load(f)
+    except FileNotFoundError:
+        return []
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError, KeyError) as e:
+        logger.warning("Could not read snapshot %s: %s", path, e)
+        return []
+    restored = core.restore(state)
+    logger.info("Restored %s from snapshot %s", ", ".join(restored) or "nothing", path)
+    return restored
+
+
+def _is_current(core, dataset, version):
+    try:
+        return core.version(dataset) == version
+    except FileNotFoundError:
+        return False
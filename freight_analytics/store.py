@@ -0,0 +1,274 @@
+"""On-disk columnar cache for preprocessed freight datasets."""
+
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .dates import from_epoch_days, to_epoch_days
+from .ingest import load_port_frame, load_rail_frame, source_files
+from .validation import validate_frame, validation_key
+
+logger = logging.getLogger(__name__)
+
+STORE_VERSION = 2
+
+DATASET_LOADERS = {
+    'rail': load_rail_frame,
+    'port': load_port_frame,
+}
+
+
+def default_cache_dir():
+    """Cache directory from ``FREIGHT_CACHE_DIR`` or ``~/.cache/freight_analytics``."""
+    env_dir = os.environ.get("FREIGHT_CACHE_DIR")
+    if env_dir:
+        return Path(env_dir)
+    return Path.home() / ".cache" / "freight_analytics"
+
+
+def source_fingerprint(path):
+    """
+    Identify a source revision by resolved path, size and mtime.
+
+    For a directory or glob source the size is the total of its files,
+    the mtime the latest of theirs (and of the directory, which changes
+    when files are added, removed or renamed), and ``files`` lists each
+    file's name, size and mtime.
+    """
+    files = source_files(path)
+    path = Path(path).resolve()
+    if len(files) == 1 and files[0].resolve() == path:
+        stat = path.stat()
+        return {
+            'path': str(path),
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+        }
+    stats = [(str(f.resolve()), f.stat()) for f in files]
+    mtimes = [stat.st_mtime_ns for _, stat in stats]
+    if path.is_dir():
+        mtimes.append(path.stat().st_mtime_ns)
+    return {
+        'path': str(path),
+        'size': sum(stat.st_size for _, stat in stats),
+        'mtime_ns': max(mtimes),
+        'files': [[name, stat.st_size, stat.st_mtime_ns] for name, stat in stats],
+    }
+
+
+def encode_frame(df):
+    """
+    Split a DataFrame into typed numpy columns.
+
+    Dates are stored as int64 days since the epoch, string columns as
+    integer codes plus their distinct values, numeric columns unchanged.
+
+    Returns:
+        tuple: ``(arrays, columns)`` where ``arrays`` maps npz keys to
+        numpy arrays and ``columns`` describes how to decode each column.
+    """
+    arrays = {}
+    columns = []
+    for i, name in enumerate(df.columns):
+        series = df[name]
+        key = f"c{i}"
+        if pd.api.types.is_datetime64_any_dtype(series.dtype):
+            values = series.to_numpy(dtype='datetime64[ns]')
+            if (values[~np.isnat(values)].astype('datetime64[D]') != values[~np.isnat(values)]).any():
+                raise ValueError(f"Column {name!r} has time-of-day values")
+            arrays[key] = to_epoch_days(values)
+            kind = 'date'
+        elif pd.api.types.is_numeric_dtype(series.dtype) or pd.api.types.is_bool_dtype(series.dtype):
+            arrays[key] = series.to_numpy()
+            kind = 'numeric'
+        else:
+            codes, uniques = pd.factorize(series.to_numpy(dtype=object))
+            if not all(isinstance(u, str) for u in uniques):
+                raise ValueError(f"Column {name!r} is not numeric, date or string")
+            arrays[key] = codes.astype(np.int32)
+            arrays[key + "_values"] = np.array(list(uniques), dtype=str)
+            kind = 'string'
+        columns.append({'name': name, 'key': key, 'kind': kind})
+    return arrays, columns
+
+
+def decode_frame(arrays, columns):
+    """Rebuild the DataFrame written by ``encode_frame`` without any parsing."""
+    data = {}
+    for column in columns:
+        key = column['key']
+        if column['kind'] == 'date':
+            data[column['name']] = from_epoch_days(arrays[key])
+        elif column['kind'] == 'string':
+            codes = arrays[key]
+            values = arrays[key + "_values"].astype(object)
+            decoded = values.take(codes) if len(values) else np.full(len(codes), None, dtype=object)
+            if (codes < 0).any():
+                decoded[codes < 0] = None
+            data[column['name']] = decoded
+        else:
+            data[column['name']] = arrays[key]
+    return pd.DataFrame(data)
+
+
+class ColumnarCache:
+    """
+    Columnar cache of preprocessed datasets keyed by source file revision.
+
+    Each entry is an ``.npz`` file of typed columns plus a JSON manifest
+    recording the source fingerprint and column layout. A load whose
+    source size and mtime match the manifest decodes the columns directly
+    and skips CSV/JSON parsing, date parsing and derived columns.
+    """
+
+    def __init__(self, cache_dir=None):
+        """
+        Args:
+            cache_dir (str or Path, optional): Directory for cache entries.
+                Defaults to ``default_cache_dir()``.
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else default_cache_dir()
+
+    def _entry_paths(self, dataset, source):
+        digest = hashlib.sha1(str(Path(source).resolve()).encode("utf-8")).hexdigest()[:16]
+        stem = f"{dataset}-{digest}"
+        return self.cache_dir / f"{stem}.npz", self.cache_dir / f"{stem}.json"
+
+    def read_manifest(self, dataset, source):
+        """Return the manifest for a cached dataset, or None if absent."""
+        _, manifest_path = self._entry_paths(dataset, source)
+        try:
+            with open(manifest_path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _current(self, dataset, source):
+        """Manifest of an entry matching the source and validation rules, else None."""
+        manifest = self.read_manifest(dataset, source)
+        if manifest is None or manifest.get('store_version') != STORE_VERSION:
+            return None
+        if manifest.get('source') != source_fingerprint(source):
+            return None
+        if manifest.get('validation_key') != validation_key(dataset):
+            return None
+        return manifest
+
+    def validation(self, dataset, source):
+        """Validation report of the current source revision, or None if not cached."""
+        manifest = self._current(dataset, source)
+        return manifest.get('validation') if manifest else None
+
+    def get(self, dataset, source):
+        """
+        Return the cached frame if it matches the current source, else None.
+
+        An entry validated under other rules or another port registry is
+        treated as missing, so the source is parsed and checked again.
+        """
+        data_path, _ = self._entry_paths(dataset, source)
+        manifest = self._current(dataset, source)
+        if manifest is None:
+            return None
+        try:
+            with np.load(data_path, allow_pickle=False) as arrays:
+                return decode_frame(arrays, manifest['columns'])
+        except (OSError, KeyError, ValueError):
+            return None
+
+    def put(self, dataset, source, df, extra=None):
+        """
+        Write a frame to the cache.
+
+        Failures (read-only filesystem, unsupported column types) are
+        swallowed: the cache is an optimisation, never a requirement.
+
+        Returns:
+            dict or None: The manifest written, or None when skipped.
+        """
+        data_path, manifest_path = self._entry_paths(dataset, source)
+        try:
+            arrays, columns = encode_frame(df)
+            manifest = {
+                'store_version': STORE_VERSION,
+                'dataset': dataset,
+                'source': source_fingerprint(source),
+                'validation_key': validation_key(dataset),
+                'rows': len(df),
+                'columns': columns,
+            }
+            if extra:
+                manifest.update(extra)
+
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_data = data_path.with_suffix(".tmp.npz")
+            np.savez(tmp_data, **arrays)
+            os.replace(tmp_data, data_path)
+            tmp_manifest = manifest_path.with_suffix(".tmp")
+            with open(tmp_manifest, 'w') as f:
+                json.dump(manifest, f, indent=2)
+            os.replace(tmp_manifest, manifest_path)
+            return manifest
+        except (OSError, ValueError):
+            return None
+
+
+def parse_dataset(dataset, source):
+    """
+    Parse a source file and validate the result.
+
+    Failed checks are logged; see ``validation.validate_frame``.
+
+    Returns:
+        tuple: ``(frame, report)``.
+    """
+    df = DATASET_LOADERS[dataset](source)
+    report = validate_frame(dataset, df)
+    for name, result in report['checks'].items():
+        if not result['passed']:
+            logger.warning("%s data check %r failed for %d item(s) in %s: %s", dataset, name,
+                           result['count'], source, "; ".join(result['examples']))
+    return df, report
+
+
+def load_dataset(dataset, source, cache=None):
+    """
+    Load a dataset through the columnar cache.
+
+    Cold loads parse and validate the source and record the validation
+    report in the cache manifest; warm loads only decode the columns.
+    Data failing the schema or dtype checks is logged as an error and
+    returned but not cached, so it is parsed and reported again on every
+    load until the source is fixed.
+
+    Args:
+        dataset (str): ``'rail'`` or ``'port'``.
+        source (str or Path): Source CSV/JSON file, directory of part
+            files or glob pattern.
+        cache (ColumnarCache, optional): Cache to use; pass ``False`` to
+            bypass caching. Defaults to a cache in ``default_cache_dir()``.
+
+    Returns:
+        pandas.DataFrame: The preprocessed dataset.
+    """
+    if dataset not in DATASET_LOADERS:
+        raise ValueError("Dataset must be 'rail' or 'port'")
+    if cache is False:
+        return parse_dataset(dataset, source)[0]
+
+    cache = cache or ColumnarCache()
+    df = cache.get(dataset, source)
+    if df is None:
+        df, report = parse_dataset(dataset, source)
+        if report['valid']:
+            cache.put(dataset, source, df, extra={'validation': report})
+        else:
+            failed = [name for name, result in report['checks'].items() if not result['passed']]
+            logger.error("%s data in %s failed validation (%s); not caching it", dataset, source,
+                         ", ".join(failed))
+    return df
@@ -0,0 +1,132 @@
+"""
+Single-pass summary statistics.
+
+``GroupSummary`` computes, for every group of a table at once, the row
+count, sum, mean, standard deviation, minimum and maximum of the value
+column, the date range and the distinct values of other columns. Rows
+are visited once, in cache-sized chunks: each chunk's per-group count,
+mean and sum of squared deviations are merged into the running totals
+with Chan's parallel form of Welford's update, which keeps the variance
+numerically stable without a second pass over the data.
+"""
+
+import numpy as np
+import pandas as pd
+
+SUMMARY_CHUNK_ROWS = 65536
+ALL_ROWS = 'All'
+
+_NAT = np.iinfo(np.int64).min
+_MAX_INT = np.iinfo(np.int64).max
+
+
+class GroupSummary:
+    """
+    Per-group statistics of a value column, built in one pass.
+
+    ``table`` has one row per group (or a single ``'All'`` row without a
+    group column) with ``rows``, ``count`` (non-null values), ``sum``,
+    ``mean``, ``std`` (sample), ``min``, ``max``, ``start`` and ``end``,
+    plus ``distinct_<column>`` counts. ``values`` maps each distinct
+    column to its sorted values over all rows.
+    """
+
+    def __init__(self, df, value_column, date_column, group_column=None, distinct_columns=(),
+                 chunk_rows=SUMMARY_CHUNK_ROWS):
+        """
+        Args:
+            df (pandas.DataFrame): Rows to summarize.
+            value_column (str): Numeric column to describe.
+            date_column (str): Datetime column for the date range.
+            group_column (str, optional): Column to split the statistics by.
+            distinct_columns (iterable): Columns whose distinct values are
+                counted per group and listed overall.
+            chunk_rows (int): Rows per chunk.
+        """
+        if group_column:
+            codes, groups = pd.factorize(df[group_column], sort=True)
+            groups = pd.Index(groups, name=group_column)
+        else:
+            codes = np.zeros(len(df), dtype=np.int64)
+            groups = pd.Index([ALL_ROWS])
+        n = len(groups)
+
+        values = df[value_column].to_numpy(dtype=np.float64)
+        dates = df[date_column].to_numpy(dtype='datetime64[ns]').view(np.int64)
+        distinct = {}
+        for column in distinct_columns:
+            column_codes, uniques = pd.factorize(df[column], sort=True)
+            distinct[column] = (column_codes, uniques, np.zeros((n, len(uniques)), dtype=bool))
+
+        rows = np.zeros(n, dtype=np.int64)
+        count = np.zeros(n, dtype=np.int64)
+        total = np.zeros(n)
+        mean = np.zeros(n)
+        m2 = np.zeros(n)
+        low = np.full(n, np.inf)
+        high = np.full(n, -np.inf)
+        first = np.full(n, _MAX_INT, dtype=np.int64)
+        last = np.full(n, _NAT, dtype=np.int64)
+
+        for start in range(0, len(df), chunk_rows):
+            chunk = slice(start, start + chunk_rows)
+            g_all = codes[chunk]
+            grouped = g_all >= 0
+            g_all = g_all[grouped]
+            rows += np.bincount(g_all, minlength=n)
+
+            chunk_dates = dates[chunk][grouped]
+            dated = chunk_dates != _NAT
+            np.minimum.at(first, g_all[dated], chunk_dates[dated])
+            np.maximum.at(last, g_all[dated], chunk_dates[dated])
+
+            for column_codes, _, present in distinct.values():
+                c = column_codes[chunk][grouped]
+                seen = c >= 0
+                present[g_all[seen], c[seen]] = True
+
+            x = values[chunk][grouped]
+            valid = ~np.isnan(x)
+            g, x = g_all[valid], x[valid]
+            chunk_count = np.bincount(g, minlength=n)
+            chunk_sum = np.bincount(g, weights=x, minlength=n)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                chunk_mean = np.where(chunk_count > 0, chunk_sum / chunk_count, 0.0)
+            deviation = x - chunk_mean[g]
+            chunk_m2 = np.bincount(g, weights=deviation * deviation, minlength=n)
+
+            # Chan et al.: merge (count, mean, M2) of the chunk into the totals
+            merged = count + chunk_count
+            delta = chunk_mean - mean
+            with np.errstate(divide='ignore', invalid='ignore'):
+                mean = np.where(merged > 0, mean + delta * chunk_count / merged, 0.0)
+                m2 = m2 + chunk_m2 + np.where(merged > 0, delta * delta * count * chunk_count / merged, 0.0)
+            count = merged
+            total += chunk_sum
+            np.minimum.at(low, g, x)
+            np.maximum.at(high, g, x)
+
+        has_values = count > 0
+        with np.errstate(divide='ignore', invalid='ignore'):
+            std = np.where(count > 1, np.sqrt(m2 / (count - 1)), np.nan)
+        if np.issubdtype(df[value_column].dtype, np.integer):
+            total = np.rint(total).astype(np.int64)
+        table = pd.DataFrame({
+            'rows': rows,
+            'count': count,
+            'sum': total,
+            'mean': np.where(has_values, mean, np.nan),
+            'std': std,
+            'min': np.where(has_values, low, np.nan),
+            'max': np.where(has_values, high, np.nan),
+            'start': pd.to_datetime(np.where(rows > 0, first, _NAT).view('datetime64[ns]')),
+            'end': pd.to_datetime(np.where(rows > 0, last, _NAT).view('datetime64[ns]')),
+        }, index=groups)
+        for column, (_, uniques, present) in distinct.items():
+            table[f'distinct_{column}'] = present.sum(axis=1)
+
+        self.table = table
+        self.values = {
+            column: pd.Index(uniques)[present.any(axis=0)].tolist()
+            for column, (_, uniques, present) in distinct.items()
+        }
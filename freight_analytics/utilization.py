@@ -0,0 +1,244 @@
+"""
+Rolling port capacity utilization.
+
+``UtilizationEngine`` keeps, for every port at once, the TEU of the last
+12 months in a ring buffer. Each new month replaces one slot, so the
+rolling total, the utilization against the capacity in effect for that
+month's year and the alert streaks are updated in constant work per
+port without rescanning earlier months.
+
+A port is in alert once its utilization has stayed above ``threshold``
+percent for ``consecutive`` months in a row.
+"""
+
+import copy
+
+import numpy as np
+import pandas as pd
+
+WINDOW_MONTHS = 12
+DEFAULT_THRESHOLD = 80.0
+DEFAULT_CONSECUTIVE = 3
+# Relative tolerance of covers() when comparing TEU totals
+COVERS_RTOL = 1e-10
+
+
+def month_number(dates):
+    """Months since 1970-01 for datetime values."""
+    return np.asarray(dates, dtype='datetime64[ns]').astype('datetime64[M]').astype(np.int64)
+
+
+def month_start(numbers):
+    """Inverse of ``month_number``: month start timestamps."""
+    return np.asarray(numbers, dtype=np.int64).astype('datetime64[M]').astype('datetime64[ns]')
+
+
+class UtilizationEngine:
+    """
+    Incremental rolling 12-month utilization and alert state per port.
+
+    Feed months in increasing order with ``update()`` (one month) or
+    ``extend()`` (a port frame; only months after ``last_month`` are
+    used). Months skipped between updates count as unobserved.
+    """
+
+    def __init__(self, registry, threshold=DEFAULT_THRESHOLD, consecutive=DEFAULT_CONSECUTIVE):
+        """
+        Args:
+            registry (PortRegistry): Source of capacity by port and year.
+            threshold (float): Utilization percentage that counts as high.
+            consecutive (int): High months in a row that raise an alert.
+        """
+        self.registry = registry
+        self.threshold = threshold
+        self.consecutive = consecutive
+        self.ports = pd.Index([], dtype=object)
+        self.last_month = None
+        self.rows_seen = 0
+        self.teu_seen = 0.0
+        self.teu_by_port = np.zeros(0)
+
+        self._window = np.zeros((0, WINDOW_MONTHS))
+        self._observed = np.zeros((0, WINDOW_MONTHS), dtype=bool)
+        self.rolling_teu = np.zeros(0)
+        self.streak = np.zeros(0, dtype=np.int64)
+        self.alerting = np.zeros(0, dtype=bool)
+        # One array per processed month, aligned with self.ports at the time
+        self._history = []
+
+    def copy(self):
+        """Independent copy, e.g. to extend a shared engine."""
+        return copy.deepcopy(self)
+
+    def _add_ports(self, ports):
+        new = pd.Index(ports).difference(self.ports)
+        if not len(new):
+            return
+        n = len(new)
+        self.ports = self.ports.append(new)
+        self._window = np.vstack([self._window, np.zeros((n, WINDOW_MONTHS))])
+        self._observed = np.vstack([self._observed, np.zeros((n, WINDOW_MONTHS), dtype=bool)])
+        self.rolling_teu = np.concatenate([self.rolling_teu, np.zeros(n)])
+        self.teu_by_port = np.concatenate([self.teu_by_port, np.zeros(n)])
+        self.streak = np.concatenate([self.streak, np.zeros(n, dtype=np.int64)])
+        self.alerting = np.concatenate([self.alerting, np.zeros(n, dtype=bool)])
+
+    def _advance(self, month, teu):
+        """Move the window to ``month`` with ``teu`` aligned to self.ports."""
+        slot = month % WINDOW_MONTHS
+        observed = ~np.isnan(teu)
+        values = np.where(observed, teu, 0.0)
+        self.rolling_teu += values - self._window[:, slot]
+        self._window[:, slot] = values
+        self._observed[:, slot] = observed
+
+        year = int(month_start([month])[0].astype('datetime64[Y]').astype(np.int64)) + 1970
+        capacity = self.registry.capacity(self.ports, np.full(len(self.ports), year))
+        complete = self._observed.all(axis=1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            utilization = np.where(complete, self.rolling_teu / capacity * 100, np.nan)
+
+        high = utilization > self.threshold
+        self.streak = np.where(high, self.streak + 1, 0)
+        self.alerting = self.streak >= self.consecutive
+        self._history.append((month, utilization, self.rolling_teu.copy(), capacity))
+        self.last_month = month
+
+    def update(self, month, ports, teu):
+        """
+        Add one month of TEU values.
+
+        Args:
+            month (int or datetime-like): Month number (see
+                ``month_number``) or any date in the month.
+            ports (sequence): Port codes; a port listed more than once in
+                the month gets the sum of its values.
+            teu (sequence): TEU for each port in that month.
+
+        Returns:
+            dict: ``month``, the ports whose alert was ``raised`` or
+            ``cleared`` by this month and the month's ``utilization``
+            per port.
+        """
+        if not isinstance(month, (int, np.integer)):
+            month = int(month_number([pd.Timestamp(month)])[0])
+        if self.last_month is not None and month <= self.last_month:
+            raise ValueError("Months must be added in increasing order")
+        self._add_ports(ports)
+        positions = self.ports.get_indexer(pd.Index(ports))
+        teu = np.asarray(teu, dtype=np.float64)
+
+        previous = self.alerting.copy()
+
+        # Skipped months clear their slots and break streaks
+        if self.last_month is not None:
+            gap = np.full(len(self.ports), np.nan)
+            for skipped in range(self.last_month + 1, min(month, self.last_month + WINDOW_MONTHS + 1)):
+                self._advance(skipped, gap)
+
+        # Accumulate rather than assign so repeated rows for a port add up
+        present = ~np.isnan(teu)
+        current = np.zeros(len(self.ports))
+        np.add.at(current, positions[present], teu[present])
+        current[np.bincount(positions[present], minlength=len(self.ports)) == 0] = np.nan
+        np.add.at(self.teu_by_port, positions[present], teu[present])
+        self.rows_seen += len(teu)
+        self.teu_seen += float(np.nansum(teu))
+        self._advance(month, current)
+        return {
+            'month': pd.Timestamp(month_start([month])[0]),
+            'raised': self.ports[self.alerting & ~previous].tolist(),
+            'cleared': self.ports[previous & ~self.alerting].tolist(),
+            'utilization': pd.Series(self._history[-1][1], index=self.ports),
+        }
+
+    def extend(self, df, date_column='port', port_column='port_name', value_column='TEU_values'):
+        """
+        Add every month of a long port frame after ``last_month``.
+
+        Returns:
+            list: The per-month results of ``update()``.
+        """
+        months = month_number(df[date_column].to_numpy())
+        new = months > self.last_month if self.last_month is not None else np.ones(len(df), dtype=bool)
+        months = months[new]
+        if not len(months):
+            return []
+        ports = df[port_column].to_numpy()[new]
+        teu = df[value_column].to_numpy(dtype=np.float64)[new]
+
+        # Sort once and split into per-month runs
+        order = np.argsort(months, kind='mergesort')
+        months, ports, teu = months[order], ports[order], teu[order]
+        boundaries = np.flatnonzero(np.diff(months)) + 1
+        results = []
+        for start, end in zip(np.r_[0, boundaries], np.r_[boundaries, len(months)]):
+            results.append(self.update(int(months[start]), ports[start:end], teu[start:end]))
+        return results
+
+    def covers(self, df, date_column='port', port_column='port_name', value_column='TEU_values'):
+        """
+        Whether ``df`` agrees with the months already processed.
+
+        Checks the row count, TEU total and TEU total per port up to
+        ``last_month``, so an engine can be extended with a newer revision
+        of the same data instead of being rebuilt.
+        """
+        if self.last_month is None:
+            return True
+        seen = month_number(df[date_column].to_numpy()) <= self.last_month
+        teu = df[value_column].to_numpy(dtype=np.float64)[seen]
+        # Tolerate only summation-order rounding; a changed value of 1 TEU must count
+        if int(seen.sum()) != self.rows_seen or not np.isclose(float(np.nansum(teu)), self.teu_seen,
+                                                                rtol=COVERS_RTOL, atol=0):
+            return False
+        codes = self.ports.get_indexer(pd.Index(df[port_column].to_numpy()[seen]))
+        if (codes < 0).any():
+            return False
+        by_port = np.bincount(codes, weights=np.nan_to_num(teu), minlength=len(self.ports))
+        return bool(np.allclose(by_port, self.teu_by_port, rtol=COVERS_RTOL, atol=0))
+
+    def alerts(self):
+        """
+        Current alert state per port.
+
+        Returns:
+            pandas.DataFrame: ``port_name``, ``utilization`` (latest
+            month), ``streak`` and ``alerting``.
+        """
+        latest = self._history[-1][1] if self._history else np.full(len(self.ports), np.nan)
+        latest = np.concatenate([latest, np.full(len(self.ports) - len(latest), np.nan)])
+        return pd.DataFrame({
+            'port_name': self.ports.to_numpy(),
+            'utilization': latest,
+            'streak': self.streak,
+            'alerting': self.alerting,
+        })
+
+    def frame(self):
+        """
+        Utilization history in long format.
+
+        Returns:
+            pandas.DataFrame: ``port`` (month start), ``port_name``,
+            ``rolling_teu``, ``capacity`` and ``utilization`` rows for every
+            processed month and port.
+        """
+        n_ports = len(self.ports)
+        if not self._history:
+            return pd.DataFrame(columns=['port', 'port_name', 'rolling_teu', 'capacity', 'utilization'])
+
+        def padded(index):
+            return np.vstack([
+                np.concatenate([entry[index], np.full(n_ports - len(entry[index]), np.nan)])
+                for entry in self._history
+            ])
+
+        months = np.array([entry[0] for entry in self._history])
+        return pd.DataFrame({
+            'port': np.repeat(month_start(months), n_ports),
+            'port_name': np.tile(self.ports.to_numpy(), len(months)),
+            'rolling_teu': padded(2).ravel(),
+            'capacity': padded(3).ravel(),
+            'utilization': padded(1).ravel(),
+        })
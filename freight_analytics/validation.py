@@ -0,0 +1,202 @@
+"""
+Data validation for freshly parsed datasets.
+
+``validate_frame`` runs vectorized checks over a parsed frame: schema,
+column dtypes, missing values, duplicate keys, negative values, gaps in
+each series' dates and, for port data, ports missing from the registry.
+It runs once per source revision, when the columnar cache entry is
+built, and the report is stored in the entry's manifest; warm loads
+decode the cached columns and neither parse, coerce nor validate again.
+The manifest also records ``validation_key``, the rules version and the
+port registry the checks ran against, and an entry whose key differs
+from the current one is rebuilt and revalidated.
+
+Schema and dtype failures make a report invalid, and invalid data is
+never cached. The other checks are warnings: the data still loads, and
+the report says where to look.
+"""
+
+import numpy as np
+import pandas as pd
+
+from .ports import default_registry
+
+VALIDATION_VERSION = 1
+MAX_EXAMPLES = 5
+
+# Expected columns and their kind after parsing
+SCHEMAS = {
+    'rail': {
+        'Date': 'date', 'Year': 'integer', 'Month': 'integer', 'Railroad': 'string',
+        'Commodity': 'string', 'Carloads': 'numeric', 'Season': 'string',
+    },
+    'port': {
+        'port': 'date', 'port_name': 'string', 'TEU_values': 'numeric', 'month_num': 'integer',
+        'month': 'string', 'year': 'integer', 'season': 'string',
+    },
+}
+
+# Columns identifying one observation; the date column comes first
+KEY_COLUMNS = {
+    'rail': ('Date', 'Railroad', 'Commodity'),
+    'port': ('port', 'port_name'),
+}
+
+VALUE_COLUMNS = {'rail': 'Carloads', 'port': 'TEU_values'}
+
+# Expected spacing of each series' dates
+DATE_CADENCE = {'rail': 'week', 'port': 'month'}
+
+ERROR_CHECKS = ('schema', 'dtypes')
+
+_KIND_TESTS = {
+    'date': pd.api.types.is_datetime64_any_dtype,
+    'integer': pd.api.types.is_integer_dtype,
+    'numeric': lambda dtype: pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype),
+    'string': lambda dtype: pd.api.types.is_string_dtype(dtype) or pd.api.types.is_object_dtype(dtype),
+}
+
+
+def _result(count, examples=()):
+    return {'passed': not count, 'count': int(count), 'examples': [str(e) for e in list(examples)[:MAX_EXAMPLES]]}
+
+
+def _label(df, columns, positions):
+    parts = [df[column].to_numpy()[positions] for column in columns]
+    labels = []
+    for values in zip(*parts):
+        labels.append(" / ".join(
+            str(pd.Timestamp(v).date()) if isinstance(v, np.datetime64) else str(v) for v in values
+        ))
+    return labels
+
+
+def check_schema(dataset, df):
+    """Expected columns that are missing."""
+    missing = [column for column in SCHEMAS[dataset] if column not in df.columns]
+    return _result(len(missing), (f"missing column {column!r}" for column in missing))
+
+
+def check_dtypes(dataset, df):
+    """Columns whose dtype does not match the expected kind."""
+    wrong = [
+        f"{column}: expected {kind}, found {df[column].dtype}"
+        for column, kind in SCHEMAS[dataset].items()
+        if column in df.columns and not _KIND_TESTS[kind](df[column].dtype)
+    ]
+    return _result(len(wrong), wrong)
+
+
+def check_nulls(dataset, df):
+    """Rows with a missing value in any expected column."""
+    columns = [column for column in SCHEMAS[dataset] if column in df.columns]
+    missing = df[columns].isna()
+    counts = missing.sum()
+    return _result(int(missing.any(axis=1).sum()),
+                   (f"{column}: {count} missing" for column, count in counts.items() if count))
+
+
+def check_duplicate_keys(dataset, df):
+    """Rows repeating the (date, series) key of an earlier row."""
+    columns = [column for column in KEY_COLUMNS[dataset] if column in df.columns]
+    if len(columns) < len(KEY_COLUMNS[dataset]):
+        return _result(0)
+    duplicated = df.duplicated(columns, keep='first').to_numpy()
+    return _result(duplicated.sum(), _label(df, columns, np.flatnonzero(duplicated)))
+
+
+def check_negative_values(dataset, df):
+    """Rows with a negative value."""
+    column = VALUE_COLUMNS[dataset]
+    if column not in df.columns or not _KIND_TESTS['numeric'](df[column].dtype):
+        return _result(0)
+    negative = (df[column].to_numpy() < 0)
+    columns = [c for c in KEY_COLUMNS[dataset] if c in df.columns] + [column]
+    return _result(negative.sum(), _label(df, columns, np.flatnonzero(negative)))
+
+
+def _periods(dates, cadence):
+    if cadence == 'month':
+        return dates.astype('datetime64[M]').astype(np.int64)
+    # Weeks counted from the epoch; the series' weekday does not matter
+    return dates.astype('datetime64[D]').astype(np.int64) // 7
+
+
+def check_date_gaps(dataset, df):
+    """Periods missing between the first and last date of each series."""
+    date_column, *series_columns = KEY_COLUMNS[dataset]
+    if any(column not in df.columns for column in KEY_COLUMNS[dataset]):
+        return _result(0)
+    if not _KIND_TESTS['date'](df[date_column].dtype):
+        return _result(0)
+    dates = df[date_column].to_numpy(dtype='datetime64[ns]')
+    dated = ~np.isnat(dates)
+    series = df.groupby(series_columns, sort=False).ngroup().to_numpy()[dated]
+    periods = _periods(dates[dated], DATE_CADENCE[dataset])
+
+    order = np.lexsort((periods, series))
+    series, periods = series[order], periods[order]
+    steps = np.diff(periods)
+    gaps = (series[1:] == series[:-1]) & (steps > 1)
+    missing = (steps[gaps] - 1).sum()
+
+    positions = np.flatnonzero(dated)[order][:-1][gaps]
+    after = np.flatnonzero(dated)[order][1:][gaps]
+    labels = _label(df, series_columns, positions)
+    examples = [
+        f"{label}: {missed} {DATE_CADENCE[dataset]}(s) missing after {pd.Timestamp(dates[start]).date()} "
+        f"(next {pd.Timestamp(dates[end]).date()})"
+        for label, missed, start, end in zip(labels, steps[gaps] - 1, positions, after)
+    ]
+    return _result(missing, examples)
+
+
+def check_unknown_ports(dataset, df, registry=None):
+    """Rows whose port is not in the port registry."""
+    if dataset != 'port' or 'port_name' not in df.columns:
+        return _result(0)
+    registry = registry or default_registry()
+    unknown = registry.lookup_codes(df['port_name'].to_numpy()) < 0
+    return _result(unknown.sum(), pd.unique(df['port_name'].to_numpy()[unknown]))
+
+
+def validation_key(dataset):
+    """Rules version and, for port data, the registry digest the checks depend on."""
+    return {
+        'validation_version': VALIDATION_VERSION,
+        'registry': default_registry().digest if dataset == 'port' else None,
+    }
+
+
+CHECKS = {
+    'schema': check_schema,
+    'dtypes': check_dtypes,
+    'nulls': check_nulls,
+    'duplicate_keys': check_duplicate_keys,
+    'negative_values': check_negative_values,
+    'date_gaps': check_date_gaps,
+    'unknown_ports': check_unknown_ports,
+}
+
+
+def validate_frame(dataset, df):
+    """
+    Run every check on a parsed dataset.
+
+    Returns:
+        dict: JSON-ready report with ``valid`` (no schema or dtype
+        failures), ``rows``, ``warnings`` (names of failed warning checks)
+        and ``checks``, mapping each check to ``passed``, ``count`` and a
+        few ``examples``.
+    """
+    if dataset not in SCHEMAS:
+        raise ValueError("Dataset must be 'rail' or 'port'")
+    checks = {name: check(dataset, df) for name, check in CHECKS.items()}
+    failed = [name for name, result in checks.items() if not result['passed']]
+    return {
+        'validation_version': VALIDATION_VERSION,
+        'valid': not any(name in ERROR_CHECKS for name in failed),
+        'rows': len(df),
+        'warnings': [name for name in failed if name not in ERROR_CHECKS],
+        'checks': checks,
+    }
@@ -0,0 +1,135 @@
+"""
+Boot-time warm-up and readiness for dashboard servers.
+
+``warm_up()`` runs before the Streamlit server starts. It loads the
+datasets whose source can be found (from the snapshot when it is
+current), then renders every page and analysis type of a dashboard
+script headlessly with Streamlit's ``AppTest``, so each default view's
+aggregates are computed and its figures built exactly as for a visitor.
+The warmed core state is written to the snapshot that the server process
+restores on its first request, and the ready file is written last. A
+missing dataset is recorded in the ready file rather than failing the
+warm-up; the dashboards report it in the app as before.
+
+``is_ready()`` backs the container health check: a replica is ready
+only once the ready file exists and the server answers its health
+endpoint.
+"""
+
+import json
+import logging
+import os
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+from .core import get_core
+from .snapshot import available_datasets, default_snapshot_path, save_snapshot
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HEALTH_URL = "http://localhost:8501/_stcore/health"
+RENDER_TIMEOUT = 120
+
+
+def default_ready_file():
+    """Ready marker from ``FREIGHT_READY_FILE`` or a file in the temp directory."""
+    env_path = os.environ.get("FREIGHT_READY_FILE")
+    if env_path:
+        return Path(env_path)
+    return Path(os.environ.get("TMPDIR", "/tmp")) / "freight_analytics.ready"
+
+
+def render_pages(app, timeout=RENDER_TIMEOUT):
+    """
+    Run a dashboard script once per page and analysis type.
+
+    Pages and analysis types are read from the script's sidebar radio and
+    select box, so every dashboard in the repository is covered.
+
+    Returns:
+        tuple: ``(rendered, failed)`` lists of ``(page, analysis_type)``.
+    """
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(str(Path(app).resolve()), default_timeout=timeout)
+    at.run()
+    if not at.sidebar.radio or not at.sidebar.selectbox:
+        return [], []
+    pages = at.sidebar.radio[0].options
+    analysis_types = at.sidebar.selectbox[0].options
+
+    rendered, failed = [], []
+    for page in pages:
+        for analysis_type in analysis_types:
+            at.sidebar.radio[0].set_value(page)
+            at.sidebar.selectbox[0].set_value(analysis_type)
+            at.run()
+            if at.exception:
+                logger.warning("Warm-up of %s / %s failed: %s", page, analysis_type, at.exception[0].value)
+                failed.append((page, analysis_type))
+            else:
+                rendered.append((page, analysis_type))
+    return rendered, failed
+
+
+def warm_up(app=None, snapshot_path=None, ready_file=None, data_dir=None):
+    """
+    Warm the data and default views, then mark the replica ready.
+
+    Args:
+        app (str or Path, optional): Dashboard script to render. Without
+            it only the core aggregates are warmed.
+        snapshot_path (str or Path, optional): Snapshot to write.
+            Defaults to ``default_snapshot_path()``.
+        ready_file (str or Path, optional): Ready marker. Defaults to
+            ``default_ready_file()``.
+        data_dir (str, optional): Data directory; see ``get_core``.
+
+    Returns:
+        dict: The ready file contents; ``datasets`` lists the warmed
+        datasets and ``missing`` maps the others to why they were skipped.
+    """
+    ready_file = Path(ready_file) if ready_file is not None else default_ready_file()
+    if ready_file.exists():
+        ready_file.unlink()
+    started = time.perf_counter()
+
+    core = get_core(data_dir)
+    datasets, missing = available_datasets(core)
+    for dataset, reason in missing.items():
+        logger.warning("Not warming %s: %s", dataset, reason)
+    if datasets:
+        core.warm(datasets)
+    rendered, failed = render_pages(app) if app else ([], [])
+    if datasets:
+        save_snapshot(core, snapshot_path or default_snapshot_path(), datasets)
+
+    # A page that fails to render still leaves the data warm, so the
+    # replica is marked ready and the failure is reported
+    info = {
+        'ready_at': time.time(),
+        'seconds': round(time.perf_counter() - started, 3),
+        'datasets': list(datasets),
+        'missing': missing,
+        'rendered': [list(view) for view in rendered],
+        'failed': [list(view) for view in failed],
+    }
+    ready_file.parent.mkdir(parents=True, exist_ok=True)
+    ready_file.write_text(json.dumps(info, indent=2))
+    return info
+
+
+def is_ready(ready_file=None, health_url=DEFAULT_HEALTH_URL, timeout=5):
+    """Whether warm-up has finished and the server answers its health check."""
+    ready_file = Path(ready_file) if ready_file is not None else default_ready_file()
+    if not ready_file.exists():
+        return False
+    if not health_url:
+        return True
+    try:
+        with urllib.request.urlopen(health_url, timeout=timeout) as response:
+            return response.status == 200
+    except (urllib.error.URLError, OSError):
+        return False
@@ -0,0 +1,131 @@
+"""Streamlit widgets shared by the dashboard entry points."""
+
+import io
+import logging
+
+import streamlit as st
+
+from .charts import compact_figure, measuring_payloads, payload_sizes, record_payload_sizes
+from .export import write_export
+
+logger = logging.getLogger(__name__)
+
+PAGE_SIZES = [25, 50, 100, 250, 500]
+TABLE_ORDER = "(table order)"
+EXPORT_MIME = {'csv': "text/csv", 'parquet': "application/vnd.apache.parquet"}
+
+
+def plotly_chart(fig, **kwargs):
+    """
+    ``st.plotly_chart`` with a compact binary payload.
+
+    Numeric trace data is sent as typed arrays (see
+    ``charts.compact_figure``). With ``FREIGHT_CHART_SIZES`` set or debug
+    logging enabled, the payload size before and after compaction is
+    recorded for ``charts.chart_payload_stats()`` and logged for each chart.
+    """
+    compact = compact_figure(fig)
+    if measuring_payloads() or logger.isEnabledFor(logging.DEBUG):
+        sizes = payload_sizes(fig, compact)
+        title = fig.layout.title.text if hasattr(fig, 'layout') else None
+        record_payload_sizes(title or "(untitled)", sizes)
+        logger.debug("Chart %r payload: %d -> %d bytes (%.0f%%)", title, sizes['json_bytes'],
+                     sizes['compact_bytes'], 100 * sizes['ratio'])
+    return st.plotly_chart(compact, **kwargs)
+
+
+def raw_data_viewer(core, dataset, filters, key, page_size=50):
+    """
+    Paginated, sortable view of the rows matching ``filters``.
+
+    Sorting and paging run in the shared core against the row-id
+    selection, so each rerun ships one page of rows regardless of how
+    many rows the filters match.
+
+    Args:
+        core (FreightCore): Shared compute core.
+        dataset (str): ``'rail'`` or ``'port'``.
+        filters (dict): Column to selected values, as passed to ``core.select``.
+        key (str): Widget key prefix, unique per viewer on a page.
+        page_size (int): Default rows per page.
+    """
+    columns = list(core.frame(dataset).columns)
+    total = len(core.row_ids(dataset, filters))
+
+    col1, col2, col3, col4 = st.columns([3, 2, 2, 2])
+    with col1:
+        sort_by = st.selectbox("Sort by", [TABLE_ORDER] + columns, key=f"{key}_sort")
+    with col2:
+        order = st.radio("Order", ["Ascending", "Descending"], horizontal=True, key=f"{key}_order")
+    with col3:
+        size = st.selectbox(
+            "Rows per page", PAGE_SIZES,
+            index=PAGE_SIZES.index(page_size) if page_size in PAGE_SIZES else 0,
+            key=f"{key}_size"
+        )
+
+    pages = max(1, -(-total // size))
+    page_key = f"{key}_page"
+    # Keep the stored page valid when the filters shrink the selection
+    if st.session_state.get(page_key, 1) > pages:
+        st.session_state[page_key] = pages
+    with col4:
+        # No default value: the page may have been set through session state above
+        page = st.number_input("Page", min_value=1, max_value=pages, step=1, key=page_key)
+
+    rows, total, page = core.page(
+        dataset, filters, page, size,
+        sort_by=None if sort_by == TABLE_ORDER else sort_by,
+        ascending=order == "Ascending"
+    )
+    st.dataframe(rows, use_container_width=True)
+
+    first = (page - 1) * size + 1 if total else 0
+    last = min(page * size, total)
+    st.caption(f"Rows {first:,}–{last:,} of {total:,} · page {page} of {pages}")
+
+
+def export_button(core, dataset, filters, key, file_stem=None):
+    """
+    Export action for the rows matching ``filters``.
+
+    The export is written in chunks to an in-memory buffer held in this
+    session's state when the user asks for it, then offered for download;
+    nothing is built on ordinary reruns and nothing is shared between
+    sessions.
+
+    Args:
+        core (FreightCore): Shared compute core.
+        dataset (str): ``'rail'`` or ``'port'``.
+        filters (dict): Column to selected values, as passed to ``core.select``.
+        key (str): Widget key prefix, unique per export action on a page.
+        file_stem (str, optional): Download file name without extension.
+    """
+    file_stem = file_stem or f"{dataset}_freight_data"
+    total = len(core.row_ids(dataset, filters))
+
+    col1, col2 = st.columns([2, 3])
+    with col1:
+        fmt = st.radio("Format", ["CSV", "Parquet"], horizontal=True, key=f"{key}_format").lower()
+    with col2:
+        prepare = st.button(f"📤 Prepare export ({total:,} rows)", key=f"{key}_prepare", disabled=total == 0)
+
+    state_key = f"{key}_file"
+    if prepare:
+        buffer = io.BytesIO()
+        try:
+            write_export(core, dataset, buffer, filters, fmt)
+        except ImportError as e:
+            st.error(str(e))
+            st.session_state.pop(state_key, None)
+        else:
+            st.session_state[state_key] = (buffer.getvalue(), fmt, core.selection_key(dataset, filters))
+
+    prepared = st.session_state.get(state_key)
+    # Only offer a file that still matches the current filters
+    if prepared and prepared[2] == core.selection_key(dataset, filters):
+        data, fmt = prepared[0], prepared[1]
+        st.download_button(
+            f"⬇️ Download {fmt.upper()}", data,
+            file_name=f"{file_stem}.{fmt}", mime=EXPORT_MIME[fmt], key=f"{key}_download"
+        )
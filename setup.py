@@ -51,6 +51,12 @@ setup(
         "deploy": [
             "gunicorn>=20.0",
             "docker>=5.0",
+        ],
+        "parquet": [
+            "pyarrow>=10.0",
+        ],
+        "duckdb": [
+            "duckdb>=0.9",
         ]
     },
     entry_points={
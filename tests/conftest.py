@@ -0,0 +1,61 @@
+"""Shared fixtures: small synthetic rail and port datasets on disk."""
+
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+RAILROADS = ['BNSF', 'CSX', 'UP']
+COMMODITIES = ['Coal', 'Grain', 'Chemicals']
+PORTS = ['oakland_ca', 'savannah_ga', 'houston_tx', 'long_beach_ca']
+
+
+def make_rail_frame(seed=0, weeks=110):
+    """Weekly carloads per railroad and commodity, in the source CSV layout."""
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range('2019-01-05', periods=weeks, freq='7D')
+    rows = [(date, railroad, commodity) for date in dates for railroad in RAILROADS for commodity in COMMODITIES]
+    df = pd.DataFrame(rows, columns=['Date', 'Railroad', 'Commodity'])
+    df.insert(1, 'Year', df['Date'].dt.year)
+    df.insert(2, 'Month', df['Date'].dt.month)
+    df['Carloads'] = rng.integers(100, 5000, len(df))
+    df['Date'] = df['Date'].dt.strftime('%m/%d/%Y')
+    return df
+
+
+def make_port_records(seed=0, months=30):
+    """Monthly TEU records, one key per port, as in the source JSON."""
+    rng = np.random.default_rng(seed)
+    return [
+        {'port': f"{date.month}/1/{date.year}",
+         **{port: str(int(rng.integers(50_000, 900_000))) for port in PORTS}}
+        for date in pd.date_range('2019-01-01', periods=months, freq='MS')
+    ]
+
+
+@pytest.fixture
+def rail_source(tmp_path):
+    df = make_rail_frame()
+    path = tmp_path / "data" / "Rail_Carloadings_originated.csv"
+    path.parent.mkdir(exist_ok=True)
+    df.to_csv(path, index=False)
+    return path
+
+
+@pytest.fixture
+def port_source(tmp_path):
+    path = tmp_path / "data" / "port_dataset.json"
+    path.parent.mkdir(exist_ok=True)
+    path.write_text(json.dumps(make_port_records()))
+    return path
+
+
+@pytest.fixture
+def data_dir(rail_source, port_source):
+    return rail_source.parent
+
+
+@pytest.fixture
+def cache_dir(tmp_path):
+    return tmp_path / "cache"
@@ -0,0 +1,119 @@
+"""Single-flight and cancellation in AsyncFreightDashboard."""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import pytest
+
+from freight_analytics import FreightDashboard
+from freight_analytics.aio import AsyncFreightDashboard
+
+
+@pytest.fixture
+def executor():
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        yield pool
+
+
+@pytest.fixture
+def dashboard(data_dir, cache_dir, executor):
+    return AsyncFreightDashboard(data_dir, cache_dir, executor=executor)
+
+
+def counting(calls, delay=0.1):
+    def compute(*args):
+        calls.append(args)
+        time.sleep(delay)
+        return pd.DataFrame({'value': [1, 2, 3]})
+    return compute
+
+
+def test_concurrent_calls_share_one_execution(dashboard):
+    calls = []
+    compute = counting(calls)
+
+    async def main():
+        return await asyncio.gather(*[dashboard._call('frame', compute, {'a': [1, 2]}) for _ in range(5)])
+
+    results = asyncio.run(main())
+    assert calls == [({'a': [1, 2]},)]
+    for result in results:
+        pd.testing.assert_frame_equal(result, pd.DataFrame({'value': [1, 2, 3]}))
+    # Every caller gets its own copy
+    assert len({id(result) for result in results}) == 5
+    assert dashboard._inflight == {}
+
+
+def test_different_arguments_run_separately(dashboard):
+    calls = []
+    compute = counting(calls, delay=0.01)
+
+    async def main():
+        await asyncio.gather(dashboard._call('frame', compute, 1), dashboard._call('frame', compute, 2))
+        await dashboard._call('frame', compute, 1)
+
+    asyncio.run(main())
+    assert sorted(calls) == [(1,), (1,), (2,)]
+
+
+def test_cancelling_one_waiter_leaves_the_others(dashboard):
+    calls = []
+    compute = counting(calls, delay=0.2)
+
+    async def main():
+        first = asyncio.ensure_future(dashboard._call('frame', compute))
+        second = asyncio.ensure_future(dashboard._call('frame', compute))
+        await asyncio.sleep(0.05)
+        first.cancel()
+        result = await second
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return result
+
+    result = asyncio.run(main())
+    assert len(calls) == 1
+    assert result['value'].tolist() == [1, 2, 3]
+
+
+def test_cancelling_every_waiter_before_the_work_starts_skips_it(dashboard, executor):
+    calls = []
+    release = threading.Event()
+    executor.submit(release.wait)
+
+    async def main():
+        task = asyncio.ensure_future(dashboard._call('frame', counting(calls)))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        release.set()
+        await asyncio.sleep(0.05)
+
+    asyncio.run(main())
+    assert calls == []
+    assert dashboard._inflight == {}
+
+
+def test_errors_reach_every_waiter(dashboard):
+    def failing():
+        time.sleep(0.05)
+        raise KeyError("missing")
+
+    async def main():
+        return await asyncio.gather(*[dashboard._call('fail', failing) for _ in range(3)], return_exceptions=True)
+
+    assert all(isinstance(result, KeyError) for result in asyncio.run(main()))
+
+
+def test_summaries_match_the_sync_dashboard(dashboard, data_dir, cache_dir):
+    async def main():
+        async with dashboard:
+            return await asyncio.gather(dashboard.get_rail_summary(), dashboard.get_port_summary())
+
+    rail, port = asyncio.run(main())
+    sync = FreightDashboard(data_dir, cache_dir)
+    assert rail == sync.get_rail_summary()
+    assert port == sync.get_port_summary()
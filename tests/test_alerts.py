@@ -0,0 +1,112 @@
+"""Alert rules and the ``watch --once`` command on synthetic port data."""
+
+import json
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from freight_analytics import cli
+from freight_analytics import core as core_module
+from freight_analytics.alerts import AnomalyRule, GrowthDropRule, JsonlSink, Watcher, monthly_matrix
+from freight_analytics.core import FreightCore
+from freight_analytics.store import ColumnarCache
+
+from .conftest import PORTS, make_port_records
+
+
+def write_ports(path, records):
+    path.parent.mkdir(exist_ok=True)
+    path.write_text(json.dumps(records))
+
+
+def steady_records(months=30):
+    """Port records within 2% of a fixed level per port, so only planted drops fire."""
+    records = make_port_records(seed=3, months=months)
+    rng = np.random.default_rng(3)
+    for record in records:
+        for i, port in enumerate(PORTS):
+            record[port] = str(int((i + 1) * 200_000 * rng.uniform(0.99, 1.01)))
+    return records
+
+
+class ListSink:
+    def __init__(self):
+        self.batches = []
+
+    def emit(self, alerts):
+        self.batches.append(alerts)
+
+
+def test_watch_once_writes_fired_rules(tmp_path, monkeypatch, capsys):
+    monkeypatch.setenv('FREIGHT_CACHE_DIR', str(tmp_path / "cache"))
+    records = steady_records()
+    records[-1]['oakland_ca'] = "1000"
+    write_ports(tmp_path / "data" / "port_dataset.json", records)
+    out = tmp_path / "alerts.jsonl"
+    monkeypatch.setattr(sys, 'argv', [
+        "freight-dashboard", "watch", "--once", "--data-dir", str(tmp_path / "data"), "--jsonl", str(out),
+    ])
+
+    cli.main()
+
+    alerts = [json.loads(line) for line in out.read_text().splitlines()]
+    fired = {(a['rule'], a['series'], a['period']) for a in alerts}
+    # A fresh start evaluates only the latest complete month
+    assert {f for f in fired if f[0] != 'capacity'} == {
+        ('growth_drop', 'oakland_ca', '2021-06'), ('anomaly', 'oakland_ca', '2021-06'),
+    }
+    assert "Watching freight data" in capsys.readouterr().out
+
+
+def test_growth_drop_matches_pandas(port_source, cache_dir):
+    core = FreightCore([port_source.parent], ColumnarCache(cache_dir))
+    matrix = monthly_matrix(core, 'port')
+    alerts = GrowthDropRule(drop_pct=5).evaluate('port', matrix, matrix.index)
+
+    change = matrix.pct_change(12, fill_method=None) * 100
+    expected = change[change < -5].stack().dropna()
+    assert sorted((a['period'], a['series']) for a in alerts) == sorted(
+        (month.strftime('%Y-%m'), series) for month, series in expected.index
+    )
+    for alert in alerts:
+        month = pd.Timestamp(alert['period'])
+        assert alert['value'] == pytest.approx(change.loc[month, alert['series']])
+
+
+def test_anomaly_needs_history(port_source, cache_dir):
+    core = FreightCore([port_source.parent], ColumnarCache(cache_dir))
+    matrix = monthly_matrix(core, 'port')
+    spiked = matrix.copy()
+    spiked.iloc[5] = spiked.iloc[5] * 100
+    spiked.iloc[-1] = spiked.iloc[-1] * 100
+
+    alerts = AnomalyRule().evaluate('port', spiked, spiked.index[[5, -1]])
+    # Month 6 has too little history; the last month is above the fence for every port
+    assert {a['period'] for a in alerts} == {spiked.index[-1].strftime('%Y-%m')}
+    assert {a['series'] for a in alerts} == set(matrix.columns)
+    assert all("above" in a['message'] for a in alerts)
+
+
+def test_watcher_evaluates_only_new_months(tmp_path, monkeypatch, cache_dir):
+    monkeypatch.setattr(core_module, 'VERSION_TTL', 0)
+    source = tmp_path / "data" / "port_dataset.json"
+    records = steady_records(months=31)
+    records[29]['savannah_ga'] = "1000"
+    write_ports(source, records[:30])
+    sink, jsonl = ListSink(), tmp_path / "alerts.jsonl"
+    watcher = Watcher(FreightCore([source.parent], ColumnarCache(cache_dir)), [sink, JsonlSink(jsonl)],
+                      rules=[GrowthDropRule()], capacity_rule=False)
+
+    first = watcher.poll()
+    assert [(a['series'], a['period']) for a in first] == [('savannah_ga', '2021-06')]
+    assert watcher.poll() == []
+
+    records[-1] = dict(records[-1], oakland_ca="1000")
+    write_ports(source, records)
+    second = watcher.poll()
+    assert [(a['series'], a['period']) for a in second] == [('oakland_ca', '2021-07')]
+
+    assert sink.batches == [first, second]
+    assert [json.loads(line) for line in jsonl.read_text().splitlines()] == first + second
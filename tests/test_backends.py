@@ -0,0 +1,91 @@
+"""SQL backends against the in-memory pandas backend."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from freight_analytics import core as core_module
+from freight_analytics.backends import DuckDBBackend, PandasBackend, SQLiteBackend, get_backend
+from freight_analytics.core import FreightCore
+from freight_analytics.query import normalize_query
+from freight_analytics.store import ColumnarCache
+
+from .conftest import make_rail_frame
+
+
+@pytest.fixture
+def core(data_dir, cache_dir):
+    return FreightCore([data_dir], ColumnarCache(cache_dir))
+
+
+def sql_backends():
+    try:
+        import duckdb  # noqa: F401
+    except ImportError:
+        return [SQLiteBackend]
+    return [SQLiteBackend, DuckDBBackend]
+
+
+@pytest.fixture(params=sql_backends(), ids=lambda backend: backend.name)
+def backend(request):
+    return request.param()
+
+
+@pytest.mark.parametrize('dataset', ['rail', 'port'])
+def test_summary_matches_pandas(core, backend, dataset):
+    expected = PandasBackend().summary(core, dataset)
+    result = backend.summary(core, dataset)
+
+    assert result['rows'] == expected['rows']
+    assert result['start'] == expected['start']
+    assert result['end'] == expected['end']
+    assert result['total'] == pytest.approx(expected['total'], rel=1e-12)
+    assert set(result['values']) == set(expected['values'])
+    for column, values in expected['values'].items():
+        assert [str(v) for v in result['values'][column]] == [str(v) for v in values]
+
+
+QUERIES = [
+    ('rail', {}, ['Railroad'], ('sum', 'count', 'mean', 'min', 'max'), None),
+    ('rail', {'Railroad': ['CSX'], 'Commodity': ['Coal', 'Grain']}, ['Commodity'], ('sum', 'std'), 'week'),
+    ('rail', {'Year': [2019]}, [], ('sum',), 'quarter'),
+    ('port', {'port_name': ['oakland_ca', 'houston_tx']}, ['port_name'], ('sum', 'mean'), 'year'),
+    ('port', {}, [], ('sum', 'count', 'std'), None),
+    ('port', {'year': [1900]}, ['port_name'], ('sum',), 'month'),
+]
+
+
+@pytest.mark.parametrize('dataset, filters, group_by, metrics, time_grain', QUERIES)
+def test_queries_match_pandas(core, backend, dataset, filters, group_by, metrics, time_grain):
+    key = normalize_query(core, dataset, filters, group_by, metrics, time_grain)
+    expected = PandasBackend().query(core, dataset, key)
+    result = backend.query(core, dataset, key)
+
+    assert list(result.columns) == list(expected.columns)
+    keys = [column for column in expected.columns if column not in metrics]
+    if keys:
+        result = result.sort_values(keys).reset_index(drop=True)
+        expected = expected.sort_values(keys).reset_index(drop=True)
+    assert len(result) == len(expected)
+    for column in expected.columns:
+        if column in metrics:
+            np.testing.assert_allclose(result[column].to_numpy(dtype=float), expected[column].to_numpy(dtype=float),
+                                       rtol=1e-9, equal_nan=True)
+        else:
+            np.testing.assert_array_equal(result[column].to_numpy(), expected[column].to_numpy())
+
+
+def test_tables_reload_when_the_source_changes(core, rail_source, monkeypatch):
+    monkeypatch.setattr(core_module, 'VERSION_TTL', 0)
+    backend = SQLiteBackend()
+    assert backend.summary(core, 'rail')['rows'] == len(pd.read_csv(rail_source))
+
+    make_rail_frame(seed=1, weeks=20).to_csv(rail_source, index=False)
+    assert backend.summary(core, 'rail')['rows'] == len(pd.read_csv(rail_source))
+
+
+def test_backends_are_shared_per_name():
+    assert get_backend('sqlite') is get_backend('sqlite')
+    assert isinstance(get_backend(), PandasBackend)
+    with pytest.raises(ValueError):
+        get_backend('oracle')
@@ -0,0 +1,184 @@
+"""Tests for the bounded, memory-accounted cache policy."""
+
+import threading
+import time
+import types
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from freight_analytics import cache as cache_module
+from freight_analytics import core as core_module
+from freight_analytics.cache import CachePolicy, measure_size
+from freight_analytics.core import FreightCore
+from freight_analytics.query import run_query
+from freight_analytics.store import ColumnarCache
+
+
+def block(n_bytes):
+    return np.zeros(n_bytes // 8)
+
+
+def test_measure_size_matches_pandas_deep_usage():
+    df = pd.DataFrame({'a': np.arange(1000), 'b': ['x' * (i % 7) for i in range(1000)]})
+    assert measure_size(df) == df.memory_usage(index=True, deep=True).sum()
+    assert measure_size(np.arange(100, dtype=np.int64)) == 800
+
+
+def test_lru_evicts_least_recently_used_across_caches():
+    policy = CachePolicy(max_bytes=2500, eviction='lru')
+    first, second = policy.cache('first'), policy.cache('second')
+    first.put('a', block(1000))
+    second.put('b', block(1000))
+    first.get('a')
+    second.put('c', block(1000))
+
+    assert 'a' in first
+    assert 'b' not in second
+    assert 'c' in second
+    assert policy.total_bytes <= policy.max_bytes
+    assert second.stats()['evictions'] == 1
+
+
+def test_lfu_evicts_least_frequently_used():
+    policy = CachePolicy(max_bytes=2500, eviction='lfu')
+    cache = policy.cache('values')
+    cache.put('hot', block(1000))
+    cache.put('cold', block(1000))
+    for _ in range(3):
+        cache.get('hot')
+    cache.put('new', block(1000))
+
+    assert 'hot' in cache
+    assert 'cold' not in cache
+    assert 'new' in cache
+
+
+def test_oversized_values_are_returned_but_not_stored():
+    policy = CachePolicy(max_bytes=1000)
+    cache = policy.cache('values')
+    value = block(4000)
+    assert cache.put('big', value) is value
+    assert 'big' not in cache
+    assert cache.stats()['rejections'] == 1
+    assert policy.total_bytes == 0
+
+
+def test_max_entries_drops_oldest():
+    cache = CachePolicy(max_bytes=10 ** 9).cache('values', max_entries=2)
+    for key in 'abc':
+        cache.put(key, key)
+    assert [key for key, _ in cache.items()] == ['b', 'c']
+
+
+def test_ttl_expires_entries(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(cache_module, 'time', types.SimpleNamespace(monotonic=lambda: now[0]))
+    cache = CachePolicy(max_bytes=10 ** 9).cache('values', ttl=10)
+    cache.put('key', 'value')
+    now[0] += 5
+    assert cache.get('key') == 'value'
+    now[0] += 6
+    assert cache.get('key') is None
+    assert cache.stats()['expirations'] == 1
+    assert cache.bytes == 0
+
+
+def test_byte_accounting_follows_discard_and_clear():
+    policy = CachePolicy(max_bytes=10 ** 9)
+    cache = policy.cache('values')
+    for i in range(4):
+        cache.put(i, block(800))
+    assert cache.bytes == policy.total_bytes == 4 * measure_size(block(800))
+    cache.discard(lambda key: key % 2 == 0)
+    assert cache.bytes == policy.total_bytes == 2 * measure_size(block(800))
+    policy.clear()
+    assert policy.total_bytes == 0
+
+
+def test_get_or_compute_is_single_flight():
+    cache = CachePolicy(max_bytes=10 ** 9).cache('values')
+    calls = []
+    started = threading.Event()
+
+    def compute():
+        calls.append(1)
+        started.set()
+        time.sleep(0.2)
+        return pd.Series(np.arange(10)).sum()
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_compute('key', compute)))
+               for _ in range(8)]
+    threads[0].start()
+    started.wait()
+    for thread in threads[1:]:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert results == [45] * 8
+
+
+def test_get_or_compute_shares_the_error_and_retries_later():
+    cache = CachePolicy(max_bytes=10 ** 9).cache('values')
+    release = threading.Event()
+    errors = []
+
+    def failing():
+        release.wait()
+        raise RuntimeError("boom")
+
+    def call():
+        try:
+            cache.get_or_compute('key', failing)
+        except RuntimeError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=call) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.05)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(errors) == 4
+    assert cache.get_or_compute('key', lambda: 'ok') == 'ok'
+
+
+def test_default_policy_is_created_once_under_contention(monkeypatch):
+    monkeypatch.setattr(cache_module, '_default_policy', None)
+    barrier = threading.Barrier(8)
+    policies = []
+
+    def call():
+        barrier.wait()
+        policies.append(cache_module.default_policy())
+
+    threads = [threading.Thread(target=call) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len({id(policy) for policy in policies}) == 1
+
+
+def test_unknown_eviction_policy_is_rejected():
+    with pytest.raises(ValueError):
+        CachePolicy(eviction='fifo')
+
+
+def test_every_derived_cache_of_the_core_is_bounded(monkeypatch, data_dir, cache_dir):
+    policy = CachePolicy(max_bytes=10 ** 9)
+    monkeypatch.setattr(core_module, 'default_policy', lambda: policy)
+    core = FreightCore([data_dir], ColumnarCache(cache_dir)).warm()
+    for dataset in ('rail', 'port'):
+        core.validation(dataset)
+        run_query(core, dataset, metrics=('sum',), time_grain='year')
+
+    for cache in policy.caches():
+        assert cache.max_entries is not None, cache.name
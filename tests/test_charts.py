@@ -0,0 +1,186 @@
+"""Compact Plotly payloads decode back to the original data."""
+
+import base64
+import json
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+import plotly.io as pio
+import pytest
+
+from freight_analytics import charts
+from freight_analytics.charts import (
+    chart_payload_stats, color_map, compact_figure, encode_array, figure_delta, figure_payload, payload_sizes,
+    record_payload_sizes,
+)
+
+
+def decode(spec):
+    values = np.frombuffer(base64.b64decode(spec['bdata']), dtype='<' + spec['dtype'])
+    if 'shape' in spec:
+        values = values.reshape([int(size) for size in spec['shape'].split(',')])
+    return values
+
+
+@pytest.mark.parametrize('values, dtype', [
+    (np.array([0, 5, 200, 17] * 4), 'u1'),
+    (np.array([-3, 70000, 12, 5] * 4), 'i4'),
+    (np.array([0.5, 1.25, -2.0, 8.0] * 4), 'f4'),
+    (np.array([0.1, 1 / 3, 2.0, 8.0] * 4), 'f8'),
+])
+def test_encode_array_is_exact_and_narrow(values, dtype):
+    spec = encode_array(values)
+    assert spec['dtype'] == dtype
+    np.testing.assert_array_equal(decode(spec).astype(values.dtype), values)
+
+
+def test_two_dimensional_arrays_keep_their_shape():
+    values = np.arange(24, dtype=np.float64).reshape(4, 6) / 4
+    np.testing.assert_array_equal(decode(encode_array(values)), values)
+
+
+def test_line_chart_round_trip_matches_the_frame():
+    rng = np.random.default_rng(1)
+    df = pd.DataFrame({
+        'Date': np.tile(pd.date_range('2020-01-04', periods=60, freq='7D'), 2),
+        'Railroad': np.repeat(['BNSF', 'UP'], 60),
+        'Carloads': rng.integers(0, 90000, 120),
+    })
+    payload = json.loads(pio.to_json(compact_figure(px.line(df, x='Date', y='Carloads', color='Railroad')),
+                                     validate=False))
+
+    assert payload['layout']['xaxis']['type'] == 'date'
+    for trace in payload['data']:
+        expected = df[df['Railroad'] == trace['name']]
+        np.testing.assert_array_equal(decode(trace['y']), expected['Carloads'].to_numpy())
+        # Evenly spaced weeks collapse to a start and a step
+        assert 'x' not in trace
+        assert pd.Timestamp(trace['x0']) == expected['Date'].iloc[0]
+        assert trace['dx'] == pd.Timedelta(days=7) / pd.Timedelta(milliseconds=1)
+
+
+def test_irregular_dates_are_sent_as_milliseconds():
+    dates = pd.to_datetime(['2020-01-01', '2020-01-03', '2020-02-01', '2020-02-02'] * 3) \
+        + pd.to_timedelta(np.repeat([0, 100, 200], 4), unit='D')
+    fig = go.Figure(go.Scatter(x=dates, y=np.arange(12.0)))
+    trace = compact_figure(fig).to_dict()['data'][0]
+    milliseconds = decode(trace['x'])
+    np.testing.assert_array_equal(pd.to_datetime(milliseconds, unit='ms'), dates)
+
+
+def test_non_numeric_data_is_left_alone():
+    fig = go.Figure(go.Bar(x=list('abcdefghij'), y=[1.5] * 10))
+    trace = compact_figure(fig).to_dict()['data'][0]
+    assert list(trace['x']) == list('abcdefghij')
+
+
+def test_typed_arrays_can_be_disabled():
+    fig = go.Figure(go.Scatter(x=[3, 1, 4, 1, 5, 9, 2, 6, 5, 3], y=np.linspace(0, 1, 10) ** 2))
+    trace = compact_figure(fig, typed_arrays=False).to_dict()['data'][0]
+    assert not isinstance(trace['x'], dict)
+    np.testing.assert_allclose(np.asarray(trace['y']), np.linspace(0, 1, 10) ** 2)
+
+
+def test_payload_sizes_are_recorded_per_chart(monkeypatch):
+    monkeypatch.setattr(charts, '_payload_sizes', OrderedDict())
+    monkeypatch.setattr(charts, 'MAX_MEASURED_CHARTS', 2)
+    fig = go.Figure(go.Scatter(x=np.arange(500), y=np.random.default_rng(0).integers(0, 200, 500)))
+    sizes = payload_sizes(fig)
+    assert sizes['json_bytes'] == len(pio.to_json(fig, validate=False).encode('utf-8'))
+    assert sizes['compact_bytes'] < sizes['json_bytes']
+
+    for name in ('first', 'second', 'third'):
+        record_payload_sizes(name, sizes)
+    stats = chart_payload_stats()
+    assert list(stats['charts']) == ['second', 'third']
+    assert stats['json_bytes'] == 2 * sizes['json_bytes']
+    assert stats['ratio'] == pytest.approx(sizes['ratio'])
+
+
+def rail_trend(df, railroads, colors):
+    subset = df[df['Railroad'].isin(railroads)]
+    return px.line(subset, x='Date', y='Carloads', color='Railroad', color_discrete_map=colors)
+
+
+@pytest.fixture
+def weekly():
+    rng = np.random.default_rng(2)
+    railroads = ['BNSF', 'CSX', 'NS', 'UP']
+    return pd.DataFrame({
+        'Date': np.tile(pd.date_range('2021-01-02', periods=30, freq='7D'), len(railroads)),
+        'Railroad': np.repeat(railroads, 30),
+        'Carloads': rng.integers(0, 50000, 30 * len(railroads)),
+    })
+
+
+def apply(client, delta):
+    """Client side of the protocol: trace id to trace, in delta order."""
+    if delta['base'] is None:
+        client = {}
+    else:
+        client = {k: v for k, v in client.items() if k not in delta['remove']}
+    client.update(delta['traces'])
+    return {trace_id: client[trace_id] for trace_id in delta['order']}
+
+
+def test_delta_sends_only_added_and_removed_traces(weekly):
+    colors = color_map(sorted(weekly['Railroad'].unique()))
+    first, state = figure_delta(figure_payload(rail_trend(weekly, ['BNSF', 'CSX', 'UP'], colors)))
+    assert first['base'] is None
+    assert sorted(first['traces']) == ['BNSF', 'CSX', 'UP']
+    client = apply({}, first)
+
+    removed, state = figure_delta(figure_payload(rail_trend(weekly, ['BNSF', 'UP'], colors)), state)
+    assert removed['base'] == first['version']
+    assert removed['traces'] == {}
+    assert removed['remove'] == ['CSX']
+    client = apply(client, removed)
+
+    added, state = figure_delta(figure_payload(rail_trend(weekly, ['BNSF', 'NS', 'UP'], colors)), state)
+    assert sorted(added['traces']) == ['NS']
+    assert added['remove'] == []
+    client = apply(client, added)
+
+    full, _ = figure_delta(figure_payload(rail_trend(weekly, ['BNSF', 'NS', 'UP'], colors)))
+    assert list(client) == full['order']
+    assert client == full['traces']
+    for trace_id, trace in client.items():
+        expected = weekly.loc[weekly['Railroad'] == trace_id, 'Carloads'].to_numpy()
+        np.testing.assert_array_equal(decode(trace['y']), expected)
+
+
+def test_unchanged_figure_repeats_the_previous_delta(weekly):
+    fig = rail_trend(weekly, ['BNSF', 'UP'], color_map(['BNSF', 'UP']))
+    delta, state = figure_delta(figure_payload(fig))
+    again, same_state = figure_delta(figure_payload(fig), state)
+    assert again == delta
+    assert same_state is state
+
+
+def test_changed_data_resends_only_that_trace(weekly):
+    colors = color_map(sorted(weekly['Railroad'].unique()))
+    _, state = figure_delta(figure_payload(rail_trend(weekly, ['BNSF', 'UP'], colors)))
+    changed = weekly.copy()
+    changed.loc[changed['Railroad'] == 'UP', 'Carloads'] += 1
+    delta, _ = figure_delta(figure_payload(rail_trend(changed, ['BNSF', 'UP'], colors)), state)
+    assert sorted(delta['traces']) == ['UP']
+    assert delta['layout'] is None
+
+
+def test_full_resync_sends_everything(weekly):
+    fig = rail_trend(weekly, ['BNSF', 'UP'], color_map(['BNSF', 'UP']))
+    first, state = figure_delta(figure_payload(fig))
+    resync, state = figure_delta(figure_payload(fig), state, full=True)
+    assert resync['base'] is None
+    assert resync['version'] == first['version'] + 1
+    assert sorted(resync['traces']) == ['BNSF', 'UP']
+    assert resync['layout'] is not None
+
+
+def test_duplicate_names_get_distinct_ids():
+    fig = go.Figure([go.Scatter(name='a', y=[1, 2]), go.Scatter(name='a', y=[3, 4]), go.Scatter(y=[5, 6])])
+    delta, _ = figure_delta(figure_payload(fig))
+    assert delta['order'] == ['a', 'a#1', '2']
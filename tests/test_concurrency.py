@@ -0,0 +1,97 @@
+"""Concurrent first access to the shared core and FreightDashboard."""
+
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from freight_analytics import FreightDashboard
+from freight_analytics import core as core_module
+from freight_analytics.core import FreightCore
+from freight_analytics.store import ColumnarCache
+
+
+def run_threads(target, count=8):
+    barrier = threading.Barrier(count)
+    results, errors = [None] * count, []
+
+    def call(i):
+        barrier.wait()
+        try:
+            results[i] = target(i)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors
+    return results
+
+
+def counting_loader(monkeypatch, delay=0.2):
+    calls = []
+    original = core_module.load_dataset
+
+    def load(dataset, source, cache=None):
+        calls.append(dataset)
+        time.sleep(delay)
+        return original(dataset, source, cache)
+
+    monkeypatch.setattr(core_module, 'load_dataset', load)
+    return calls
+
+
+def test_concurrent_frame_loads_once(monkeypatch, data_dir, cache_dir, rail_source):
+    calls = counting_loader(monkeypatch)
+    core = FreightCore([data_dir], ColumnarCache(cache_dir))
+
+    frames = run_threads(lambda i: core.frame('rail'))
+
+    assert calls == ['rail']
+    assert all(frame is frames[0] for frame in frames)
+    expected = pd.read_csv(rail_source)
+    assert len(frames[0]) == len(expected)
+    assert frames[0]['Carloads'].sum() == expected['Carloads'].sum()
+
+
+def test_cores_sharing_a_source_share_one_load(monkeypatch, data_dir, cache_dir):
+    calls = counting_loader(monkeypatch)
+    cores = [FreightCore([data_dir], ColumnarCache(cache_dir)) for _ in range(4)]
+    frames = run_threads(lambda i: cores[i].frame('port'), count=4)
+
+    assert calls == ['port']
+    assert all(frame is frames[0] for frame in frames)
+
+
+def test_concurrent_derived_results_compute_once(data_dir, cache_dir, rail_source):
+    core = FreightCore([data_dir], ColumnarCache(cache_dir))
+    calls = []
+
+    def compute(df):
+        calls.append(1)
+        time.sleep(0.2)
+        return df.groupby('Railroad')['Carloads'].sum()
+
+    results = run_threads(lambda i: core.cached('rail', 'test_totals', None, compute))
+
+    assert len(calls) == 1
+    expected = pd.read_csv(rail_source).groupby('Railroad')['Carloads'].sum()
+    for result in results:
+        pd.testing.assert_series_equal(result, expected, check_names=False)
+
+
+def test_concurrent_dashboard_summaries_match_pandas(data_dir, cache_dir, rail_source):
+    dashboard = FreightDashboard(data_dir, cache_dir)
+    summaries = run_threads(lambda i: dashboard.get_rail_summary())
+
+    expected = pd.read_csv(rail_source)
+    for summary in summaries:
+        assert summary == summaries[0]
+        assert summary['total_records'] == len(expected)
+        assert summary['total_carloads'] == expected['Carloads'].sum()
+        assert summary['unique_railroads'] == expected['Railroad'].nunique()
+        assert list(summary['years_covered']) == sorted(np.unique(expected['Year']))
@@ -0,0 +1,93 @@
+"""Streamed CSV and Parquet exports against the selected rows."""
+
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from freight_analytics import export
+from freight_analytics.core import FreightCore
+from freight_analytics.export import iter_export, write_export
+from freight_analytics.store import ColumnarCache
+
+FILTERS = {'Railroad': ['CSX', 'UP'], 'Commodity': ['Coal', 'Grain']}
+
+
+@pytest.fixture
+def core(data_dir, cache_dir):
+    return FreightCore([data_dir], ColumnarCache(cache_dir))
+
+
+def read_csv(data, like):
+    df = pd.read_csv(io.BytesIO(data), parse_dates=['Date'])
+    return df.astype(like.dtypes.to_dict())
+
+
+@pytest.mark.parametrize('chunk_rows', [1, 7, 220, 100_000])
+def test_csv_round_trip(core, chunk_rows):
+    expected = core.select('rail', FILTERS).reset_index(drop=True)
+    pieces = list(iter_export(core, 'rail', FILTERS, 'csv', chunk_rows))
+
+    assert len(pieces) == -(-len(expected) // chunk_rows)
+    data = b"".join(pieces)
+    assert data.count(b"Date,") == 1
+    pd.testing.assert_frame_equal(read_csv(data, expected), expected)
+
+
+def test_csv_of_an_empty_selection_is_the_header(core):
+    data = b"".join(iter_export(core, 'rail', {'Railroad': ['nobody']}))
+    assert data.decode().strip() == ",".join(core.frame('rail').columns)
+
+
+@pytest.mark.parametrize('chunk_rows', [50, 220, 100_000])
+def test_parquet_round_trip(core, chunk_rows):
+    pq = pytest.importorskip('pyarrow.parquet')
+    expected = core.select('port', {'year': [2019, 2020]}).reset_index(drop=True)
+    buffer = io.BytesIO()
+    written = write_export(core, 'port', buffer, {'year': [2019, 2020]}, 'parquet', chunk_rows)
+
+    assert written == len(buffer.getvalue())
+    parquet = pq.ParquetFile(io.BytesIO(buffer.getvalue()))
+    assert parquet.num_row_groups == -(-len(expected) // chunk_rows)
+    pd.testing.assert_frame_equal(parquet.read().to_pandas(), expected, check_dtype=False)
+
+
+def test_empty_parquet_keeps_the_schema(core):
+    pq = pytest.importorskip('pyarrow.parquet')
+    data = b"".join(iter_export(core, 'port', {'year': [1900]}, 'parquet'))
+    table = pq.read_table(io.BytesIO(data))
+    assert table.num_rows == 0
+    assert table.column_names == list(core.frame('port').columns)
+
+
+def test_write_export_to_a_path_is_atomic(core, tmp_path, monkeypatch):
+    (tmp_path / "out").mkdir()
+    path = tmp_path / "out" / "rail.csv"
+    write_export(core, 'rail', path, FILTERS, chunk_rows=50)
+    expected = core.select('rail', FILTERS).reset_index(drop=True)
+    pd.testing.assert_frame_equal(read_csv(path.read_bytes(), expected), expected)
+
+    def broken(*args, **kwargs):
+        yield b"partial,"
+        raise RuntimeError("disk full")
+
+    monkeypatch.setattr(export, '_iter_csv', broken)
+    with pytest.raises(RuntimeError):
+        write_export(core, 'rail', path, FILTERS)
+    # The previous export is untouched and no partial file is left
+    pd.testing.assert_frame_equal(read_csv(path.read_bytes(), expected), expected)
+    assert [p.name for p in path.parent.iterdir()] == ["rail.csv"]
+
+
+def test_unknown_format_is_rejected(core):
+    with pytest.raises(ValueError):
+        iter_export(core, 'rail', format='xlsx')
+
+
+def test_chunks_cover_the_selection_in_table_order(core):
+    row_ids = core.row_ids('rail', FILTERS)
+    chunks = list(export._chunks(core, 'rail', FILTERS, 64))
+    assert all(len(chunk) == 64 for chunk in chunks[:-1])
+    np.testing.assert_array_equal(np.concatenate([chunk.index.to_numpy() for chunk in chunks]),
+                                  core.frame('rail').index.to_numpy()[row_ids])
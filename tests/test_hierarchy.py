@@ -0,0 +1,62 @@
+"""Top-N rollups against nlargest and groupby sums."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from freight_analytics.hierarchy import OTHER_LABEL, top_n_rollup
+
+
+@pytest.fixture
+def totals():
+    rng = np.random.default_rng(12)
+    sizes = {'Winter': 7, 'Spring': 4, 'Summer': 3, 'Fall': 1}
+    rows = [(season, f"c{i}", float(rng.integers(1, 10_000))) for season, n in sizes.items() for i in range(n)]
+    return pd.DataFrame(rows, columns=['Season', 'Commodity', 'Carloads'])
+
+
+def test_rollup_keeps_the_largest_and_folds_the_rest(totals):
+    result = top_n_rollup(totals, 'Season', 'Commodity', 'Carloads', top=2)
+
+    for season, group in totals.groupby('Season'):
+        rows = result[result['Season'] == season]
+        kept = group.nlargest(2, 'Carloads')
+        if len(group) > 3:
+            assert rows['Commodity'].tolist() == kept['Commodity'].tolist() + [OTHER_LABEL]
+            other = rows.iloc[-1]
+            assert other['Carloads'] == group['Carloads'].sum() - kept['Carloads'].sum()
+            assert other['members'] == len(group) - 2
+        else:
+            # Three children (top + 1) or fewer are all kept
+            assert rows['Commodity'].tolist() == group.nlargest(len(group), 'Carloads')['Commodity'].tolist()
+            assert (rows['members'] == 1).all()
+
+    # Folding never changes the parent totals
+    pd.testing.assert_series_equal(result.groupby('Season')['Carloads'].sum(),
+                                   totals.groupby('Season')['Carloads'].sum())
+    assert result['members'].sum() == len(totals)
+    assert list(result['Season'].unique()) == sorted(totals['Season'].unique())
+
+
+def test_top_plus_one_children_are_not_folded(totals):
+    spring = totals[totals['Season'] == 'Spring']
+    result = top_n_rollup(spring, 'Season', 'Commodity', 'Carloads', top=3)
+    assert OTHER_LABEL not in result['Commodity'].tolist()
+    assert len(result) == 4
+
+    folded = top_n_rollup(spring, 'Season', 'Commodity', 'Carloads', top=2)
+    assert folded['Commodity'].tolist()[-1] == OTHER_LABEL
+    assert folded['members'].tolist() == [1, 1, 2]
+
+
+def test_without_a_limit_every_child_is_kept_in_order(totals):
+    result = top_n_rollup(totals, 'Season', 'Commodity', 'Carloads', top=None)
+    expected = totals.sort_values(['Season', 'Carloads', 'Commodity'], ascending=[True, False, True])
+    pd.testing.assert_frame_equal(result[['Season', 'Commodity', 'Carloads']], expected.reset_index(drop=True))
+
+
+def test_equal_values_keep_children_in_name_order():
+    df = pd.DataFrame({'Season': 'Winter', 'Commodity': ['d', 'b', 'a', 'c'], 'Carloads': 1.0})
+    result = top_n_rollup(df, 'Season', 'Commodity', 'Carloads', top=1, other="Rest")
+    assert result['Commodity'].tolist() == ['a', 'Rest']
+    assert result['Carloads'].tolist() == [1.0, 3.0]
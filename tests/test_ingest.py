@@ -0,0 +1,182 @@
+"""Ingest against single-file loads, pandas.concat and pandas date parsing."""
+
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from freight_analytics import ingest
+from freight_analytics.dates import detect_date_format, parse_dates
+from freight_analytics.ingest import (
+    concat_frames, concat_port_matrices, load_port_frame, load_rail_frame, read_port_matrix, source_files,
+)
+from freight_analytics.store import ColumnarCache, load_dataset, source_fingerprint
+
+from .conftest import make_port_records, make_rail_frame
+
+
+def sort_rows(df, key):
+    return df.sort_values(key, kind='stable').reset_index(drop=True)
+
+
+def test_concat_frames_matches_pandas_on_equal_schemas():
+    rng = np.random.default_rng(4)
+    parts = [
+        pd.DataFrame({'a': rng.integers(0, 9, n), 'b': rng.random(n), 'c': rng.choice(['x', 'y'], n),
+                      'd': pd.date_range('2020-01-01', periods=n)})
+        for n in (3, 0, 7)
+    ]
+    pd.testing.assert_frame_equal(concat_frames(parts), pd.concat(parts, ignore_index=True), check_dtype=False)
+    result = concat_frames(parts)
+    assert result['a'].dtype == np.int64
+    assert result['d'].dtype == 'datetime64[ns]'
+
+
+def test_concat_frames_reconciles_schemas():
+    first = pd.DataFrame({'a': np.array([1, 2], dtype=np.int32), 'b': ['x', 'y']})
+    second = pd.DataFrame({'a': [0.5], 'extra': [7]})
+    result = concat_frames([first, second])
+    expected = pd.concat([first, second], ignore_index=True)
+
+    assert list(result.columns) == ['a', 'b', 'extra']
+    assert result['a'].dtype == np.float64
+    np.testing.assert_array_equal(result['a'].to_numpy(), expected['a'].to_numpy())
+    assert result['b'].isna().tolist() == [False, False, True]
+    # Integers missing from some parts widen to float so they can hold NaN
+    np.testing.assert_array_equal(result['extra'].to_numpy(), [np.nan, np.nan, 7.0])
+
+
+def test_concat_frames_falls_back_to_object_for_mixed_kinds():
+    result = concat_frames([pd.DataFrame({'a': [1, 2]}), pd.DataFrame({'a': ['three']})])
+    assert result['a'].tolist() == [1, 2, 'three']
+
+
+def write_rail_parts(directory):
+    df = make_rail_frame(seed=5)
+    directory.mkdir()
+    for (year, railroad), part in df.groupby(['Year', 'Railroad']):
+        if year == df['Year'].max() and railroad == 'UP':
+            # A part with other column names and order and no Year/Month
+            part = part.drop(columns=['Year', 'Month']).rename(
+                columns={'Carloads': ' carloads ', 'Railroad': 'RAILROAD'}
+            )[['Commodity', ' carloads ', 'Date', 'RAILROAD']]
+        part.to_csv(directory / f"rail_{year}_{railroad}.csv", index=False)
+    return df
+
+
+def test_rail_directory_matches_single_file(tmp_path):
+    df = write_rail_parts(tmp_path / "rail")
+    df.to_csv(tmp_path / "rail.csv", index=False)
+
+    single = load_rail_frame(tmp_path / "rail.csv")
+    key = ['Date', 'Railroad', 'Commodity']
+    for source in (tmp_path / "rail", tmp_path / "rail" / "*.csv"):
+        parts = load_rail_frame(source, workers=1)
+        pd.testing.assert_frame_equal(sort_rows(parts[single.columns], key), sort_rows(single, key),
+                                      check_dtype=False)
+
+
+def test_parallel_parse_matches_serial(tmp_path):
+    write_rail_parts(tmp_path / "rail")
+    serial = load_rail_frame(tmp_path / "rail", workers=1)
+    parallel = load_rail_frame(tmp_path / "rail", workers=2)
+    pd.testing.assert_frame_equal(parallel, serial)
+
+
+def test_port_parts_match_single_file(tmp_path):
+    records = make_port_records(seed=6, months=24)
+    first, second = records[:10], [{k: v for k, v in r.items() if k != 'oakland_ca'} for r in records[10:]]
+    (tmp_path / "port").mkdir()
+    (tmp_path / "port" / "a.json").write_text(json.dumps(first))
+    (tmp_path / "port" / "b.json").write_text(json.dumps(second))
+
+    merged = load_port_frame(tmp_path / "port", workers=1)
+    expected = pd.concat([read_port_matrix(first).to_frame(), read_port_matrix(second).to_frame()])
+    key = ['port_name', 'port']
+    pd.testing.assert_frame_equal(sort_rows(merged, key), sort_rows(expected, key), check_dtype=False)
+
+    matrix = concat_port_matrices([read_port_matrix(first), read_port_matrix(second)])
+    assert matrix.shape == (24, len(read_port_matrix(first).ports))
+    assert np.isnan(matrix.values[10:, matrix.ports.index('oakland_ca')]).all()
+
+
+def test_source_files_and_fingerprint(tmp_path):
+    write_rail_parts(tmp_path / "rail")
+    (tmp_path / "rail" / "notes.txt").write_text("not data")
+    files = source_files(tmp_path / "rail")
+    assert files == sorted(files)
+    assert all(path.suffix == '.csv' for path in files)
+
+    fingerprint = source_fingerprint(tmp_path / "rail")
+    assert fingerprint['size'] == sum(path.stat().st_size for path in files)
+    assert len(fingerprint['files']) == len(files)
+
+    files[0].unlink()
+    assert source_fingerprint(tmp_path / "rail") != fingerprint
+
+    with pytest.raises(FileNotFoundError):
+        source_files(tmp_path / "rail" / "*.parquet")
+
+
+@pytest.mark.parametrize('values, fmt', [
+    (['2020-01-31', '2021-12-01'], '%Y-%m-%d'),
+    (['01/31/2020', '12/01/2021'], '%m/%d/%Y'),
+    (['1/31/20', '12/1/21'], '%m/%d/%y'),
+    (['31/01/2020', '01/12/2021'], '%d/%m/%Y'),
+    (['Jan 2020', 'Dec 2021'], '%b %Y'),
+])
+def test_detect_date_format(values, fmt):
+    assert detect_date_format(values + ['', None]) == fmt
+
+
+def test_ambiguous_dates_are_month_first():
+    assert detect_date_format(['01/02/2020', '03/04/2021']) == '%m/%d/%Y'
+    assert detect_date_format(['not a date']) is None
+
+
+def test_parse_dates_converts_each_distinct_value_once(monkeypatch):
+    values = np.array(['01/05/2019', '01/12/2019', '01/19/2019'] * 1000 + ['', None], dtype=object)
+    sizes = []
+    to_datetime = pd.to_datetime
+
+    def counting(arg, *args, **kwargs):
+        sizes.append(len(arg))
+        return to_datetime(arg, *args, **kwargs)
+
+    monkeypatch.setattr(pd, 'to_datetime', counting)
+    result = parse_dates(values)
+    monkeypatch.undo()
+
+    # One vectorized call over the distinct strings, blank included
+    assert sizes == [4]
+    expected = pd.to_datetime(pd.Series(values).replace('', None), format='%m/%d/%Y')
+    np.testing.assert_array_equal(result, expected.to_numpy(dtype='datetime64[ns]'))
+
+
+def test_parse_dates_reparses_values_outside_the_sampled_format(caplog):
+    values = ['01/02/2020'] * 60 + ['2020-03-04', 'Mar 2021', 'junk', '  ']
+    result = parse_dates(values)
+    assert result[0] == np.datetime64('2020-01-02')
+    assert result[60] == np.datetime64('2020-03-04')
+    assert result[61] == np.datetime64('2021-03-01')
+    assert np.isnat(result[62:]).all()
+    assert "1 value(s) could not be parsed" in caplog.text
+
+    with pytest.raises(ValueError, match="'junk'"):
+        parse_dates(values, errors='raise')
+
+
+@pytest.mark.parametrize('dataset', ['rail', 'port'])
+def test_warm_load_matches_cold_parse_without_parsing(monkeypatch, dataset, rail_source, port_source, cache_dir):
+    source = rail_source if dataset == 'rail' else port_source
+    cold = load_dataset(dataset, source, ColumnarCache(cache_dir))
+    pd.testing.assert_frame_equal(cold, load_dataset(dataset, source, False))
+
+    def fail(*args, **kwargs):
+        raise AssertionError("warm loads must not parse dates")
+
+    monkeypatch.setattr(ingest, 'parse_dates', fail)
+    warm = load_dataset(dataset, source, ColumnarCache(cache_dir))
+
+    pd.testing.assert_frame_equal(warm, cold)
@@ -0,0 +1,94 @@
+"""Paged, sorted row views against pandas sort_values."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from freight_analytics.core import FreightCore
+from freight_analytics.store import ColumnarCache
+
+FILTERS = {'Railroad': ['BNSF', 'UP'], 'Year': [2019, 2020]}
+
+
+@pytest.fixture
+def core(data_dir, cache_dir):
+    return FreightCore([data_dir], ColumnarCache(cache_dir))
+
+
+def all_pages(core, page_size, **kwargs):
+    rows, total, _ = core.page('rail', FILTERS, 1, page_size, **kwargs)
+    pages = [rows]
+    for page in range(2, -(-total // page_size) + 1):
+        pages.append(core.page('rail', FILTERS, page, page_size, **kwargs)[0])
+    return pages, total
+
+
+@pytest.mark.parametrize('sort_by, ascending', [
+    (None, True), ('Carloads', True), ('Carloads', False), ('Commodity', True), ('Date', False),
+])
+def test_pages_concatenate_to_the_sorted_selection(core, sort_by, ascending):
+    selected = core.select('rail', FILTERS)
+    expected = selected if sort_by is None else selected.sort_values(sort_by, ascending=ascending, kind='stable')
+
+    pages, total = all_pages(core, 25, sort_by=sort_by, ascending=ascending)
+
+    assert total == len(selected)
+    assert [len(page) for page in pages[:-1]] == [25] * (len(pages) - 1)
+    pd.testing.assert_frame_equal(pd.concat(pages), expected)
+
+
+def test_ties_keep_table_order_in_both_directions(core):
+    selected = core.select('rail', FILTERS)
+    for ascending in (True, False):
+        pages, _ = all_pages(core, 40, sort_by='Season', ascending=ascending)
+        rows = pd.concat(pages)
+        for _, group in rows.groupby('Season', sort=False):
+            assert group.index.is_monotonic_increasing
+        assert rows['Season'].tolist() == selected['Season'].sort_values(ascending=ascending).tolist()
+
+
+def test_page_numbers_are_clamped(core):
+    total = len(core.row_ids('rail', FILTERS))
+    last = -(-total // 50)
+    rows, _, page = core.page('rail', FILTERS, last + 10, 50)
+    assert page == last
+    assert len(rows) == total - (last - 1) * 50
+    assert core.page('rail', FILTERS, 0, 50)[2] == 1
+
+    rows, total, page = core.page('rail', {'Railroad': ['nobody']}, 3, 50)
+    assert (len(rows), total, page) == (0, 0, 1)
+
+
+def viewer_app(data_dir, cache_dir):
+    from freight_analytics.core import FreightCore
+    from freight_analytics.store import ColumnarCache
+    from freight_analytics.widgets import raw_data_viewer
+
+    core = FreightCore([data_dir], ColumnarCache(cache_dir))
+    raw_data_viewer(core, 'rail', {'Railroad': ['BNSF', 'UP'], 'Year': [2019, 2020]}, key="raw", page_size=25)
+
+
+def test_raw_data_viewer_shows_the_requested_page(core, data_dir, cache_dir):
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_function(viewer_app, args=(str(data_dir), str(cache_dir)))
+    at.run()
+    assert not at.exception
+    at.selectbox(key="raw_sort").set_value('Carloads')
+    at.radio(key="raw_order").set_value("Descending")
+    at.number_input(key="raw_page").set_value(3)
+    at.run()
+    assert not at.exception
+
+    expected = core.select('rail', FILTERS).sort_values('Carloads', ascending=False, kind='stable')
+    shown = at.dataframe[0].value
+    np.testing.assert_array_equal(shown['Carloads'].to_numpy(), expected['Carloads'].to_numpy()[50:75])
+    assert at.caption[0].value.startswith(f"Rows 51–75 of {len(expected):,}")
+
+    # Fewer pages than the stored page number moves to the last page
+    at.selectbox(key="raw_size").set_value(500)
+    at.run()
+    assert not at.exception
+    last = -(-len(expected) // 500)
+    assert at.number_input(key="raw_page").value == last
+    assert len(at.dataframe[0].value) == len(expected) - (last - 1) * 500
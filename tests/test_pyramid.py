@@ -0,0 +1,81 @@
+"""Time pyramid levels against pandas resample."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from freight_analytics.pyramid import TimePyramid, bucket_start
+
+FREQUENCIES = {'week': 'W-MON', 'month': 'MS', 'quarter': 'QS', 'year': 'YS'}
+
+
+@pytest.fixture
+def daily():
+    rng = np.random.default_rng(13)
+    n = 3000
+    return pd.DataFrame({
+        'Date': pd.Timestamp('2018-11-03') + pd.to_timedelta(rng.integers(0, 1500, n), unit='D'),
+        'Railroad': rng.choice(['BNSF', 'CSX', 'UP'], n),
+        'Carloads': rng.integers(0, 1000, n),
+    })
+
+
+def resampled(df, level, group=None):
+    rule = {'rule': FREQUENCIES[level]}
+    if level == 'week':
+        rule.update(closed='left', label='left')
+    if group is None:
+        totals = df.set_index('Date')['Carloads'].resample(**rule).sum(min_count=1)
+    else:
+        totals = df.set_index('Date').groupby(group)['Carloads'].resample(**rule).sum(min_count=1)
+    return totals.dropna().astype(np.int64).reset_index()
+
+
+@pytest.mark.parametrize('level', ['week', 'month', 'quarter', 'year'])
+def test_levels_match_resample(daily, level):
+    pyramid = TimePyramid(daily, 'Date', 'Carloads')
+    pd.testing.assert_frame_equal(pyramid.levels[level], resampled(daily, level), check_dtype=False)
+
+
+@pytest.mark.parametrize('level', ['week', 'month', 'quarter', 'year'])
+def test_grouped_levels_match_resample(daily, level):
+    pyramid = TimePyramid(daily, 'Date', 'Carloads', 'Railroad')
+    pd.testing.assert_frame_equal(pyramid.levels[level], resampled(daily, level, 'Railroad'), check_dtype=False)
+
+
+def test_weeks_start_on_monday():
+    dates = pd.to_datetime(['2024-01-01', '2024-01-07', '2024-01-08', '1969-12-31'])
+    starts = pd.DatetimeIndex(bucket_start('week', dates.to_numpy()))
+    assert list(starts.strftime('%Y-%m-%d')) == ['2024-01-01', '2024-01-01', '2024-01-08', '1969-12-29']
+    assert (starts.dayofweek == 0).all()
+
+
+def test_monthly_data_has_no_week_level():
+    df = pd.DataFrame({'Date': pd.date_range('2019-01-01', periods=36, freq='MS'), 'TEU': np.arange(36.0)})
+    pyramid = TimePyramid(df, 'Date', 'TEU')
+    assert pyramid.available_levels() == ['month', 'quarter', 'year']
+    assert pyramid.levels['year']['TEU'].tolist() == [66.0, 210.0, 354.0]
+
+
+def test_missing_dates_are_ignored(daily):
+    with_gaps = daily.copy()
+    with_gaps.loc[with_gaps.index[:10], 'Date'] = pd.NaT
+    pyramid = TimePyramid(with_gaps, 'Date', 'Carloads')
+    assert pyramid.levels['year']['Carloads'].sum() == daily['Carloads'].iloc[10:].sum()
+
+
+def test_choose_level_and_series_range(daily):
+    pyramid = TimePyramid(daily, 'Date', 'Carloads')
+    assert pyramid.choose_level() == 'month'
+    assert pyramid.choose_level(width=200) == 'quarter'
+    assert pyramid.choose_level('2020-01-01', '2020-06-30') == 'week'
+
+    frame, level = pyramid.series('month', start='2020-02-15', end='2020-06-30')
+    assert level == 'month'
+    expected = resampled(daily, 'month')
+    expected = expected[(expected['Date'] >= '2020-02-01') & (expected['Date'] <= '2020-06-30')]
+    pd.testing.assert_frame_equal(frame.reset_index(drop=True), expected.reset_index(drop=True), check_dtype=False)
+
+    with pytest.raises(ValueError):
+        TimePyramid(daily.iloc[::200].assign(Date=pd.date_range('2019-01-01', periods=15, freq='MS')),
+                    'Date', 'Carloads').series('week')
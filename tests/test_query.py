@@ -0,0 +1,104 @@
+"""The query planner's cube, index and scan sources against pandas groupby."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from freight_analytics.core import FreightCore
+from freight_analytics.query import METRICS, _from_cube, _from_rows, normalize_query, plan, run_query
+from freight_analytics.store import ColumnarCache
+
+from .conftest import make_rail_frame
+
+PERIODS = {'month': 'M', 'quarter': 'Q', 'year': 'Y'}
+
+
+@pytest.fixture
+def core(tmp_path):
+    df = make_rail_frame(seed=7)
+    # Rows without a commodity must keep their own group in every source
+    df.loc[::7, 'Commodity'] = None
+    (tmp_path / "data").mkdir()
+    df.to_csv(tmp_path / "data" / "Rail_Carloadings_originated.csv", index=False)
+    return FreightCore([tmp_path / "data"], ColumnarCache(tmp_path / "cache"))
+
+
+def expected_result(df, filters, group_by, metrics, time_grain):
+    for column, values in filters.items():
+        df = df[df[column].isin(values)]
+    keys = [df[column] for column in group_by]
+    if time_grain:
+        keys.append(df['Date'].dt.to_period(PERIODS[time_grain]).dt.start_time.rename('Date'))
+    if not keys:
+        return pd.DataFrame({metric: [df['Carloads'].agg(metric)] for metric in metrics})
+    return df.groupby(keys, dropna=False)['Carloads'].agg(list(metrics)).reset_index()
+
+
+def assert_same(result, expected):
+    keys = [c for c in expected.columns if c not in METRICS]
+    result = result.sort_values(keys).reset_index(drop=True) if keys else result.reset_index(drop=True)
+    expected = expected.sort_values(keys).reset_index(drop=True) if keys else expected
+    pd.testing.assert_frame_equal(result[list(expected.columns)], expected, check_dtype=False)
+
+
+QUERIES = [
+    ({}, ['Commodity'], ('sum', 'count', 'mean'), None),
+    ({'Railroad': ['CSX', 'UP']}, ['Commodity'], ('sum', 'min', 'max'), 'month'),
+    ({'Railroad': ['BNSF']}, ['Season', 'Commodity'], ('sum', 'count'), 'quarter'),
+    ({'Commodity': ['Coal']}, [], ('sum', 'mean'), 'year'),
+    ({'Railroad': ['UP'], 'Season': ['Winter']}, [], ('sum', 'count', 'min', 'max'), None),
+]
+
+
+@pytest.mark.parametrize('filters, group_by, metrics, time_grain', QUERIES)
+def test_every_source_matches_pandas(core, filters, group_by, metrics, time_grain):
+    df = core.frame('rail')
+    key = normalize_query(core, 'rail', filters, group_by, metrics, time_grain)
+    expected = expected_result(df, filters, group_by, metrics, time_grain)
+
+    assert_same(_from_cube(core, 'rail', key), expected)
+    assert_same(_from_rows(core, 'rail', key, 'scan'), expected)
+    if any(column in ('Year', 'Railroad', 'Commodity') for column in filters):
+        assert_same(_from_rows(core, 'rail', key, 'index'), expected)
+    assert_same(run_query(core, 'rail', filters, group_by, metrics, time_grain), expected)
+
+
+def test_missing_dimension_values_keep_their_group(core):
+    df = core.frame('rail')
+    result = run_query(core, 'rail', group_by=['Commodity'], metrics=('sum',))
+    missing = result[result['Commodity'].isna()]
+    assert len(missing) == 1
+    assert missing['sum'].iloc[0] == df.loc[df['Commodity'].isna(), 'Carloads'].sum()
+    assert result['sum'].sum() == df['Carloads'].sum()
+
+
+def test_plan_prefers_the_smallest_source(core):
+    everything = normalize_query(core, 'rail', group_by=['Railroad'], metrics=('sum',), time_grain='year')
+    assert plan(core, 'rail', everything) == 'cube'
+    weekly = normalize_query(core, 'rail', {'Railroad': ['UP']}, metrics=('sum',), time_grain='week')
+    assert plan(core, 'rail', weekly) == 'index'
+    spread = normalize_query(core, 'rail', {'Season': ['Winter']}, metrics=('std',))
+    assert plan(core, 'rail', spread) == 'scan'
+
+
+def test_std_and_week_grain_are_answered_from_rows(core):
+    df = core.frame('rail')
+    result = run_query(core, 'rail', {'Railroad': ['CSX']}, ['Commodity'], ('std',), 'week')
+    assert result.attrs['source'] != 'cube'
+    subset = df[df['Railroad'] == 'CSX']
+    weeks = subset['Date'] - pd.to_timedelta(subset['Date'].dt.weekday, unit='D')
+    expected = subset.groupby([subset['Commodity'], weeks.rename('Date')], dropna=False)['Carloads'].std()
+    np.testing.assert_allclose(
+        result.sort_values(['Commodity', 'Date'])['std'].to_numpy(),
+        expected.reset_index().sort_values(['Commodity', 'Date'])['Carloads'].to_numpy(),
+        equal_nan=True,
+    )
+
+
+def test_invalid_queries_are_rejected(core):
+    with pytest.raises(ValueError):
+        run_query(core, 'rail', group_by=['Carloads'])
+    with pytest.raises(ValueError):
+        run_query(core, 'rail', metrics=('median',))
+    with pytest.raises(ValueError):
+        run_query(core, 'rail', time_grain='day')
@@ -0,0 +1,87 @@
+"""Rankings against nlargest, rank and rolling sums in pandas."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from freight_analytics.ranking import Rankings
+
+
+@pytest.fixture
+def totals():
+    rng = np.random.default_rng(11)
+    periods = pd.date_range('2020-01-01', periods=14, freq='MS')
+    entities = [f"port_{i:02d}" for i in range(9)]
+    df = pd.DataFrame([(p, e) for p in periods for e in entities], columns=['Date', 'Port'])
+    df['TEU'] = rng.random(len(df)) * 1000
+    # Some entities miss some periods entirely
+    return df.drop(rng.choice(len(df), 20, replace=False)).reset_index(drop=True)
+
+
+def wide(df):
+    return df.pivot(index='Date', columns='Port', values='TEU').sort_index()
+
+
+@pytest.mark.parametrize('k', [1, 3, 9, 20])
+def test_top_matches_nlargest(totals, k):
+    top = Rankings(totals, 'Date', 'Port', 'TEU').top(k)
+    expected = (totals.sort_values(['Date', 'TEU'], ascending=[True, False])
+                .groupby('Date').head(k).reset_index(drop=True))
+    expected.insert(1, 'rank', expected.groupby('Date').cumcount() + 1)
+    pd.testing.assert_frame_equal(top[['Date', 'rank', 'Port', 'TEU']], expected[['Date', 'rank', 'Port', 'TEU']],
+                                  check_dtype=False)
+
+
+def test_ranks_match_pandas_rank(totals):
+    rankings = Rankings(totals, 'Date', 'Port', 'TEU')
+    expected = wide(totals).rank(axis=1, ascending=False, method='first')
+    np.testing.assert_array_equal(rankings.ranks, expected.to_numpy())
+
+
+def test_ties_rank_in_entity_order():
+    df = pd.DataFrame({'Date': pd.Timestamp('2021-01-01'), 'Port': ['c', 'a', 'b'], 'TEU': [5.0, 5.0, 7.0]})
+    rankings = Rankings(df, 'Date', 'Port', 'TEU')
+    assert rankings.top(3)['Port'].tolist() == ['b', 'a', 'c']
+    assert rankings.ranks.tolist() == [[2.0, 1.0, 3.0]]
+
+
+@pytest.mark.parametrize('window', [2, 3, 6])
+def test_windowed_scores_match_rolling_sums(totals, window):
+    rankings = Rankings(totals, 'Date', 'Port', 'TEU', window=window)
+    rolled = wide(totals).rolling(window, min_periods=1).sum().iloc[window - 1:]
+    # A window where the entity never appears stays unranked
+    seen = wide(totals).notna().rolling(window).sum().iloc[window - 1:] > 0
+    expected = rolled.where(seen)
+
+    assert list(rankings.periods) == list(expected.index)
+    np.testing.assert_allclose(rankings.values, expected.to_numpy(), rtol=1e-12, equal_nan=True)
+    leaders = rankings.leaderboard(3)
+    np.testing.assert_allclose(leaders['TEU'].to_numpy(), expected.iloc[-1].nlargest(3).to_numpy(), rtol=1e-12)
+    assert leaders['Port'].tolist() == expected.iloc[-1].nlargest(3).index.tolist()
+
+
+def test_bump_follows_every_entity_that_reaches_the_top(totals):
+    rankings = Rankings(totals, 'Date', 'Port', 'TEU')
+    bump = rankings.bump(2)
+    leaders = set(rankings.top(2)['Port'])
+    assert set(bump['Port']) == leaders
+
+    ranks = wide(totals).rank(axis=1, ascending=False, method='first')
+    expected = ranks[sorted(leaders)].stack().dropna().rename('rank').reset_index()
+    merged = bump.merge(expected, on=['Date', 'Port'], suffixes=('', '_pandas'))
+    assert len(merged) == len(bump) == len(expected)
+    np.testing.assert_array_equal(merged['rank'], merged['rank_pandas'])
+
+
+def test_totals_match_groupby_nlargest(totals):
+    rankings = Rankings(totals, 'Date', 'Port', 'TEU')
+    expected = totals.groupby('Port')['TEU'].sum().nlargest(4)
+    result = rankings.totals(4)
+    assert result.index.tolist() == expected.index.tolist()
+    np.testing.assert_allclose(result.to_numpy(), expected.to_numpy(), rtol=1e-12)
+    assert len(rankings.totals(50)) == totals['Port'].nunique()
+
+
+def test_invalid_window_is_rejected(totals):
+    with pytest.raises(ValueError):
+        Rankings(totals, 'Date', 'Port', 'TEU', window=0)
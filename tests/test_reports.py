@@ -0,0 +1,32 @@
+"""Report packs: self-contained by default, skipped when unchanged."""
+
+from plotly.offline import get_plotlyjs
+
+from freight_analytics.reports import PLOTLYJS_FILE, generate_reports, report_slugs
+
+
+def test_reports_embed_plotlyjs_and_skip_unchanged(tmp_path, data_dir, cache_dir):
+    output = tmp_path / "reports"
+    first = generate_reports(output, ('rail',), data_dir=str(data_dir), cache_dir=cache_dir, workers=1)
+    assert sorted(entity for _, entity in first['rendered']) == ['BNSF', 'CSX', 'UP']
+    assert not (output / 'rail' / PLOTLYJS_FILE).exists()
+    page = (output / 'rail' / 'bnsf.html').read_text(encoding='utf-8')
+    assert get_plotlyjs()[:200] in page
+
+    again = generate_reports(output, ('rail',), data_dir=str(data_dir), cache_dir=cache_dir, workers=1)
+    assert again['rendered'] == []
+    assert len(again['skipped']) == 3
+
+
+def test_changing_the_plotlyjs_mode_rerenders(tmp_path, data_dir, cache_dir):
+    output = tmp_path / "reports"
+    generate_reports(output, ('rail',), data_dir=str(data_dir), cache_dir=cache_dir, workers=1)
+    shared = generate_reports(output, ('rail',), data_dir=str(data_dir), cache_dir=cache_dir, workers=1,
+                              plotlyjs='directory')
+    assert len(shared['rendered']) == 3
+    assert (output / 'rail' / PLOTLYJS_FILE).exists()
+    assert 'src="plotly.min.js"' in (output / 'rail' / 'csx.html').read_text(encoding='utf-8')
+
+
+def test_colliding_slugs_get_suffixes():
+    assert report_slugs(['A&B', 'A B', 'ab']) == {'A B': 'a_b', 'A&B': 'a_b_2', 'ab': 'ab'}
@@ -0,0 +1,115 @@
+"""Snapshot save/load round trips and the checks that reject stale snapshots."""
+
+import logging
+import pickle
+
+import pandas as pd
+
+from freight_analytics import core as core_module
+from freight_analytics.cache import CachePolicy
+from freight_analytics.core import FreightCore
+from freight_analytics.snapshot import load_snapshot, runtime_versions, save_snapshot
+from freight_analytics.store import ColumnarCache
+
+from .conftest import make_rail_frame
+
+
+def fresh_process(monkeypatch):
+    """Empty the process-wide frames, derived caches and utilization engines."""
+    policy = CachePolicy()
+    monkeypatch.setattr(core_module, '_frames', {})
+    monkeypatch.setattr(core_module, '_utilization', {})
+    monkeypatch.setattr(core_module, 'default_policy', lambda: policy)
+    return policy
+
+
+def no_loads(monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("restored datasets must not be loaded again")
+
+    monkeypatch.setattr(core_module, 'load_dataset', fail)
+
+
+def test_round_trip_restores_frames_and_derived_results(monkeypatch, data_dir, cache_dir, tmp_path):
+    fresh_process(monkeypatch)
+    path = tmp_path / "snapshot.pkl"
+    core = FreightCore([data_dir], ColumnarCache(cache_dir))
+    header = save_snapshot(core, path)
+    assert {key: header[key] for key in runtime_versions()} == runtime_versions()
+    assert set(header['versions']) == {'rail', 'port'}
+    assert not path.with_name(path.name + ".partial").exists()
+
+    frames = {dataset: core.frame(dataset) for dataset in ('rail', 'port')}
+    rail_filters = core.default_filters('rail')
+    kpis = core.rail_kpis(rail_filters['Year'], rail_filters['Railroad'], rail_filters['Commodity'])
+    utilization = core.utilization().frame()
+
+    policy = fresh_process(monkeypatch)
+    no_loads(monkeypatch)
+    restored_core = FreightCore([data_dir], ColumnarCache(cache_dir))
+    assert sorted(load_snapshot(restored_core, path)) == ['port', 'rail']
+
+    for dataset, frame in frames.items():
+        pd.testing.assert_frame_equal(restored_core.frame(dataset), frame)
+    assert restored_core.rail_kpis(rail_filters['Year'], rail_filters['Railroad'],
+                                   rail_filters['Commodity']) == kpis
+    pd.testing.assert_frame_equal(restored_core.utilization().frame(), utilization)
+    # Everything above was served from the restored caches
+    assert policy.stats()['hits'] > 0
+    assert policy.stats()['misses'] == 0
+
+
+def test_version_mismatch_is_ignored(monkeypatch, data_dir, cache_dir, tmp_path, caplog):
+    fresh_process(monkeypatch)
+    path = tmp_path / "snapshot.pkl"
+    save_snapshot(FreightCore([data_dir], ColumnarCache(cache_dir)), path)
+
+    with open(path, 'rb') as f:
+        header = pickle.load(f)
+        state = pickle.load(f)
+    header['pandas'] = "0.0.1"
+    with open(path, 'wb') as f:
+        pickle.dump(header, f)
+        pickle.dump(state, f)
+
+    fresh_process(monkeypatch)
+    core = FreightCore([data_dir], ColumnarCache(cache_dir))
+    with caplog.at_level(logging.INFO, logger='freight_analytics.snapshot'):
+        assert load_snapshot(core, path) == []
+    assert "built for" in caplog.text
+    assert core_module._frames == {}
+
+
+def test_changed_source_is_not_restored(monkeypatch, data_dir, cache_dir, rail_source, tmp_path, caplog):
+    monkeypatch.setattr(core_module, 'VERSION_TTL', 0)
+    fresh_process(monkeypatch)
+    path = tmp_path / "snapshot.pkl"
+    save_snapshot(FreightCore([data_dir], ColumnarCache(cache_dir)), path)
+
+    changed = make_rail_frame(seed=9)
+    changed.to_csv(rail_source, index=False)
+    fresh_process(monkeypatch)
+    core = FreightCore([data_dir], ColumnarCache(cache_dir))
+    # The port data is unchanged, so only the rail part is skipped
+    assert load_snapshot(core, path) == ['port']
+    assert core.frame('rail')['Carloads'].sum() == changed['Carloads'].sum()
+
+    rail_source.unlink()
+    (data_dir / "port_dataset.json").write_text("[]")
+    fresh_process(monkeypatch)
+    with caplog.at_level(logging.INFO, logger='freight_analytics.snapshot'):
+        assert load_snapshot(FreightCore([data_dir], ColumnarCache(cache_dir)), path) == []
+    assert "data changed" in caplog.text
+
+
+def test_missing_or_truncated_snapshot_is_skipped(monkeypatch, data_dir, cache_dir, tmp_path, caplog):
+    fresh_process(monkeypatch)
+    core = FreightCore([data_dir], ColumnarCache(cache_dir))
+    assert load_snapshot(core, tmp_path / "absent.pkl") == []
+
+    path = tmp_path / "snapshot.pkl"
+    save_snapshot(core, path)
+    path.write_bytes(path.read_bytes()[:200])
+    fresh_process(monkeypatch)
+    assert load_snapshot(FreightCore([data_dir], ColumnarCache(cache_dir)), path) == []
+    assert "Could not read snapshot" in caplog.text
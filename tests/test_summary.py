@@ -0,0 +1,83 @@
+"""GroupSummary against plain pandas aggregations."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from freight_analytics.summary import GroupSummary
+
+
+@pytest.fixture
+def frame():
+    rng = np.random.default_rng(3)
+    n = 5000
+    df = pd.DataFrame({
+        'Date': pd.Timestamp('2020-01-01') + pd.to_timedelta(rng.integers(0, 900, n), unit='D'),
+        'Railroad': rng.choice(['BNSF', 'CSX', 'NS', 'UP'], n),
+        'Commodity': rng.choice(['Coal', 'Grain', 'Chemicals', 'Autos', 'Lumber'], n),
+        'Carloads': rng.normal(1e6, 250.0, n),
+    })
+    df.loc[rng.choice(n, 50, replace=False), 'Carloads'] = np.nan
+    return df
+
+
+@pytest.mark.parametrize('chunk_rows', [7, 256, 65536])
+def test_grouped_statistics_match_pandas(frame, chunk_rows):
+    summary = GroupSummary(frame, 'Carloads', 'Date', 'Railroad', ('Commodity',), chunk_rows=chunk_rows)
+    table = summary.table
+    grouped = frame.groupby('Railroad')
+    expected = pd.DataFrame({
+        'rows': grouped.size(),
+        'count': grouped['Carloads'].count(),
+        'sum': grouped['Carloads'].sum(),
+        'mean': grouped['Carloads'].mean(),
+        'std': grouped['Carloads'].std(),
+        'min': grouped['Carloads'].min(),
+        'max': grouped['Carloads'].max(),
+        'start': grouped['Date'].min(),
+        'end': grouped['Date'].max(),
+        'distinct_Commodity': grouped['Commodity'].nunique(),
+    })
+
+    assert list(table.index) == list(expected.index)
+    for column in ('rows', 'count', 'distinct_Commodity'):
+        np.testing.assert_array_equal(table[column].to_numpy(), expected[column].to_numpy())
+    for column in ('sum', 'mean', 'min', 'max'):
+        np.testing.assert_allclose(table[column].to_numpy(), expected[column].to_numpy(), rtol=1e-12)
+    # Large mean, small spread: a naive sum-of-squares variance loses most digits here
+    np.testing.assert_allclose(table['std'].to_numpy(), expected['std'].to_numpy(), rtol=1e-9)
+    for column in ('start', 'end'):
+        np.testing.assert_array_equal(table[column].to_numpy(), expected[column].to_numpy())
+    assert list(summary.values['Commodity']) == sorted(frame['Commodity'].unique())
+
+
+def test_ungrouped_summary_matches_pandas(frame):
+    table = GroupSummary(frame, 'Carloads', 'Date', chunk_rows=100).table
+    row = table.iloc[0]
+    values = frame['Carloads']
+    assert row['rows'] == len(frame)
+    assert row['count'] == values.count()
+    assert row['sum'] == pytest.approx(values.sum(), rel=1e-12)
+    assert row['std'] == pytest.approx(values.std(), rel=1e-9)
+    assert row['start'] == frame['Date'].min()
+    assert row['end'] == frame['Date'].max()
+
+
+def test_integer_sums_are_exact():
+    df = pd.DataFrame({
+        'Date': pd.date_range('2021-01-01', periods=6, freq='D'),
+        'group': ['a', 'b'] * 3,
+        'value': np.array([2 ** 53, 1, 1, 2, 3, 4], dtype=np.int64),
+    })
+    table = GroupSummary(df, 'value', 'Date', 'group', chunk_rows=2).table
+    expected = df.groupby('group')['value'].sum()
+    assert table['sum'].dtype == np.int64
+    np.testing.assert_array_equal(table['sum'].to_numpy(), expected.to_numpy())
+
+
+def test_single_value_groups_have_nan_std():
+    df = pd.DataFrame({'Date': pd.date_range('2021-01-01', periods=3), 'group': ['a', 'b', 'b'],
+                       'value': [1.0, 2.0, 4.0]})
+    table = GroupSummary(df, 'value', 'Date', 'group').table
+    expected = df.groupby('group')['value'].std()
+    np.testing.assert_allclose(table['std'].to_numpy(), expected.to_numpy(), equal_nan=True)
@@ -0,0 +1,147 @@
+"""Incremental utilization against a full pandas recompute."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from freight_analytics.utilization import WINDOW_MONTHS, UtilizationEngine
+
+PORTS = ['houston_tx', 'long_beach_ca', 'oakland_ca']
+
+
+class FixedCapacity:
+    """Registry stand-in: capacity per port, growing 10% a year from 2020."""
+
+    def __init__(self, base):
+        self.base = base
+
+    def capacity(self, ports, years):
+        return np.array([self.base[port] * 1.1 ** (year - 2020) for port, year in zip(ports, years)])
+
+
+@pytest.fixture
+def registry():
+    return FixedCapacity({'houston_tx': 4.0e6, 'long_beach_ca': 9.0e6, 'oakland_ca': 2.4e6})
+
+
+def port_frame(seed=0, months=40, skip=()):
+    rng = np.random.default_rng(seed)
+    dates = [d for d in pd.date_range('2019-06-01', periods=months, freq='MS') if d not in skip]
+    rows = [(date, port, float(rng.integers(150_000, 400_000))) for date in dates for port in PORTS]
+    return pd.DataFrame(rows, columns=['port', 'port_name', 'TEU_values'])
+
+
+def recompute(df, registry, threshold, consecutive):
+    """Rolling 12-month utilization and alert streaks straight from pandas."""
+    monthly = df.groupby([df['port'].dt.to_period('M'), 'port_name'])['TEU_values'].sum().unstack()
+    months = pd.period_range(monthly.index.min(), monthly.index.max(), freq='M')
+    monthly = monthly.reindex(months)
+    rolling = monthly.rolling(WINDOW_MONTHS, min_periods=WINDOW_MONTHS).sum()
+    capacity = pd.DataFrame({
+        port: registry.capacity([port] * len(months), months.year) for port in monthly.columns
+    }, index=months)
+    utilization = rolling / capacity * 100
+
+    streak = pd.DataFrame(0, index=months, columns=monthly.columns)
+    for i in range(len(months)):
+        high = (utilization.iloc[i] > threshold).astype(int)
+        previous = streak.iloc[i - 1] if i else 0
+        streak.iloc[i] = (previous + 1) * high
+    return utilization, streak
+
+
+def by_port(frame, *columns):
+    return frame.sort_values(list(columns)).reset_index(drop=True)
+
+
+def assert_matches(engine, utilization):
+    frame = engine.frame().pivot(index='port', columns='port_name', values='utilization')
+    frame.index = frame.index.to_period('M')
+    expected = utilization.reindex(index=frame.index, columns=frame.columns)
+    np.testing.assert_allclose(frame.to_numpy(), expected.to_numpy(), rtol=1e-12, equal_nan=True)
+
+
+@pytest.mark.parametrize('skip', [(), (pd.Timestamp('2020-12-01'), pd.Timestamp('2021-01-01'))])
+def test_full_extend_matches_recompute(registry, skip):
+    df = port_frame(skip=skip)
+    engine = UtilizationEngine(registry, threshold=70.0, consecutive=2)
+    engine.extend(df)
+
+    utilization, streak = recompute(df, registry, 70.0, 2)
+    assert_matches(engine, utilization)
+    alerts = engine.alerts().set_index('port_name')
+    np.testing.assert_array_equal(alerts['streak'].to_numpy(), streak.iloc[-1][alerts.index].to_numpy())
+    np.testing.assert_array_equal(alerts['alerting'].to_numpy(), (streak.iloc[-1] >= 2)[alerts.index].to_numpy())
+
+
+def test_month_by_month_updates_match_one_extend(registry):
+    df = port_frame(seed=1)
+    whole = UtilizationEngine(registry)
+    whole.extend(df)
+
+    incremental = UtilizationEngine(registry)
+    raised, cleared = set(), set()
+    for month, rows in df.groupby('port', sort=True):
+        # Ports in a different order every month
+        rows = rows.sample(frac=1, random_state=month.month)
+        result = incremental.update(month, rows['port_name'].to_numpy(), rows['TEU_values'].to_numpy())
+        raised.update(result['raised'])
+        cleared.update(result['cleared'])
+
+    pd.testing.assert_frame_equal(by_port(incremental.frame(), 'port', 'port_name'),
+                                  by_port(whole.frame(), 'port', 'port_name'))
+    pd.testing.assert_frame_equal(by_port(incremental.alerts(), 'port_name'), by_port(whole.alerts(), 'port_name'))
+    assert set(whole.alerts().loc[lambda a: a['alerting'], 'port_name']) <= raised
+
+
+def test_repeated_rows_add_up(registry):
+    df = port_frame(seed=2)
+    halves = pd.concat([df.assign(TEU_values=df['TEU_values'] / 2)] * 2, ignore_index=True)
+    summed, repeated = UtilizationEngine(registry), UtilizationEngine(registry)
+    summed.extend(df)
+    repeated.extend(halves.sample(frac=1, random_state=0))
+
+    pd.testing.assert_frame_equal(by_port(repeated.frame(), 'port', 'port_name'),
+                                  by_port(summed.frame(), 'port', 'port_name'))
+    np.testing.assert_allclose(pd.Series(repeated.teu_by_port, repeated.ports)[summed.ports], summed.teu_by_port)
+    assert repeated.covers(halves)
+    assert not summed.covers(halves)
+
+
+def test_extending_a_newer_revision_matches_a_rebuild(registry):
+    df = port_frame(seed=3, months=30)
+    older = df[df['port'] < '2021-01-01']
+
+    engine = UtilizationEngine(registry)
+    engine.extend(older)
+    assert engine.covers(df)
+    extended = engine.copy()
+    results = extended.extend(df)
+    assert [r['month'] for r in results] == list(pd.date_range('2021-01-01', df['port'].max(), freq='MS'))
+
+    rebuilt = UtilizationEngine(registry)
+    rebuilt.extend(df)
+    pd.testing.assert_frame_equal(extended.frame(), rebuilt.frame())
+    # The original engine is left as it was
+    assert engine.last_month < extended.last_month
+
+    changed = df.copy()
+    changed.loc[changed.index[5], 'TEU_values'] += 1
+    assert not engine.covers(changed)
+
+
+def test_long_gaps_reset_the_window(registry):
+    df = port_frame(seed=4, months=60)
+    gap = pd.date_range('2020-06-01', periods=WINDOW_MONTHS + 3, freq='MS')
+    df = df[~df['port'].isin(gap)]
+    engine = UtilizationEngine(registry)
+    engine.extend(df)
+    utilization, _ = recompute(df, registry, 80.0, 3)
+    assert_matches(engine, utilization)
+
+
+def test_months_must_increase(registry):
+    engine = UtilizationEngine(registry)
+    engine.update('2021-03-01', PORTS, [1.0, 2.0, 3.0])
+    with pytest.raises(ValueError):
+        engine.update('2021-02-01', PORTS, [1.0, 2.0, 3.0])
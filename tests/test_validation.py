@@ -0,0 +1,92 @@
+"""Validation checks against the same questions asked of plain pandas."""
+
+import numpy as np
+import pandas as pd
+
+from freight_analytics import store
+from freight_analytics.ingest import load_port_frame, load_rail_frame
+from freight_analytics.store import ColumnarCache, load_dataset
+from freight_analytics.validation import validate_frame
+
+
+def test_clean_data_passes(rail_source, port_source):
+    for dataset, df in (('rail', load_rail_frame(rail_source)), ('port', load_port_frame(port_source))):
+        report = validate_frame(dataset, df)
+        assert report['valid']
+        assert report['warnings'] == []
+        assert report['rows'] == len(df)
+
+
+def test_warning_counts_match_pandas(rail_source):
+    df = load_rail_frame(rail_source)
+    # Repeat two rows, make one value negative and drop three weeks of one series
+    series = (df['Railroad'] == 'CSX') & (df['Commodity'] == 'Coal')
+    dropped = df[series].index[[10, 11, 40]]
+    broken = pd.concat([df.drop(dropped), df.iloc[[0, 5]]], ignore_index=True)
+    broken.loc[7, 'Carloads'] = -1
+
+    checks = validate_frame('rail', broken)['checks']
+
+    key = ['Date', 'Railroad', 'Commodity']
+    assert checks['duplicate_keys']['count'] == broken.duplicated(key).sum() == 2
+    assert checks['negative_values']['count'] == (broken['Carloads'] < 0).sum() == 1
+
+    def missing_weeks(group):
+        weeks = np.sort(group['Date'].unique()).astype('datetime64[D]').astype(np.int64) // 7
+        return int((np.diff(weeks) - 1).clip(min=0).sum())
+
+    expected_gaps = sum(missing_weeks(group) for _, group in broken.groupby(['Railroad', 'Commodity']))
+    assert checks['date_gaps']['count'] == expected_gaps == 3
+    assert checks['nulls']['passed']
+
+
+def test_unknown_ports_and_nulls(port_source):
+    df = load_port_frame(port_source)
+    df.loc[df.index[:4], 'port_name'] = 'atlantis_xx'
+    df.loc[df.index[10], 'TEU_values'] = np.nan
+
+    report = validate_frame('port', df)
+    checks = report['checks']
+    assert report['valid']
+    assert checks['unknown_ports']['count'] == (df['port_name'] == 'atlantis_xx').sum()
+    assert checks['unknown_ports']['examples'] == ['atlantis_xx']
+    assert checks['nulls']['count'] == df.isna().any(axis=1).sum() == 1
+    assert set(report['warnings']) >= {'unknown_ports', 'nulls'}
+
+
+def test_schema_and_dtype_failures_are_invalid(rail_source):
+    df = load_rail_frame(rail_source)
+    assert not validate_frame('rail', df.drop(columns=['Commodity']))['valid']
+    assert not validate_frame('rail', df.assign(Carloads=df['Carloads'].astype(str)))['valid']
+
+
+def test_invalid_data_is_served_but_not_cached(tmp_path, rail_source, cache_dir):
+    source = tmp_path / "broken.csv"
+    pd.read_csv(rail_source).drop(columns=['Commodity']).to_csv(source, index=False)
+    cache = ColumnarCache(cache_dir)
+
+    df = load_dataset('rail', source, cache)
+
+    assert len(df) == len(pd.read_csv(source))
+    assert cache.get('rail', source) is None
+    assert cache.validation('rail', source) is None
+
+
+def test_valid_data_is_cached_with_its_report(rail_source, cache_dir):
+    cache = ColumnarCache(cache_dir)
+    load_dataset('rail', rail_source, cache)
+
+    cached = cache.get('rail', rail_source)
+    expected = load_rail_frame(rail_source)
+    pd.testing.assert_series_equal(cached['Carloads'], expected['Carloads'])
+    assert cache.validation('rail', rail_source)['valid']
+
+
+def test_cache_entry_follows_the_validation_key(monkeypatch, port_source, cache_dir):
+    cache = ColumnarCache(cache_dir)
+    load_dataset('port', port_source, cache)
+    assert cache.get('port', port_source) is not None
+
+    monkeypatch.setattr(store, 'validation_key', lambda dataset: {'validation_version': -1, 'registry': 'other'})
+    assert cache.get('port', port_source) is None
+    assert cache.validation('port', port_source) is None
@@ -0,0 +1,19 @@
+"""Warm-up with a dataset missing still marks the replica ready."""
+
+import json
+
+from freight_analytics.warmup import is_ready, warm_up
+
+
+def test_missing_dataset_is_reported_not_fatal(tmp_path, port_source, monkeypatch):
+    monkeypatch.setenv('FREIGHT_CACHE_DIR', str(tmp_path / "cache"))
+    ready_file = tmp_path / "ready"
+
+    info = warm_up(snapshot_path=tmp_path / "snapshot.pkl", ready_file=ready_file,
+                   data_dir=str(port_source.parent))
+
+    assert info['datasets'] == ['port']
+    assert list(info['missing']) == ['rail']
+    assert json.loads(ready_file.read_text()) == info
+    assert (tmp_path / "snapshot.pkl").exists()
+    assert is_ready(ready_file, health_url=None)